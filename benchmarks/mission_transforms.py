@@ -0,0 +1,96 @@
+"""
+Compares the cost of transforming the poses and inspection targets of a mission to
+the robot frame step by step with alitra, as the Robot used to do, with transforming
+them in one batch with RobotFramePoses. Each step drives to a pose and takes an image.
+
+    python -m benchmarks.mission_transforms
+"""
+
+import timeit
+from pathlib import Path
+from typing import Callable, List
+
+from alitra import (
+    Frame,
+    MapAlignment,
+    Orientation,
+    Pose,
+    Position,
+    Transform,
+    align_maps,
+)
+from robot_interface.models.mission.step import DriveToPose, TakeImage
+from robot_interface.models.mission.task import Task
+
+from isar_exr.config.settings import settings
+from isar_exr.models.cached_transform import CachedTransform
+from isar_exr.models.robot_frame_poses import RobotFramePoses
+
+MISSION_SIZES: List[int] = [10, 100, 500]
+
+
+def per_call_milliseconds(function: Callable[[], None], number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e3
+
+
+def get_tasks(steps_n: int) -> List[Task]:
+    return [
+        Task(
+            steps=[
+                DriveToPose(
+                    pose=Pose(
+                        position=Position(x=i, y=i / 2, z=0, frame=Frame("asset")),
+                        orientation=Orientation(
+                            x=0, y=0, z=0, w=1, frame=Frame("asset")
+                        ),
+                        frame=Frame("asset"),
+                    )
+                ),
+                TakeImage(target=Position(x=i, y=i / 2 + 1, z=1, frame=Frame("asset"))),
+            ]
+        )
+        for i in range(steps_n)
+    ]
+
+
+def main(number: int = 20) -> None:
+    map_alignment: MapAlignment = MapAlignment.from_config(
+        Path(__file__)
+        .parents[1]
+        .joinpath(f"src/isar_exr/config/maps/{settings.MAP}.json")
+    )
+    transform: Transform = align_maps(
+        map_alignment.map_from, map_alignment.map_to, rot_axes="xyz"
+    )
+    cached_transform: CachedTransform = CachedTransform(
+        transform, from_=Frame("asset"), to_=Frame("robot")
+    )
+
+    print(f"{'steps':<10}{'per step (ms)':>16}{'batch (ms)':>14}{'speedup':>10}")
+    for steps_n in MISSION_SIZES:
+        tasks: List[Task] = get_tasks(steps_n)
+
+        def per_step() -> None:
+            for task in tasks:
+                for step in task.steps:
+                    if isinstance(step, DriveToPose):
+                        transform.transform_pose(
+                            pose=step.pose, from_=step.pose.frame, to_=Frame("robot")
+                        )
+                    if isinstance(step, TakeImage):
+                        transform.transform_position(
+                            positions=step.target,
+                            from_=step.target.frame,
+                            to_=Frame("robot"),
+                        )
+
+        def batch() -> None:
+            RobotFramePoses(tasks, cached_transform)
+
+        before: float = per_call_milliseconds(per_step, number)
+        after: float = per_call_milliseconds(batch, number)
+        print(f"{steps_n:<10}{before:>16.2f}{after:>14.2f}{before / after:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
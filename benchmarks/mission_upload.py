@@ -0,0 +1,249 @@
+"""
+Measures how uploading a mission scales with its size, by sending synthetic missions
+of N tasks with M inspection steps each through Robot.initiate_mission against the
+stand-in API served from a separate process with a fixed latency per request. Each
+task drives to a pose and takes M images.
+
+Every mission is uploaded twice: cold, with points of interest that do not exist on
+the site yet and no cached mission definition, and warm, sending the same mission
+again. Round trips, wall time and CPU time of this process are reported per phase,
+and the results are written as JSON to compare them between releases.
+
+    python -m benchmarks.mission_upload --latency 0.05 --output mission_upload.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from alitra import Frame, Orientation, Pose, Position
+from robot_interface.models.mission.mission import Mission
+from robot_interface.models.mission.step import DriveToPose, Step, TakeImage
+from robot_interface.models.mission.task import Task
+
+from isar_exr.config.settings import settings
+from isar_exr.robotinterface import Robot
+from isar_exr.state.mission_definition_cache import MissionDefinitionCache
+
+# (tasks, inspection steps per task)
+MISSION_SIZES: List[Tuple[int, int]] = [(1, 1), (10, 1), (10, 5), (50, 1), (50, 5)]
+
+# Methods timed as phases of the upload, by the attribute of the Robot they are on.
+# The phases of the site update are part of 'update_site_with_tasks' as well.
+PHASES: List[Tuple[str, str]] = [
+    ("", "update_site_with_tasks"),
+    ("", "create_new_stage"),
+    ("api", "create_points_of_interest"),
+    ("api", "add_points_of_interest_to_stage"),
+    ("api", "commit_site_to_snapshot"),
+    ("api", "set_snapshot_as_head"),
+    ("api", "wait_for_pipeline_completion"),
+    ("", "create_mission_definition"),
+    ("api", "start_mission_execution"),
+]
+
+
+def get_mission(tasks_n: int, inspections_n: int, tag_prefix: str) -> Mission:
+    tasks: List[Task] = []
+    for i in range(tasks_n):
+        steps: List[Step] = [
+            DriveToPose(
+                pose=Pose(
+                    position=Position(x=i, y=i / 2, z=0, frame=Frame("asset")),
+                    orientation=Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+                    frame=Frame("asset"),
+                )
+            )
+        ]
+        steps.extend(
+            TakeImage(target=Position(x=i, y=i / 2 + 1, z=j, frame=Frame("asset")))
+            for j in range(inspections_n)
+        )
+        tasks.append(Task(tag_id=f"{tag_prefix}_{i}", steps=steps))
+    return Mission(tasks=tasks)
+
+
+class PhaseRecorder:
+    """
+    Wraps the phase methods of a robot to record the round trips to the API, the wall
+    time and the CPU time of this process spent in every call.
+    """
+
+    def __init__(self, robot: Robot) -> None:
+        self.robot: Robot = robot
+        self.phases: Dict[str, Dict[str, float]] = {}
+        for owner_name, method_name in PHASES:
+            owner: Any = getattr(robot, owner_name) if owner_name else robot
+            setattr(owner, method_name, self._record(getattr(owner, method_name)))
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        round_trips: int = self._get_round_trips()
+        wall_time: float = time.perf_counter()
+        cpu_time: float = time.process_time()
+        try:
+            yield
+        finally:
+            totals: Dict[str, float] = self.phases.setdefault(
+                phase, {"round_trips": 0, "wall_time": 0.0, "cpu_time": 0.0}
+            )
+            totals["round_trips"] += self._get_round_trips() - round_trips
+            totals["wall_time"] += time.perf_counter() - wall_time
+            totals["cpu_time"] += time.process_time() - cpu_time
+
+    def _record(self, method: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(method)
+        def recorded(*args: Any, **kwargs: Any) -> Any:
+            with self.measure(method.__name__):
+                return method(*args, **kwargs)
+
+        return recorded
+
+    def _get_round_trips(self) -> int:
+        return sum(
+            stats.requests
+            for stats in self.robot.api.client.metrics.get_snapshot().values()
+        )
+
+
+def upload(
+    tasks_n: int, inspections_n: int, run: int, cache_directory: Path
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    :return: The totals per phase of the cold and of the warm upload
+    """
+    robot: Robot = Robot()
+    robot.mission_definition_cache = MissionDefinitionCache(
+        cache_directory.joinpath(f"{tasks_n}x{inspections_n}_{run}.json")
+    )
+    mission: Mission = get_mission(
+        tasks_n, inspections_n, tag_prefix=f"run_{run}_{tasks_n}x{inspections_n}"
+    )
+    recorder: PhaseRecorder = PhaseRecorder(robot)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for upload_name in ["cold", "warm"]:
+        recorder.phases = {}
+        with recorder.measure("initiate_mission"):
+            robot.initiate_mission(mission)
+        results[upload_name] = recorder.phases
+    return results
+
+
+def get_median(runs: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
+    return {
+        phase: {
+            measure: statistics.median(run[phase][measure] for run in runs)
+            for measure in measures
+        }
+        for phase, measures in runs[0].items()
+    }
+
+
+@contextmanager
+def standin_server(latency: float, pipeline_duration: float) -> Iterator[None]:
+    """
+    Serves the stand-in API from another process, so that the CPU time it spends is
+    not counted, and points the settings at it.
+    """
+    process: subprocess.Popen = subprocess.Popen(
+        [
+            sys.executable,
+            "-u",
+            "-m",
+            "benchmarks.standin_server",
+            "--port=0",
+            f"--latency={latency}",
+            f"--pipeline-duration={pipeline_duration}",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        urls: Dict[str, str] = dict(
+            process.stdout.readline().strip().split("=", 1) for _ in range(2)
+        )
+        settings.ROBOT_API_URL = urls["EXR_ROBOT_API_URL"]
+        settings.ROBOT_AUTH_URL = urls["EXR_ROBOT_AUTH_URL"]
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def get_package_version() -> str:
+    try:
+        return version("isar-exr")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--pipeline-duration", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=Path("mission_upload.json"))
+    arguments = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'tasks':<7}{'inspections':<13}{'upload':<7}{'phase':<32}"
+        f"{'round trips':>12}{'wall (s)':>10}{'cpu (s)':>10}"
+    )
+    with standin_server(
+        arguments.latency, arguments.pipeline_duration
+    ), tempfile.TemporaryDirectory() as cache_directory:
+        for tasks_n, inspections_n in MISSION_SIZES:
+            runs: List[Dict[str, Dict[str, Dict[str, float]]]] = [
+                upload(tasks_n, inspections_n, run, Path(cache_directory))
+                for run in range(arguments.repeat)
+            ]
+            for upload_name in ["cold", "warm"]:
+                phases: Dict[str, Dict[str, float]] = get_median(
+                    [run[upload_name] for run in runs]
+                )
+                results.append(
+                    {
+                        "tasks": tasks_n,
+                        "inspections_per_task": inspections_n,
+                        "upload": upload_name,
+                        "phases": phases,
+                    }
+                )
+                for phase, measures in phases.items():
+                    print(
+                        f"{tasks_n:<7}{inspections_n:<13}{upload_name:<7}{phase:<32}"
+                        f"{measures['round_trips']:>12.0f}"
+                        f"{measures['wall_time']:>10.3f}{measures['cpu_time']:>10.3f}"
+                    )
+
+    arguments.output.write_text(
+        json.dumps(
+            {
+                "version": get_package_version(),
+                "python": platform.python_version(),
+                "created": datetime.now(timezone.utc).isoformat(),
+                "latency": arguments.latency,
+                "pipeline_duration": arguments.pipeline_duration,
+                "repeat": arguments.repeat,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"Results written to {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
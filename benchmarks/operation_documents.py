@@ -0,0 +1,121 @@
+"""
+Compares the cost per call of building GraphQL documents inline, as the
+EnergyRoboticsApi used to do, with reusing the trusted documents of the operation
+registry.
+
+Two things are measured. First only the work done before a request is put on the
+wire: building, validating and printing the document. Then full round trips through
+GraphqlClient.query, with the HTTP transport replaced by one that answers every
+request at once, so that the time is spent in the client only. Inline documents are
+validated by the gql client and printed by the transport for every request, while
+registry documents skip both through the trusted documents client and transport.
+
+    python -m benchmarks.operation_documents
+"""
+
+import timeit
+from functools import partial
+from typing import Callable, Dict, List
+from unittest import mock
+
+import httpx
+from gql.dsl import dsl_gql
+from graphql import DocumentNode, GraphQLSchema, print_ast, validate
+
+from isar_exr.api.graphql_client import GraphqlClient
+from isar_exr.api.operations import (
+    OperationRegistry,
+    _operation_builders,
+    operation_registry,
+)
+from isar_exr.api.schema_cache import schema_cache
+
+# The operations polled while a mission is running
+POLLED_OPERATIONS: List[str] = [
+    "CurrentMissionExecutionStatus",
+    "IsMissionRunning",
+    "RobotIsConnected",
+    "RobotBatteryLevel",
+]
+
+QUERY_PARAMETERS: Dict[str, str] = {"robotID": "robot"}
+
+
+def per_call_microseconds(function: Callable[[], None], number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def get_client() -> GraphqlClient:
+    """
+    Creates a client whose HTTP transport answers every request with an empty
+    response, without opening a connection.
+    """
+    transport: httpx.MockTransport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"data": {}})
+    )
+    with mock.patch(
+        "isar_exr.api.graphql_client.get_access_token", return_value="token"
+    ), mock.patch("httpx.AsyncClient", partial(httpx.AsyncClient, transport=transport)):
+        return GraphqlClient()
+
+
+def benchmark_documents(number: int) -> None:
+    graphql_schema: GraphQLSchema = schema_cache.get_schema()
+    operations: OperationRegistry = OperationRegistry()
+
+    print("Document preparation")
+    print(f"{'operation':<32}{'inline (us)':>14}{'registry (us)':>16}{'speedup':>10}")
+    for name in POLLED_OPERATIONS:
+
+        def inline() -> None:
+            document: DocumentNode = dsl_gql(
+                _operation_builders[name](schema_cache.get_dsl_schema())
+            )
+            validate(graphql_schema, document)
+            print_ast(document)
+
+        def registry() -> None:
+            document: DocumentNode = operations.get(name)
+            operations.is_trusted(document)
+            operations.get_query_string(document)
+
+        registry()
+        before: float = per_call_microseconds(inline, number)
+        after: float = per_call_microseconds(registry, number)
+        print(f"{name:<32}{before:>14.1f}{after:>16.2f}{before / after:>9.0f}x")
+
+
+def benchmark_round_trips(number: int) -> None:
+    client: GraphqlClient = get_client()
+
+    print("GraphqlClient.query round trip")
+    print(f"{'operation':<32}{'inline (us)':>14}{'registry (us)':>16}{'speedup':>10}")
+    try:
+        for name in POLLED_OPERATIONS:
+
+            def inline() -> None:
+                client.query(
+                    dsl_gql(_operation_builders[name](client.schema)),
+                    QUERY_PARAMETERS,
+                )
+
+            def registry() -> None:
+                client.query(operation_registry.get(name), QUERY_PARAMETERS)
+
+            inline()
+            registry()
+            before: float = per_call_microseconds(inline, number)
+            after: float = per_call_microseconds(registry, number)
+            print(f"{name:<32}{before:>14.1f}{after:>16.1f}{before / after:>9.1f}x")
+    finally:
+        client.close()
+
+
+def main(number: int = 200) -> None:
+    benchmark_documents(number)
+    print()
+    benchmark_round_trips(number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,593 @@
+"""
+A local stand-in for the Energy Robotics GraphQL API, for running the EnergyRoboticsApi
+and the Robot end to end without network access, e.g. to benchmark mission uploads.
+
+The stand-in executes requests against the vendored schema with resolvers that keep
+sites, stages, snapshots, POIs, task and mission definitions, mission executions and
+robot statuses in memory. Site processing pipelines complete and mission executions
+advance through their tasks after configurable durations. Every request can be
+delayed by a fixed latency plus random jitter, and a share of requests can be failed
+with a 503 to exercise retries and circuit breakers.
+
+It also serves a login endpoint, so pointing EXR_ROBOT_API_URL and EXR_ROBOT_AUTH_URL
+at it is all the configuration the client needs:
+
+    python -m benchmarks.standin_server --port 8000 --latency 0.05 --jitter 0.02
+"""
+
+import argparse
+import base64
+import inspect
+import json
+import random
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from threading import Lock, Thread
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional
+
+from graphql import (
+    ExecutionResult,
+    GraphQLSchema,
+    build_ast_schema,
+    get_named_type,
+    graphql_sync,
+    parse,
+)
+
+from isar_exr.config.settings import settings
+
+GRAPHQL_PATH: str = "/graphql/"
+AUTH_PATH: str = "/auth/"
+
+
+class StandInState:
+    """
+    The in-memory state of the stand-in, shared by the resolvers of all requests.
+    """
+
+    def __init__(
+        self, pipeline_duration: float = 0.5, task_duration: float = 1.0
+    ) -> None:
+        self.pipeline_duration: float = pipeline_duration
+        self.task_duration: float = task_duration
+        self.lock: Lock = Lock()
+        self._ids: Iterator[int] = count(1)
+        self.points_of_interest: Dict[str, Dict[str, Any]] = {}
+        # Open stage by site id
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        # Latest head selection pipeline by site id
+        self.pipelines: Dict[str, Dict[str, Any]] = {}
+        self.task_definitions: Dict[str, Dict[str, Any]] = {}
+        self.mission_definitions: Dict[str, Dict[str, Any]] = {}
+        # Latest mission execution by robot id
+        self.mission_executions: Dict[str, Dict[str, Any]] = {}
+        self.robots: Dict[str, Dict[str, Any]] = {}
+
+    def new_id(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._ids)}"
+
+    def get_robot(self, robot_id: str) -> Dict[str, Any]:
+        robot: Optional[Dict[str, Any]] = self.robots.get(robot_id)
+        if robot is None:
+            robot = {
+                "isConnected": True,
+                "awakeStatus": "AWAKE",
+                "batteryStatus": {"percentage": 80.0},
+            }
+            self.robots[robot_id] = robot
+        return robot
+
+    def get_mission_execution(self, robot_id: str) -> Optional[Dict[str, Any]]:
+        """
+        :return: The latest mission execution of the robot, advanced to the task it
+            has reached by now
+        """
+        execution: Optional[Dict[str, Any]] = self.mission_executions.get(robot_id)
+        if execution is None:
+            return None
+        task_ids: List[str] = execution["taskIds"]
+        task_index: int = int(
+            (time.monotonic() - execution["startedAt"]) / self.task_duration
+        )
+        if execution["status"] == "IN_PROGRESS":
+            if task_index >= len(task_ids):
+                execution["status"] = "COMPLETED"
+                execution["currentExecutedTaskId"] = None
+            else:
+                execution["currentExecutedTaskId"] = task_ids[task_index]
+        return execution
+
+
+def _resolve_query(state: StandInState) -> Dict[str, Callable[..., Any]]:
+    def current_robot_status(root: Any, info: Any, robotID: str) -> Dict[str, Any]:
+        return {**state.get_robot(robotID), "timestamp": time.time()}
+
+    def current_robot_statuses(
+        root: Any, info: Any, robotIDs: List[str]
+    ) -> List[Dict[str, Any]]:
+        return [
+            {"robotID": robot_id, "status": current_robot_status(root, info, robot_id)}
+            for robot_id in robotIDs
+        ]
+
+    def current_robot_statuses_per_site(
+        root: Any, info: Any, siteID: str
+    ) -> List[Dict[str, Any]]:
+        return current_robot_statuses(root, info, list(state.robots))
+
+    def current_mission_execution(
+        root: Any, info: Any, robotID: str
+    ) -> Optional[Dict[str, Any]]:
+        return state.get_mission_execution(robotID)
+
+    def is_mission_running(root: Any, info: Any, robotID: str) -> bool:
+        execution: Optional[Dict[str, Any]] = state.get_mission_execution(robotID)
+        return execution is not None and execution["status"] in (
+            "IN_PROGRESS",
+            "PAUSED",
+        )
+
+    def point_of_interest_by_customer_tag(
+        root: Any, info: Any, siteId: str, customerTag: str
+    ) -> Optional[Dict[str, Any]]:
+        for point_of_interest in state.points_of_interest.values():
+            if (
+                point_of_interest["siteId"] == siteId
+                and point_of_interest["customerTag"] == customerTag
+            ):
+                return point_of_interest
+        return None
+
+    def point_of_interest_by_site(
+        root: Any, info: Any, siteId: str
+    ) -> List[Dict[str, Any]]:
+        return [
+            point_of_interest
+            for point_of_interest in state.points_of_interest.values()
+            if point_of_interest["siteId"] == siteId
+        ]
+
+    def current_pipeline(root: Any, info: Any, siteId: str) -> Optional[Dict[str, Any]]:
+        pipeline: Optional[Dict[str, Any]] = state.pipelines.get(siteId)
+        if pipeline is None:
+            return None
+        completed: bool = (
+            time.monotonic() - pipeline["startedAt"] >= state.pipeline_duration
+        )
+        return {
+            "id": pipeline["id"],
+            "stages": [{"state": "COMPLETED" if completed else "ACTIVE"}],
+        }
+
+    def current_site_stage(
+        root: Any, info: Any, siteId: str
+    ) -> Optional[Dict[str, Any]]:
+        return state.stages.get(siteId)
+
+    def mission_definition(root: Any, info: Any, id: str) -> Dict[str, Any]:
+        definition: Dict[str, Any] = state.mission_definitions[id]
+        return {
+            "id": id,
+            "tasks": [
+                state.task_definitions[task_id] for task_id in definition["taskIds"]
+            ],
+        }
+
+    return {
+        "currentRobotStatus": current_robot_status,
+        "currentRobotStatuses": current_robot_statuses,
+        "currentRobotStatusesPerSite": current_robot_statuses_per_site,
+        "currentMissionExecution": current_mission_execution,
+        "isMissionRunning": is_mission_running,
+        "pointOfInterestByCustomerTag": point_of_interest_by_customer_tag,
+        "pointOfInterestBySite": point_of_interest_by_site,
+        "currentSiteSnapshotHeadSelectionProcessingPipeline": current_pipeline,
+        "currentSiteStage": current_site_stage,
+        "missionDefinition": mission_definition,
+    }
+
+
+def _resolve_mutation(state: StandInState) -> Dict[str, Callable[..., Any]]:
+    def add_point_of_interest(
+        root: Any, info: Any, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        point_of_interest: Dict[str, Any] = {
+            "id": state.new_id("poi"),
+            "siteId": input["site"],
+            "customerTag": input.get("customerTag"),
+            "name": input["name"],
+        }
+        state.points_of_interest[point_of_interest["id"]] = point_of_interest
+        return point_of_interest
+
+    def upsert_point_of_interest(
+        root: Any, info: Any, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        for point_of_interest in state.points_of_interest.values():
+            if point_of_interest.get("key") == input["key"]:
+                point_of_interest.update(name=input["name"])
+                return point_of_interest
+        point_of_interest = {
+            "id": state.new_id("poi"),
+            "key": input["key"],
+            "siteId": input["siteId"],
+            "customerTag": input.get("customerTag"),
+            "name": input["name"],
+        }
+        state.points_of_interest[point_of_interest["id"]] = point_of_interest
+        return point_of_interest
+
+    def create_task_definition(
+        root: Any, info: Any, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        task_definition: Dict[str, Any] = {
+            "id": state.new_id("task"),
+            # Resolves the concrete type of the task when queried through its interface
+            "__typename": get_named_type(info.return_type).name,
+            **input,
+        }
+        state.task_definitions[task_definition["id"]] = task_definition
+        return task_definition
+
+    def create_mission_definition(
+        root: Any, info: Any, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        mission_definition: Dict[str, Any] = {
+            "id": state.new_id("mission_definition"),
+            "name": input["name"],
+            "taskIds": [],
+        }
+        state.mission_definitions[mission_definition["id"]] = mission_definition
+        return mission_definition
+
+    def add_task_to_mission_definition(
+        root: Any,
+        info: Any,
+        missionTaskDefinitionId: str,
+        missionDefinitionId: str,
+        index: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if missionTaskDefinitionId not in state.task_definitions:
+            raise ValueError(f"Unknown task definition {missionTaskDefinitionId}")
+        task_ids: List[str] = state.mission_definitions[missionDefinitionId]["taskIds"]
+        task_ids.insert(
+            len(task_ids) if index is None else index, missionTaskDefinitionId
+        )
+        return state.mission_definitions[missionDefinitionId]
+
+    def remove_task_from_mission_definition(
+        root: Any,
+        info: Any,
+        missionTaskDefinitionId: str,
+        missionDefinitionId: str,
+    ) -> Dict[str, Any]:
+        state.mission_definitions[missionDefinitionId]["taskIds"].remove(
+            missionTaskDefinitionId
+        )
+        return state.mission_definitions[missionDefinitionId]
+
+    def start_mission_execution(
+        root: Any, info: Any, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        mission_definition: Dict[str, Any] = state.mission_definitions[
+            input["missionDefinitionID"]
+        ]
+        execution: Dict[str, Any] = {
+            "id": state.new_id("mission_execution"),
+            "status": "IN_PROGRESS",
+            "taskIds": list(mission_definition["taskIds"]),
+            "currentExecutedTaskId": None,
+            "failures": [],
+            "startedAt": time.monotonic(),
+        }
+        state.mission_executions[input["robotID"]] = execution
+        return execution
+
+    def pause_mission_execution(root: Any, info: Any, robotID: str) -> Dict[str, Any]:
+        execution: Optional[Dict[str, Any]] = state.get_mission_execution(robotID)
+        if execution is None:
+            raise ValueError("No mission is running")
+        execution["status"] = "PAUSED"
+        return execution
+
+    def execute_awake_command(
+        root: Any, info: Any, robotID: str, targetState: str
+    ) -> Dict[str, Any]:
+        state.get_robot(robotID)["awakeStatus"] = targetState
+        return {"id": state.new_id("command")}
+
+    def open_site_stage(root: Any, info: Any, siteId: str) -> Dict[str, Any]:
+        stage: Dict[str, Any] = {
+            "id": state.new_id("stage"),
+            "siteId": siteId,
+            "pointOfInterestIds": [],
+        }
+        state.stages[siteId] = stage
+        return stage
+
+    def get_stage(stage_id: str) -> Dict[str, Any]:
+        for stage in state.stages.values():
+            if stage["id"] == stage_id:
+                return stage
+        raise ValueError(f"Unknown site stage {stage_id}")
+
+    def discard_site_stage(root: Any, info: Any, siteStageId: str) -> Dict[str, Any]:
+        stage: Dict[str, Any] = get_stage(siteStageId)
+        del state.stages[stage["siteId"]]
+        return stage
+
+    def add_point_of_interest_to_stage(
+        root: Any, info: Any, siteStageId: str, pointOfInterestId: str
+    ) -> Dict[str, Any]:
+        stage: Dict[str, Any] = get_stage(siteStageId)
+        stage["pointOfInterestIds"].append(pointOfInterestId)
+        return stage
+
+    def add_points_of_interest_to_stage(
+        root: Any, info: Any, siteStageId: str, input: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        stage: Dict[str, Any] = get_stage(siteStageId)
+        stage["pointOfInterestIds"].extend(input["ids"])
+        return stage
+
+    def commit_site_changes(root: Any, info: Any, siteStageId: str) -> Dict[str, Any]:
+        stage: Dict[str, Any] = discard_site_stage(root, info, siteStageId)
+        snapshot: Dict[str, Any] = {
+            "id": state.new_id("snapshot"),
+            "siteId": stage["siteId"],
+            "pointOfInterestIds": stage["pointOfInterestIds"],
+        }
+        state.snapshots[snapshot["id"]] = snapshot
+        return snapshot
+
+    def process_site_snapshot_head_selection(
+        root: Any, info: Any, siteId: str, siteSnapshotId: str
+    ) -> Dict[str, Any]:
+        if siteSnapshotId not in state.snapshots:
+            raise ValueError(f"Unknown site snapshot {siteSnapshotId}")
+        pipeline: Dict[str, Any] = {
+            "id": state.new_id("pipeline"),
+            "startedAt": time.monotonic(),
+        }
+        state.pipelines[siteId] = pipeline
+        return pipeline
+
+    return {
+        "addPointOfInterest": add_point_of_interest,
+        "upsertPointOfInterest": upsert_point_of_interest,
+        "createDockRobotTaskDefinition": create_task_definition,
+        "createPoiInspectionTaskDefinition": create_task_definition,
+        "createWaypointTaskDefinition": create_task_definition,
+        "createMissionDefinition": create_mission_definition,
+        "addTaskToMissionDefinition": add_task_to_mission_definition,
+        "removeTaskFromMissionDefinition": remove_task_from_mission_definition,
+        "startMissionExecution": start_mission_execution,
+        "pauseMissionExecution": pause_mission_execution,
+        "executeAwakeCommand": execute_awake_command,
+        "openSiteStage": open_site_stage,
+        "discardSiteStage": discard_site_stage,
+        "addPointOfInterestToStage": add_point_of_interest_to_stage,
+        "addPointsOfInterestToStage": add_points_of_interest_to_stage,
+        "commitSiteChanges": commit_site_changes,
+        "processSiteSnapshotHeadSelection": process_site_snapshot_head_selection,
+    }
+
+
+def build_standin_schema(state: StandInState) -> GraphQLSchema:
+    """
+    Builds the schema from the vendored SDL file with resolvers backed by the state.
+    Fields without a resolver return None.
+    """
+    schema: GraphQLSchema = build_ast_schema(
+        parse(settings.PATH_TO_GRAPHQL_SCHEMA.read_text())
+    )
+    for type_name, resolvers in (
+        ("Query", _resolve_query(state)),
+        ("Mutation", _resolve_mutation(state)),
+    ):
+        fields = schema.get_type(type_name).fields
+        for field_name, resolve in resolvers.items():
+            fields[field_name].resolve = _ignore_unused_arguments(resolve)
+    return schema
+
+
+def _ignore_unused_arguments(resolve: Callable[..., Any]) -> Callable[..., Any]:
+    # Arguments with a default in the schema are always passed, used or not
+    parameters = inspect.signature(resolve).parameters
+
+    def resolve_used_arguments(root: Any, info: Any, **arguments: Any) -> Any:
+        return resolve(
+            root,
+            info,
+            **{name: value for name, value in arguments.items() if name in parameters},
+        )
+
+    return resolve_used_arguments
+
+
+def create_token(lifetime: float) -> str:
+    """
+    :return: An unsigned JWT that expires after 'lifetime' seconds
+    """
+    payload: bytes = base64.urlsafe_b64encode(
+        json.dumps({"exp": time.time() + lifetime}).encode()
+    )
+    return f"standin.{payload.decode().rstrip('=')}.signature"
+
+
+class StandInServer:
+    """
+    Serves the stand-in API over HTTP on a background thread.
+
+    :param latency: Seconds every request is delayed by
+    :param jitter: Upper bound of the random seconds added to the latency
+    :param error_rate: Share of GraphQL requests answered with 503 Service Unavailable
+    :param port: 0 to pick a free port, see 'url'
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        pipeline_duration: float = 0.5,
+        task_duration: float = 1.0,
+        token_lifetime: float = 3600,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.token_lifetime: float = token_lifetime
+        self.state: StandInState = StandInState(
+            pipeline_duration=pipeline_duration, task_duration=task_duration
+        )
+        self.schema: GraphQLSchema = build_standin_schema(self.state)
+        # Number of GraphQL requests received by operation name
+        self.request_counts: Counter = Counter()
+        self._random: random.Random = random.Random(seed)
+        self._random_lock: Lock = Lock()
+        self._server: ThreadingHTTPServer = ThreadingHTTPServer(
+            (host, port), self._create_handler()
+        )
+        self._server.daemon_threads = True
+        self._thread: Optional[Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._get_address()}{GRAPHQL_PATH}"
+
+    @property
+    def auth_url(self) -> str:
+        return f"http://{self._get_address()}{AUTH_PATH}"
+
+    def _get_address(self) -> str:
+        host, port = self._server.server_address[:2]
+        if isinstance(host, (bytes, bytearray)):
+            host = host.decode()
+        return f"{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = Thread(
+            target=self._server.serve_forever, name="Stand-in API", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def execute(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Executes a GraphQL request after the configured delay.
+
+        :return: The response, or None if the request was picked to fail
+        """
+        with self._random_lock:
+            delay: float = self.latency + self._random.uniform(0, self.jitter)
+            fails: bool = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fails:
+            return None
+
+        with self.state.lock:
+            result: ExecutionResult = graphql_sync(
+                self.schema,
+                request["query"],
+                variable_values=request.get("variables"),
+                operation_name=request.get("operationName"),
+            )
+            self.request_counts[_get_operation_name(request["query"])] += 1
+        return result.formatted
+
+    def _create_handler(self) -> type:
+        server: StandInServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version: str = "HTTP/1.1"
+            # Headers and body are written separately, which would otherwise wait
+            # for the delayed acknowledgement of the client and add to the latency
+            disable_nagle_algorithm: ClassVar[bool] = True
+
+            def do_POST(self) -> None:
+                body: bytes = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.path.rstrip("/") == AUTH_PATH.rstrip("/"):
+                    self._respond(
+                        200,
+                        {"access_token": create_token(server.token_lifetime)},
+                    )
+                    return
+                response: Optional[Dict[str, Any]] = server.execute(json.loads(body))
+                if response is None:
+                    self._respond(503, {"message": "Injected error"})
+                    return
+                self._respond(200, response)
+
+            def _respond(self, status: int, payload: Dict[str, Any]) -> None:
+                content: bytes = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+def _get_operation_name(query: str) -> str:
+    # The name follows the operation type, e.g. 'query IsMissionRunning($robotID...'
+    header: List[str] = query.lstrip().split("(", 1)[0].split("{", 1)[0].split()
+    return header[1] if len(header) > 1 else "anonymous"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--pipeline-duration", type=float, default=0.5)
+    parser.add_argument("--task-duration", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+
+    server: StandInServer = StandInServer(
+        latency=arguments.latency,
+        jitter=arguments.jitter,
+        error_rate=arguments.error_rate,
+        pipeline_duration=arguments.pipeline_duration,
+        task_duration=arguments.task_duration,
+        seed=arguments.seed,
+        host=arguments.host,
+        port=arguments.port,
+    )
+    print(f"EXR_ROBOT_API_URL={server.url}")
+    print(f"EXR_ROBOT_AUTH_URL={server.auth_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,8 @@ setup(
     install_requires=[
         "alitra",
         "isar>=1.16.18",
-        "gql[aiohttp]",
+        # TrustedDocumentsTransport overrides the request building of gql 3.5
+        "gql[aiohttp,httpx,websockets]>=3.5,<3.6",
         "python-dotenv",
         "pydantic",
         "pydantic_settings>=2.0.3",
@@ -42,7 +43,10 @@ setup(
             "mypy",
             "pytest",
             "pre-commit",
-        ]
+        ],
+        "tracing": [
+            "opentelemetry-api",
+        ],
     },
     python_requires=">=3.10",
     tests_require=["pytest"],
@@ -0,0 +1,145 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from isar_exr.api.circuit_breaker import CircuitState
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is +Inf
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class OperationStats(BaseModel):
+    requests: int = 0
+    # Number of requests per latency bucket, not cumulative
+    latency_buckets: List[int] = Field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    latency_sum: float = 0
+    request_bytes: int = 0
+    reauthentications: int = 0
+    # Number of failed requests by exception class name
+    errors: Dict[str, int] = Field(default_factory=dict)
+
+
+class ApiMetrics:
+    """
+    Latency, request size, reauthentication and error counts per GraphQL operation
+    sent to the Energy Robotics API.
+
+    Recording only updates counters under a lock, so it is cheap enough to do for
+    every request. The counters are read through 'get_snapshot', e.g. to publish
+    them as telemetry, or as Prometheus text through 'to_prometheus_text'.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Lock = Lock()
+        self._operations: Dict[str, OperationStats] = {}
+
+    def record_request(
+        self,
+        operation_name: str,
+        latency: float,
+        request_bytes: int,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            stats: OperationStats = self._get_stats(operation_name)
+            stats.requests += 1
+            stats.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            stats.latency_sum += latency
+            stats.request_bytes += request_bytes
+            if error is not None:
+                self._count_error(stats, error)
+
+    def record_rejected(self, operation_name: str, error: BaseException) -> None:
+        """
+        Records a request that failed before it was sent, e.g. as its circuit is open.
+        """
+        with self._lock:
+            self._count_error(self._get_stats(operation_name), error)
+
+    def record_reauthentication(self, operation_name: str) -> None:
+        with self._lock:
+            self._get_stats(operation_name).reauthentications += 1
+
+    def get_snapshot(self) -> Dict[str, OperationStats]:
+        with self._lock:
+            return {
+                operation_name: stats.model_copy(deep=True)
+                for operation_name, stats in self._operations.items()
+            }
+
+    def to_prometheus_text(
+        self, circuit_states: Optional[Dict[str, CircuitState]] = None
+    ) -> str:
+        """
+        :return: The metrics in the Prometheus text exposition format
+        """
+        lines: List[str] = [
+            "# TYPE isar_exr_api_request_duration_seconds histogram",
+        ]
+        snapshot: Dict[str, OperationStats] = self.get_snapshot()
+        for operation_name, stats in snapshot.items():
+            label: str = f'operation="{operation_name}"'
+            cumulative: int = 0
+            for bound, count in zip(
+                [*map(str, LATENCY_BUCKETS), "+Inf"], stats.latency_buckets
+            ):
+                cumulative += count
+                lines.append(
+                    "isar_exr_api_request_duration_seconds_bucket"
+                    f'{{{label},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f"isar_exr_api_request_duration_seconds_sum{{{label}}} "
+                f"{stats.latency_sum}"
+            )
+            lines.append(
+                f"isar_exr_api_request_duration_seconds_count{{{label}}} "
+                f"{stats.requests}"
+            )
+
+        lines.append("# TYPE isar_exr_api_request_bytes_total counter")
+        for operation_name, stats in snapshot.items():
+            lines.append(
+                f'isar_exr_api_request_bytes_total{{operation="{operation_name}"}} '
+                f"{stats.request_bytes}"
+            )
+
+        lines.append("# TYPE isar_exr_api_reauthentications_total counter")
+        for operation_name, stats in snapshot.items():
+            lines.append(
+                "isar_exr_api_reauthentications_total"
+                f'{{operation="{operation_name}"}} {stats.reauthentications}'
+            )
+
+        lines.append("# TYPE isar_exr_api_errors_total counter")
+        for operation_name, stats in snapshot.items():
+            for error_class, count in stats.errors.items():
+                lines.append(
+                    "isar_exr_api_errors_total"
+                    f'{{operation="{operation_name}",error="{error_class}"}} {count}'
+                )
+
+        if circuit_states is not None:
+            lines.append("# TYPE isar_exr_api_circuit_open gauge")
+            for operation_name, state in circuit_states.items():
+                lines.append(
+                    f'isar_exr_api_circuit_open{{operation="{operation_name}"}} '
+                    f"{int(state != CircuitState.Closed)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _get_stats(self, operation_name: str) -> OperationStats:
+        # Must be called with the lock held
+        stats: Optional[OperationStats] = self._operations.get(operation_name)
+        if stats is None:
+            stats = OperationStats()
+            self._operations[operation_name] = stats
+        return stats
+
+    def _count_error(self, stats: OperationStats, error: BaseException) -> None:
+        error_class: str = type(error).__name__
+        stats.errors[error_class] = stats.errors.get(error_class, 0) + 1
@@ -0,0 +1,183 @@
+import asyncio
+from asyncio import AbstractEventLoop
+from concurrent.futures import Future
+from logging import Logger, getLogger
+from threading import Thread
+from typing import Any, Coroutine, Dict, List, Optional, Sequence, Tuple
+
+from gql import Client
+from gql.client import AsyncClientSession
+from gql.transport.httpx import HTTPXAsyncTransport
+from graphql import DocumentNode, GraphQLSchema
+from httpx import Limits
+
+from isar_exr.api.operations import OperationRegistry, operation_registry
+
+
+class TrustedDocumentsClient(Client):
+    """
+    GraphQL client that skips validating documents from the operation registry, as
+    they were validated against the same schema when they were built.
+    """
+
+    def __init__(self, operations: OperationRegistry, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.operations: OperationRegistry = operations
+
+    def validate(self, document: DocumentNode) -> None:
+        if self.operations.is_trusted(document):
+            return
+        super().validate(document)
+
+
+class TrustedDocumentsTransport(HTTPXAsyncTransport):
+    """
+    HTTP transport that sends the query string printed when a registry document was
+    built, instead of printing the document again for every request.
+
+    The request payload is built by overriding '_prepare_request', which is private
+    to gql, so setup.py pins the gql releases it has been tested with.
+    """
+
+    def __init__(self, operations: OperationRegistry, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.operations: OperationRegistry = operations
+
+    def _prepare_request(
+        self,
+        document: DocumentNode,
+        variable_values: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+        extra_args: Optional[Dict[str, Any]] = None,
+        upload_files: bool = False,
+    ) -> Dict[str, Any]:
+        query_string: Optional[str] = self.operations.get_query_string(document)
+        if query_string is None or upload_files:
+            return super()._prepare_request(
+                document, variable_values, operation_name, extra_args, upload_files
+            )
+
+        payload: Dict[str, Any] = {"query": query_string}
+        if operation_name:
+            payload["operationName"] = operation_name
+        if variable_values:
+            payload["variables"] = variable_values
+
+        post_args: Dict[str, Any] = {"json": payload}
+        if extra_args:
+            post_args.update(extra_args)
+        return post_args
+
+
+class AsyncGraphqlSession:
+    """
+    Executes GraphQL documents on an asyncio event loop running in a dedicated
+    background thread. The loop owns one async HTTP transport with a bounded
+    connection pool, so blocking callers on different threads (state machine,
+    telemetry publishers) are multiplexed concurrently over the same pool instead
+    of queueing behind each other.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        schema: GraphQLSchema,
+        timeout: float,
+        max_connections: int,
+        operations: OperationRegistry = operation_registry,
+    ) -> None:
+        self.logger: Logger = getLogger("graphql_client")
+        self.loop: AbstractEventLoop = asyncio.new_event_loop()
+        self._thread: Thread = Thread(
+            target=self.loop.run_forever,
+            name="ISAR Exr GraphQL event loop",
+            daemon=True,
+        )
+        self._thread.start()
+
+        self.transport: HTTPXAsyncTransport = TrustedDocumentsTransport(
+            operations=operations,
+            url=url,
+            headers=headers,
+            timeout=timeout,
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        # The timeout is enforced by the transport, as for the synchronous client
+        self.client: Client = TrustedDocumentsClient(
+            operations=operations,
+            transport=self.transport,
+            schema=schema,
+            execute_timeout=None,
+        )
+        self.session: AsyncClientSession = self.run(self.client.connect_async())
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """
+        Runs a coroutine on the session event loop and blocks until it is done.
+        """
+        return self.submit_coroutine(coroutine).result()
+
+    def submit_coroutine(self, coroutine: Coroutine) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def submit(
+        self, document: DocumentNode, variable_values: Optional[Dict[str, Any]] = None
+    ) -> Future:
+        """
+        Schedules the document for execution without waiting for the response.
+        """
+        return self.submit_coroutine(
+            self.execute_async(document=document, variable_values=variable_values)
+        )
+
+    async def execute_async(
+        self, document: DocumentNode, variable_values: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return await self.session.execute(document, variable_values)
+
+    def execute(
+        self, document: DocumentNode, variable_values: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Blocking facade with the same signature as the synchronous gql session.
+        """
+        return self.submit(document=document, variable_values=variable_values).result()
+
+    def execute_concurrently(
+        self, requests: Sequence[Tuple[DocumentNode, Dict[str, Any]]]
+    ) -> List[Future]:
+        """
+        Puts all requests in flight at once and returns one future per request, in
+        the order they were given.
+        """
+        return [
+            self.submit(document=document, variable_values=variable_values)
+            for document, variable_values in requests
+        ]
+
+    def update_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Swaps headers on the live transport, e.g. after the access token has been
+        refreshed. The change is applied on the event loop so that no request is
+        built while the headers are being replaced.
+        """
+
+        async def update() -> None:
+            self.transport.kwargs["headers"] = headers
+            if self.transport.client is not None:
+                self.transport.client.headers.update(headers)
+
+        self.run(update())
+
+    def close(self) -> None:
+        if not self.loop.is_running():
+            return
+        try:
+            self.run(self.client.close_async())
+        except Exception as e:
+            self.logger.warning(f"Could not close the GraphQL transport cleanly: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -1,18 +1,24 @@
+import base64
 import json
-from typing import Any
+import time
+from logging import Logger, getLogger
+from threading import Lock, Timer
+from typing import Any, Callable, List, Optional
 
-import requests
-from requests import Response
+from requests import Response, Session
 from requests.auth import HTTPBasicAuth
 
 from isar_exr.config.settings import settings
 
+# Reused for every token request so the connection to the login API is kept alive
+_auth_session: Session = Session()
+
 
 def get_access_token() -> str:
     username: str = settings.ROBOT_API_USERNAME
     password: str = settings.ROBOT_API_PASSWORD
     auth_url: str = settings.ROBOT_AUTH_URL
-    response: Response = requests.post(
+    response: Response = _auth_session.post(
         auth_url,
         auth=HTTPBasicAuth(username=username, password=password),
     )
@@ -23,3 +29,116 @@ def get_access_token() -> str:
     token: str = json_object["access_token"]
 
     return token
+
+
+def get_token_expiry(token: str) -> Optional[float]:
+    """
+    Reads the expiry of a JWT access token without verifying its signature.
+
+    :return: The expiry as a unix timestamp, or None if the token carries no expiry.
+    """
+    try:
+        payload: str = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims: Any = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """
+    Keeps a valid access token for the Energy Robotics API.
+
+    The token is refreshed in a background timer shortly before it expires, and every
+    listener is called with the new token so that it can swap the authorization
+    header on live transports. Tokens without a readable expiry are only refreshed
+    on demand, e.g. after the API has rejected a request.
+    """
+
+    # Seconds to wait before retrying a failed background refresh
+    retry_delay: float = 10
+
+    def __init__(
+        self,
+        fetch_token: Callable[[], str] = get_access_token,
+        refresh_margin: float = settings.ROBOT_AUTH_REFRESH_MARGIN,
+    ) -> None:
+        self.logger: Logger = getLogger("graphql_client")
+        self._fetch_token: Callable[[], str] = fetch_token
+        self.refresh_margin: float = refresh_margin
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock: Lock = Lock()
+        self._timer: Optional[Timer] = None
+        self._token: Optional[str] = None
+        self.expires_at: Optional[float] = None
+
+    @property
+    def token(self) -> str:
+        if self._token is None:
+            with self._lock:
+                # Another thread may have fetched the first token while waiting
+                if self._token is None:
+                    return self._refresh()
+        return self._token
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        self._listeners.append(listener)
+
+    def refresh(self, rejected_token: Optional[str] = None) -> str:
+        """
+        Fetches a new token, notifies the listeners and schedules the next refresh.
+
+        :param rejected_token: The token a failed request was sent with. If another
+            thread has already replaced it, the current token is returned instead of
+            fetching yet another one.
+
+        :raises Exception: The token could not be fetched
+        """
+        with self._lock:
+            if rejected_token is not None and rejected_token != self._token:
+                return self._token
+            return self._refresh()
+
+    def _refresh(self) -> str:
+        # Must be called with the lock held
+        try:
+            token: str = self._fetch_token()
+        except Exception as e:
+            self.logger.critical(f"CRITICAL - Error getting access token: \n{e}")
+            raise
+
+        self._token = token
+        self.expires_at = get_token_expiry(token)
+        for listener in self._listeners:
+            listener(token)
+
+        if self.expires_at is not None:
+            self._schedule_refresh(
+                delay=self.expires_at - time.time() - self.refresh_margin
+            )
+        return token
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule_refresh(self, delay: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = Timer(max(delay, self.retry_delay), self._refresh_in_background)
+        self._timer.name = "ISAR Exr Token Refresh"
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            self.logger.warning(
+                f"Background token refresh failed, retrying in {self.retry_delay} s"
+            )
+            with self._lock:
+                self._schedule_refresh(delay=self.retry_delay)
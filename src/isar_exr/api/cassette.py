@@ -0,0 +1,220 @@
+import asyncio
+import gzip
+import json
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any, Deque, Dict, List, Optional, TextIO, cast
+
+from gql.transport.exceptions import (
+    TransportClosed,
+    TransportProtocolError,
+    TransportQueryError,
+    TransportServerError,
+)
+from httpx import ConnectTimeout, ReadTimeout
+from pydantic import BaseModel
+
+# Token the client authenticates with while replaying, as no request leaves the process
+REPLAY_TOKEN: str = "replay"
+
+# Errors that are replayed as the class they were recorded as, other errors are
+# replayed as a plain Exception with the recorded message
+_REPLAYED_ERRORS: Dict[str, type] = {
+    error_class.__name__: error_class
+    for error_class in (
+        TransportClosed,
+        TransportProtocolError,
+        TransportQueryError,
+        TransportServerError,
+        ConnectTimeout,
+        ReadTimeout,
+    )
+}
+
+
+class CassetteMode(str, Enum):
+    Off = "off"
+    Record = "record"
+    Replay = "replay"
+
+
+class CassetteMissException(Exception):
+    pass
+
+
+class RecordedError(BaseModel):
+    error_class: str
+    message: str
+    # The HTTP status of a TransportServerError
+    code: Optional[int] = None
+    # The GraphQL errors of a TransportQueryError
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class CassetteEntry(BaseModel):
+    operation_name: str
+    variables: Dict[str, Any]
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[RecordedError] = None
+    # Seconds between starting the recording and sending the request
+    started_at: float
+    latency: float
+
+
+def get_variables_key(variables: Dict[str, Any]) -> str:
+    return json.dumps(variables, sort_keys=True, default=str)
+
+
+def _open(path: Path, mode: str) -> TextIO:
+    if path.suffix == ".gz":
+        return cast(TextIO, gzip.open(path, mode + "t", encoding="utf-8"))
+    return cast(TextIO, open(path, mode, encoding="utf-8"))
+
+
+class CassetteRecorder:
+    """
+    Appends every request sent to the API, with its variables, response or error and
+    latency, as one JSON line to a cassette file, gzipped if its name ends in '.gz'.
+    Every line is flushed as it is written, so a recording survives the process
+    being stopped.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._lock: Lock = Lock()
+        self._started_at: float = monotonic()
+        self._file: TextIO = _open(path, "a")
+
+    def record(
+        self,
+        operation_name: str,
+        variables: Dict[str, Any],
+        latency: float,
+        response: Optional[Dict[str, Any]] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        entry: CassetteEntry = CassetteEntry(
+            operation_name=operation_name,
+            variables=json.loads(json.dumps(variables, default=str)),
+            response=response,
+            error=_to_recorded_error(error) if error is not None else None,
+            started_at=round(monotonic() - latency - self._started_at, 6),
+            latency=round(latency, 6),
+        )
+        line: str = entry.model_dump_json(exclude_none=True)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """
+        Closes the cassette file, which ends the gzip stream. Requests completed after
+        closing are not recorded.
+        """
+        with self._lock:
+            self._file.close()
+
+
+class CassettePlayer:
+    """
+    Answers requests from a recorded cassette instead of the API, after the recorded
+    latency multiplied by 'time_scale'.
+
+    A request is answered with the next unplayed entry of its operation recorded with
+    the same variables, or else with the next unplayed entry of the operation, as
+    variables such as mission names may differ from the recording. Once the entries
+    of an operation are used up the last one is repeated, as polling operations may
+    be sent more often than when recorded.
+    """
+
+    def __init__(self, entries: List[CassetteEntry], time_scale: float = 1) -> None:
+        self.time_scale: float = time_scale
+        self._lock: Lock = Lock()
+        self._entries: Dict[str, Deque[CassetteEntry]] = {}
+        self._last_entries: Dict[str, CassetteEntry] = {}
+        for entry in entries:
+            self._entries.setdefault(entry.operation_name, deque()).append(entry)
+        # Number of requests answered by operation name, and of those not in the cassette
+        self.played: Dict[str, int] = {}
+        self.misses: int = 0
+
+    @classmethod
+    def load(cls, path: Path, time_scale: float = 1) -> "CassettePlayer":
+        entries: List[CassetteEntry] = []
+        with _open(path, "r") as file:
+            try:
+                for line in file:
+                    if line.strip():
+                        entries.append(CassetteEntry.model_validate_json(line))
+            except EOFError:
+                # The recording process was stopped before closing the gzip stream,
+                # every line written before was flushed
+                pass
+        return cls(entries, time_scale=time_scale)
+
+    async def play(
+        self, operation_name: str, variables: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        :raises CassetteMissException: The operation was never recorded
+        :raises Exception: The error the request was recorded with
+        """
+        entry: CassetteEntry = self._take(operation_name, variables)
+        if entry.latency > 0 and self.time_scale > 0:
+            await asyncio.sleep(entry.latency * self.time_scale)
+        if entry.error is not None:
+            raise _from_recorded_error(entry.error)
+        return entry.response
+
+    def _take(self, operation_name: str, variables: Dict[str, Any]) -> CassetteEntry:
+        with self._lock:
+            entries: Optional[Deque[CassetteEntry]] = self._entries.get(operation_name)
+            if not entries:
+                last_entry: Optional[CassetteEntry] = self._last_entries.get(
+                    operation_name
+                )
+                if last_entry is None:
+                    self.misses += 1
+                    raise CassetteMissException(
+                        f"No {operation_name} request was recorded in the cassette"
+                    )
+                entry: CassetteEntry = last_entry
+            else:
+                entry = self._take_matching(entries, get_variables_key(variables))
+            self._last_entries[operation_name] = entry
+            self.played[operation_name] = self.played.get(operation_name, 0) + 1
+            return entry
+
+    def _take_matching(
+        self, entries: Deque[CassetteEntry], variables_key: str
+    ) -> CassetteEntry:
+        for index, entry in enumerate(entries):
+            if get_variables_key(entry.variables) == variables_key:
+                del entries[index]
+                return entry
+        return entries.popleft()
+
+
+def _to_recorded_error(error: BaseException) -> RecordedError:
+    return RecordedError(
+        error_class=type(error).__name__,
+        message=str(error),
+        code=error.code if isinstance(error, TransportServerError) else None,
+        errors=error.errors if isinstance(error, TransportQueryError) else None,
+    )
+
+
+def _from_recorded_error(error: RecordedError) -> Exception:
+    error_class: Optional[type] = _REPLAYED_ERRORS.get(error.error_class)
+    if error_class is TransportServerError:
+        return TransportServerError(error.message, code=error.code)
+    if error_class is TransportQueryError:
+        return TransportQueryError(error.message, errors=error.errors)
+    if error_class is not None:
+        return error_class(error.message)
+    return Exception(f"{error.error_class}: {error.message}")
@@ -0,0 +1,178 @@
+import random
+from asyncio import CancelledError
+from enum import Enum
+from logging import Logger, getLogger
+from threading import Lock
+from time import monotonic
+from typing import Dict, Optional
+
+from gql.transport.exceptions import TransportClosed, TransportServerError
+from graphql import DocumentNode
+from httpx import TransportError
+
+from isar_exr.api.operations import OperationRegistry, operation_registry
+from isar_exr.config.settings import settings
+
+
+class CircuitState(str, Enum):
+    Closed = "closed"
+    Open = "open"
+    HalfOpen = "half_open"
+
+
+class CircuitOpenException(Exception):
+    def __init__(self, operation_name: str, retry_in: float) -> None:
+        self.operation_name: str = operation_name
+        self.retry_in: float = retry_in
+        super().__init__(
+            f"The Energy Robotics API is unavailable for {operation_name}, "
+            f"retrying in {retry_in:.1f} s"
+        )
+
+
+def is_outage(error: BaseException) -> bool:
+    """
+    Whether the error means that the API could not answer, as opposed to the API
+    rejecting the request, e.g. for an invalid query or an expired token.
+    """
+    if isinstance(error, TransportServerError):
+        return error.code is None or error.code >= 500 or error.code == 429
+    return isinstance(error, (TransportClosed, TransportError, TimeoutError))
+
+
+class CircuitBreaker:
+    """
+    Stops sending an operation to the API after 'failure_threshold' outages in a
+    row, so that callers fail immediately instead of each waiting for the request
+    to time out.
+
+    The circuit stays open for a backoff that doubles every time it opens again,
+    up to 'max_backoff', with jitter so that the operations of a client do not all
+    probe the API at the same moment. Once the backoff has passed a single request
+    is let through as a probe, which closes the circuit if it succeeds.
+    """
+
+    def __init__(
+        self,
+        operation_name: str,
+        failure_threshold: int = settings.ROBOT_API_CIRCUIT_FAILURE_THRESHOLD,
+        initial_backoff: float = settings.ROBOT_API_CIRCUIT_INITIAL_BACKOFF,
+        max_backoff: float = settings.ROBOT_API_CIRCUIT_MAX_BACKOFF,
+    ) -> None:
+        self.logger: Logger = getLogger("graphql_client")
+        self.operation_name: str = operation_name
+        self.failure_threshold: int = failure_threshold
+        self.initial_backoff: float = initial_backoff
+        self.max_backoff: float = max_backoff
+        self._lock: Lock = Lock()
+        self._state: CircuitState = CircuitState.Closed
+        self._failures: int = 0
+        self._backoff: float = initial_backoff
+        # Monotonic time after which a probe is let through
+        self._retry_at: float = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def before_request(self) -> None:
+        """
+        :raises CircuitOpenException: The circuit is open, or another request is
+            already probing the API
+        """
+        with self._lock:
+            if self._state == CircuitState.Closed:
+                return
+            now: float = monotonic()
+            if self._state == CircuitState.Open and now >= self._retry_at:
+                self._state = CircuitState.HalfOpen
+                return
+            raise CircuitOpenException(
+                self.operation_name, retry_in=max(0.0, self._retry_at - now)
+            )
+
+    def record(self, error: Optional[BaseException]) -> None:
+        """
+        Records the outcome of a request that was let through by 'before_request'.
+
+        :param error: The exception the request failed with, None if it succeeded
+        """
+        with self._lock:
+            if isinstance(error, CancelledError):
+                # The probe never got an answer, let the next request probe it
+                if self._state == CircuitState.HalfOpen:
+                    self._state = CircuitState.Open
+                return
+            if error is not None and is_outage(error):
+                self._record_failure()
+            else:
+                self._record_success()
+
+    def _record_success(self) -> None:
+        if self._state != CircuitState.Closed:
+            self.logger.info(
+                f"The Energy Robotics API answered {self.operation_name} again, "
+                "closing its circuit"
+            )
+        self._state = CircuitState.Closed
+        self._failures = 0
+        self._backoff = self.initial_backoff
+
+    def _record_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HalfOpen:
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+        elif self._failures < self.failure_threshold:
+            return
+        elif self._state == CircuitState.Open:
+            # Requests sent before the circuit opened are still completing
+            return
+
+        self._state = CircuitState.Open
+        backoff: float = random.uniform(self._backoff / 2, self._backoff)
+        self._retry_at = monotonic() + backoff
+        self.logger.warning(
+            f"The Energy Robotics API failed {self.operation_name} "
+            f"{self._failures} times in a row, opening its circuit for {backoff:.1f} s"
+        )
+
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per GraphQL operation, so that an operation the API fails
+    to answer does not stop the others.
+    """
+
+    def __init__(self, operations: OperationRegistry = operation_registry) -> None:
+        self._operations: OperationRegistry = operations
+        self._lock: Lock = Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, operation_name: str) -> CircuitBreaker:
+        breaker: Optional[CircuitBreaker] = self._breakers.get(operation_name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    operation_name, CircuitBreaker(operation_name)
+                )
+        return breaker
+
+    def get_for_document(self, document: DocumentNode) -> Optional[CircuitBreaker]:
+        """
+        :return: The circuit breaker of the operation in the document, None for
+            documents that are not from the operation registry
+        """
+        operation_name: Optional[str] = self._operations.get_operation_name(document)
+        if operation_name is None:
+            return None
+        return self.get(operation_name)
+
+    def get_states(self) -> Dict[str, CircuitState]:
+        """
+        :return: The state of the circuit of every operation sent so far
+        """
+        with self._lock:
+            return {
+                operation_name: breaker.state
+                for operation_name, breaker in self._breakers.items()
+            }
@@ -1,12 +1,15 @@
 import json
 import logging
+from concurrent.futures import Future
 from datetime import datetime
 from logging import Logger
-from time import sleep
-from typing import Any, Dict, Optional
+from threading import Event
+from time import monotonic, sleep
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from gql.dsl import DSLMutation, DSLQuery, DSLSchema, DSLVariableDefinitions, dsl_gql
+from gql.dsl import DSLSchema
 from gql.transport.exceptions import TransportQueryError
+from graphql import DocumentNode
 from robot_interface.models.exceptions.robot_exceptions import (
     RobotAPIException,
     RobotCommunicationException,
@@ -16,6 +19,7 @@ from robot_interface.models.exceptions.robot_exceptions import (
 )
 from robot_interface.models.mission.status import MissionStatus
 
+from isar_exr.api.circuit_breaker import CircuitOpenException
 from isar_exr.api.graphql_client import GraphqlClient
 from isar_exr.api.models.enums import AwakeStatus
 from isar_exr.api.models.models import (
@@ -23,47 +27,79 @@ from isar_exr.api.models.models import (
     Pose3DStampedInput,
     UpsertPointOfInterestInput,
 )
+from isar_exr.api.operations import OperationRegistry, operation_registry
 from isar_exr.config.settings import settings
 from isar_exr.models.exceptions import NoMissionRunningException
 from isar_exr.models.step_status import ExrMissionStatus, ExrStepStatus
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+from isar_exr.tracing import tracer
 
 
 def to_dict(obj):
     return json.loads(json.dumps(obj, default=lambda o: o.__dict__))
 
 
+def is_pipeline_completed(pipeline: Optional[Dict[str, Any]]) -> bool:
+    return pipeline is not None and pipeline["stages"][0]["state"] == "COMPLETED"
+
+
+# The task definitions below are the operation and variables that create them, as
+# taken by 'EnergyRoboticsApi.create_task_definitions'
+
+
+def dock_robot_task_definition(
+    site_id: str, task_name: str, docking_station_id: str
+) -> Tuple[str, Dict[str, Any]]:
+    return "CreateDockRobotTaskDefinition", {
+        "siteId": site_id,
+        "name": task_name,
+        "dockingStationId": docking_station_id,
+    }
+
+
+def point_of_interest_inspection_task_definition(
+    site_id: str, task_name: str, point_of_interest_id: str
+) -> Tuple[str, Dict[str, Any]]:
+    return "CreatePoiInspectionTaskDefinition", {
+        "siteId": site_id,
+        "name": task_name,
+        "poiId": point_of_interest_id,
+    }
+
+
+def waypoint_task_definition(
+    site_id: str, task_name: str, pose_3D_stamped_input: Pose3DStampedInput
+) -> Tuple[str, Dict[str, Any]]:
+    return "CreateWaypointTaskDefinition", {
+        "siteId": site_id,
+        "name": task_name,
+        "waypoint": to_dict(pose_3D_stamped_input),
+    }
+
+
 class EnergyRoboticsApi:
-    def __init__(self) -> None:
-        self.client: GraphqlClient = GraphqlClient()
+    def __init__(self, client: Optional[GraphqlClient] = None) -> None:
+        """
+        :param client: A client shared with other users of the API, e.g. the robots
+            of a fleet, a new client if None
+        """
+        self.client: GraphqlClient = client if client is not None else GraphqlClient()
         self.schema: DSLSchema = self.client.schema
+        self.operations: OperationRegistry = operation_registry
         self.logger: Logger = logging.getLogger(EnergyRoboticsApi.__name__)
 
     def get_mission_status(self, exr_robot_id: str) -> MissionStatus:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        current_mission_execution_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentMissionExecution.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(self.schema.MissionExecutionType.status)
-        )
-
-        current_mission_execution_query.variable_definitions = (
-            variable_definitions_graphql
-        )
-
         params: dict = {"robotID": exr_robot_id}
 
-        if not self.is_mission_running(exr_robot_id):
-            raise NoMissionRunningException(
-                f"Cannot get EXR mission status - No EXR mission is running for robot "
-                f"with id {exr_robot_id}"
-            )
-
-        response_dict: dict[str, Any] = self.client.query(
-            dsl_gql(current_mission_execution_query), params
+        responses: Dict[str, Dict[str, Any]] = self.query_batch(
+            ["IsMissionRunning", "CurrentMissionExecutionStatus"], params
         )
+        response_dict: dict[str, Any] = responses["CurrentMissionExecutionStatus"]
 
-        if response_dict["currentMissionExecution"] is None:
+        if (
+            not responses["IsMissionRunning"]["isMissionRunning"]
+            or response_dict["currentMissionExecution"] is None
+        ):
             raise NoMissionRunningException(
                 f"Cannot get EXR mission status - No EXR mission is running for robot "
                 f"with id {exr_robot_id}"
@@ -77,34 +113,19 @@ class EnergyRoboticsApi:
     def get_mission_status_and_current_task(
         self, exr_robot_id: str
     ) -> tuple[MissionStatus, str]:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        current_mission_execution_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentMissionExecution.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(
-                self.schema.MissionExecutionType.status,
-                self.schema.MissionExecutionType.currentExecutedTaskId,
-            )
-        )
-
-        current_mission_execution_query.variable_definitions = (
-            variable_definitions_graphql
-        )
-
         params: dict = {"robotID": exr_robot_id}
 
-        if not self.is_mission_running(exr_robot_id):
-            raise NoMissionRunningException(
-                f"Cannot get current EXR task - No EXR mission is running for robot "
-                f"with id {exr_robot_id}"
-            )
-
-        response_dict: dict[str, Any] = self.client.query(
-            dsl_gql(current_mission_execution_query), params
+        responses: Dict[str, Dict[str, Any]] = self.query_batch(
+            ["IsMissionRunning", "CurrentMissionExecutionStatusAndTask"], params
         )
+        response_dict: dict[str, Any] = responses[
+            "CurrentMissionExecutionStatusAndTask"
+        ]
 
-        if response_dict["currentMissionExecution"] is None:
+        if (
+            not responses["IsMissionRunning"]["isMissionRunning"]
+            or response_dict["currentMissionExecution"] is None
+        ):
             raise NoMissionRunningException(
                 f"Cannot get current EXR task - No EXR mission is running for robot "
                 f"with id {exr_robot_id}"
@@ -117,46 +138,300 @@ class EnergyRoboticsApi:
             response_dict["currentMissionExecution"]["currentExecutedTaskId"],
         )
 
-    def is_mission_running(self, exr_robot_id: str) -> bool:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+    def get_connection_and_mission_status(
+        self, exr_robot_id: str
+    ) -> Tuple[bool, Optional[MissionStatus]]:
+        """
+        Checks if the robot is connected and gets the status of its running mission
+        in a single request.
+
+        :return: Whether the robot is connected, and the mission status or None if
+            no mission is running.
+        """
+        params: dict = {"robotID": exr_robot_id}
 
-        is_mission_running_query: DSLQuery = DSLQuery(
-            self.schema.Query.isMissionRunning.args(
-                robotID=variable_definitions_graphql.robotID
-            )
+        responses: Dict[str, Dict[str, Any]] = self.query_batch(
+            ["RobotIsConnected", "IsMissionRunning", "CurrentMissionExecutionStatus"],
+            params,
         )
+        is_connected: bool = responses["RobotIsConnected"]["currentRobotStatus"][
+            "isConnected"
+        ]
+        current_mission_execution: Optional[Dict[str, Any]] = responses[
+            "CurrentMissionExecutionStatus"
+        ]["currentMissionExecution"]
+
+        if (
+            not responses["IsMissionRunning"]["isMissionRunning"]
+            or current_mission_execution is None
+        ):
+            return is_connected, None
 
-        is_mission_running_query.variable_definitions = variable_definitions_graphql
+        mission_status: ExrMissionStatus = ExrMissionStatus(
+            current_mission_execution["status"]
+        )
+        return is_connected, mission_status.to_mission_status()
 
+    def get_robot_state(
+        self, exr_robot_id: str
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Gets the robot status and the running mission execution in a single request.
+
+        :return: The robot status and mission execution, shaped as pushed by the
+            OnRobotStatus and OnMissionExecutionStatus subscriptions. The mission
+            execution is None if no mission is running.
+        """
         params: dict = {"robotID": exr_robot_id}
-        response_dict: dict[str, Any] = self.client.query(
-            dsl_gql(is_mission_running_query), params
+
+        responses: Dict[str, Dict[str, Any]] = self.query_batch(
+            ["RobotStatus", "IsMissionRunning", "CurrentMissionExecutionStatusAndTask"],
+            params,
+        )
+        robot_status: Dict[str, Any] = responses["RobotStatus"]["currentRobotStatus"]
+        if not responses["IsMissionRunning"]["isMissionRunning"]:
+            return robot_status, None
+        return (
+            robot_status,
+            responses["CurrentMissionExecutionStatusAndTask"][
+                "currentMissionExecution"
+            ],
         )
 
-        return response_dict["isMissionRunning"]
+    def get_fleet_state(
+        self, exr_robot_ids: Sequence[str]
+    ) -> Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """
+        Gets the robot status and running mission execution of several robots, with
+        the statuses of all robots in one request and the mission executions in
+        batches of 'ROBOT_API_MAX_BATCH_SIZE' robots, all sent concurrently.
+
+        :return: The robot status and mission execution by robot id, as returned by
+            'get_robot_state'. Robots the API returned no status for are left out.
+        """
+        params: List[Dict[str, Any]] = [
+            {"robotID": exr_robot_id} for exr_robot_id in exr_robot_ids
+        ]
+        statuses, missions_running, mission_executions = (
+            self.query_repeated_concurrently(
+                [
+                    ("RobotStatuses", [{"robotIDs": list(exr_robot_ids)}]),
+                    ("IsMissionRunning", params),
+                    ("CurrentMissionExecutionStatusAndTask", params),
+                ]
+            )
+        )
+        robot_statuses: Dict[str, Dict[str, Any]] = {
+            status_per_robot["robotID"]: status_per_robot["status"]
+            for status_per_robot in statuses[0]["currentRobotStatuses"]
+        }
+        fleet_state: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        for exr_robot_id, mission_running, mission_execution in zip(
+            exr_robot_ids, missions_running, mission_executions
+        ):
+            if exr_robot_id not in robot_statuses:
+                continue
+            fleet_state[exr_robot_id] = (
+                robot_statuses[exr_robot_id],
+                (
+                    mission_execution["currentMissionExecution"]
+                    if mission_running["isMissionRunning"]
+                    else None
+                ),
+            )
+        return fleet_state
+
+    def get_robot_statuses(
+        self, exr_robot_ids: Sequence[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets the status of several robots, with connectivity and battery, in one
+        request.
+
+        :return: The robot status by robot id, shaped as pushed by OnRobotStatus.
+            Robots the API returned no status for are left out.
+        """
+        params: dict = {"robotIDs": list(exr_robot_ids)}
+
+        result: Dict[str, Any] = self.client.query(
+            self.operations.get("RobotStatuses"), params
+        )
+        return {
+            status_per_robot["robotID"]: status_per_robot["status"]
+            for status_per_robot in result["currentRobotStatuses"]
+        }
 
-    def pause_current_mission(self, exr_robot_id: str) -> None:
+    def get_robot_statuses_per_site(self, site_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Like 'get_robot_statuses' for all robots on the site that are accessible
+        to the API user.
+        """
+        params: dict = {"siteID": site_id}
+
+        result: Dict[str, Any] = self.client.query(
+            self.operations.get("RobotStatusesPerSite"), params
+        )
+        return {
+            status_per_robot["robotID"]: status_per_robot["status"]
+            for status_per_robot in result["currentRobotStatusesPerSite"]
+        }
+
+    def query_batch(
+        self, operation_names: Sequence[str], params: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Sends several operations from the operation registry in one request. The
+        operations share the given variables.
+
+        :return: The response of each operation by name, shaped as if the operation
+            had been sent on its own.
+        """
+        batch_query: DocumentNode = self.operations.get_batch(operation_names)
+        response_dict: Dict[str, Any] = self.client.query(batch_query, params)
+        return self.operations.split_batch_response(operation_names, response_dict)
+
+    def query_repeated(
+        self, operation_name: str, params: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sends an operation from the operation registry once per set of variables.
+        The operations are put in batches of at most 'ROBOT_API_MAX_BATCH_SIZE',
+        and the batches are sent concurrently.
+
+        :return: One response per set of variables, shaped as if the operation had
+            been sent on its own, in the order the variables were given.
+        """
+        return self.query_repeated_concurrently([(operation_name, params)])[0]
+
+    def query_repeated_concurrently(
+        self, requests: Sequence[Tuple[str, Sequence[Dict[str, Any]]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Like 'query_repeated' for several operations, with the batches of all
+        operations sent concurrently. Concurrency is bounded by the connection pool
+        of the client.
+
+        :return: The responses of each operation, in the order the operations were
+            given.
+        """
+        batch_size: int = settings.ROBOT_API_MAX_BATCH_SIZE
+        batches: List[Tuple[int, str, Sequence[Dict[str, Any]]]] = [
+            (request_index, operation_name, params[i : i + batch_size])
+            for request_index, (operation_name, params) in enumerate(requests)
+            for i in range(0, len(params), batch_size)
+        ]
+        batch_responses: List[Dict[str, Any]] = self.client.query_concurrently(
+            [
+                (
+                    self.operations.get_repeated_batch(operation_name, len(batch)),
+                    self.operations.get_repeated_variables(batch),
+                )
+                for _, operation_name, batch in batches
+            ]
+        )
+
+        responses: List[List[Dict[str, Any]]] = [[] for _ in requests]
+        for (request_index, operation_name, batch), batch_response in zip(
+            batches, batch_responses
+        ):
+            responses[request_index].extend(
+                self.operations.split_repeated_response(
+                    operation_name, len(batch), batch_response
+                )
+            )
+        return responses
+
+    def subscribe_to_robot_state(
+        self, exr_robot_id: str, robot_state: RobotStateStore
+    ) -> None:
+        """
+        Keeps the robot state store up to date with the robot status and mission
+        execution pushed over subscriptions. The store is cleared whenever the
+        subscription connection is lost.
+        """
+        params: dict = {"robotID": exr_robot_id}
+
+        self.client.subscriptions.subscribe(
+            "OnRobotStatus",
+            params,
+            lambda result: robot_state.update(
+                RobotStateKey.RobotStatus, result["onRobotStatus"]
+            ),
+        )
+        self._subscribe_to_executions(exr_robot_id, robot_state)
+        self.client.subscriptions.add_connection_listener(
+            lambda connected: None if connected else robot_state.clear()
+        )
+        self.client.subscriptions.start()
+
+    def _subscribe_to_executions(
+        self, exr_robot_id: str, robot_state: RobotStateStore
+    ) -> None:
         params: dict = {"robotID": exr_robot_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+        self.client.subscriptions.subscribe(
+            "OnMissionExecutionStatus",
+            params,
+            lambda result: robot_state.update(
+                RobotStateKey.MissionExecution,
+                result["onMissionExecutionStatus"]["missionExecution"],
+            ),
+        )
+
+    def subscribe_to_fleet_state(
+        self, robot_states: Dict[str, RobotStateStore]
+    ) -> None:
+        """
+        Like 'subscribe_to_robot_state' for several robots, with the statuses of all
+        robots pushed over one subscription.
 
-        pause_current_mission_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.pauseMissionExecution.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(
-                self.schema.MissionExecutionType.id,
-                self.schema.MissionExecutionType.status,
-                self.schema.MissionExecutionType.failures,
+        :param robot_states: The robot state store of each robot, by robot id
+        """
+
+        def update_robot_statuses(result: Dict[str, Any]) -> None:
+            for status_per_robot in result["onRobotStatuses"]:
+                robot_state: Optional[RobotStateStore] = robot_states.get(
+                    status_per_robot["robotID"]
+                )
+                if robot_state is not None:
+                    robot_state.update(
+                        RobotStateKey.RobotStatus, status_per_robot["status"]
+                    )
+
+        self.client.subscriptions.subscribe(
+            "OnRobotStatuses",
+            {"robotIDs": list(robot_states)},
+            update_robot_statuses,
+        )
+        for exr_robot_id, robot_state in robot_states.items():
+            self._subscribe_to_executions(exr_robot_id, robot_state)
+            self.client.subscriptions.add_connection_listener(
+                lambda connected, robot_state=robot_state: (
+                    None if connected else robot_state.clear()
+                )
             )
+        self.client.subscriptions.start()
+
+    def is_mission_running(self, exr_robot_id: str) -> bool:
+        is_mission_running_query: DocumentNode = self.operations.get("IsMissionRunning")
+
+        params: dict = {"robotID": exr_robot_id}
+        response_dict: dict[str, Any] = self.client.query(
+            is_mission_running_query, params
         )
 
-        pause_current_mission_mutation.variable_definitions = (
-            variable_definitions_graphql
+        return response_dict["isMissionRunning"]
+
+    def pause_current_mission(self, exr_robot_id: str) -> None:
+        params: dict = {"robotID": exr_robot_id}
+
+        pause_current_mission_mutation: DocumentNode = self.operations.get(
+            "PauseMissionExecution"
         )
 
         try:
             result: Dict[str, Any] = self.client.query(
-                dsl_gql(pause_current_mission_mutation), params
+                pause_current_mission_mutation, params
             )
         except Exception:
             raise RobotCommunicationException(
@@ -175,32 +450,80 @@ class EnergyRoboticsApi:
 
     def get_point_of_interest_by_customer_tag(
         self, customer_tag: str, site_id: str
-    ) -> str:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        point_of_interest_query: DSLQuery = DSLQuery(
-            self.schema.Query.pointOfInterestByCustomerTag.args(
-                customerTag=variable_definitions_graphql.customerTag,
-                siteId=variable_definitions_graphql.siteId,
-            ).select(self.schema.PointOfInterestType.id)
+    ) -> Optional[str]:
+        """
+        :return: The id of the POI, or None if the site has no POI with the tag.
+
+        :raises RobotAPIException: The POI could not be looked up
+        """
+        point_of_interest_query: DocumentNode = self.operations.get(
+            "PointOfInterestByCustomerTag"
         )
 
-        point_of_interest_query.variable_definitions = variable_definitions_graphql
-
         params: dict = {"customerTag": customer_tag, "siteId": site_id}
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(point_of_interest_query), params
+                point_of_interest_query, params
             )
-        except Exception:
+        except TransportQueryError as e:
+            # The API answers with an error when no POI has the tag
+            self.logger.debug(f"No POI found with customer tag {customer_tag}: {e}")
             return None
+        except Exception:
+            message: str = f"Could not look up POI with customer tag {customer_tag}"
+            self.logger.error(message)
+            raise RobotAPIException(
+                error_description=message,
+            )
 
         if response_dict["pointOfInterestByCustomerTag"] is None:
-            raise None
+            return None
 
         return response_dict["pointOfInterestByCustomerTag"]["id"]
 
+    def get_points_of_interest_by_site(self, site_id: str) -> List[Dict[str, Any]]:
+        """
+        :return: The id and customer tag of every POI on the site.
+        """
+        points_of_interest_query: DocumentNode = self.operations.get(
+            "PointsOfInterestBySite"
+        )
+
+        params: dict = {"siteId": site_id}
+
+        try:
+            response_dict: dict[str, Any] = self.client.query(
+                points_of_interest_query, params
+            )
+        except Exception:
+            message: str = "Could not get the POIs of the site"
+            self.logger.error(message)
+            raise RobotAPIException(
+                error_description=message,
+            )
+
+        return response_dict["pointOfInterestBySite"]
+
+    def subscribe_to_points_of_interest(
+        self,
+        site_id: str,
+        callback: Callable[[Dict[str, Any]], None],
+        connection_listener: Callable[[bool], None],
+    ) -> None:
+        """
+        Calls the callback with every POI change on the site, i.e. the operation and
+        the affected POI. The connection listener is told when the subscription
+        connection goes up or down, as changes are missed while it is down.
+        """
+        self.client.subscriptions.subscribe(
+            "OnPointOfInterest",
+            {"siteId": site_id},
+            lambda result: callback(result["onPointOfInterest"]),
+        )
+        self.client.subscriptions.add_connection_listener(connection_listener)
+        self.client.subscriptions.start()
+
     def create_point_of_interest(
         self, point_of_interest_input: AddPointOfInterestInput
     ) -> str:
@@ -208,21 +531,13 @@ class EnergyRoboticsApi:
             "AddPointOfInterestInput": to_dict(point_of_interest_input),
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        create_point_of_interest_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.addPointOfInterest.args(
-                input=variable_definitions_graphql.AddPointOfInterestInput
-            ).select(self.schema.PointOfInterestType.id)
-        )
-
-        create_point_of_interest_mutation.variable_definitions = (
-            variable_definitions_graphql
+        create_point_of_interest_mutation: DocumentNode = self.operations.get(
+            "AddPointOfInterest"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_point_of_interest_mutation), params
+                create_point_of_interest_mutation, params
             )
         except Exception:
             message: str = "Could not create POI"
@@ -233,6 +548,33 @@ class EnergyRoboticsApi:
 
         return response_dict["addPointOfInterest"]["id"]
 
+    @tracer.traced()
+    def create_points_of_interest(
+        self, point_of_interest_inputs: Sequence[AddPointOfInterestInput]
+    ) -> List[str]:
+        """
+        Creates all the POIs with as few requests as possible.
+
+        :return: The ids of the created POIs, in the order of the inputs.
+        """
+        params: List[Dict[str, Any]] = [
+            {"AddPointOfInterestInput": to_dict(point_of_interest_input)}
+            for point_of_interest_input in point_of_interest_inputs
+        ]
+
+        try:
+            responses: List[Dict[str, Any]] = self.query_repeated(
+                "AddPointOfInterest", params
+            )
+        except Exception:
+            message: str = "Could not create POIs"
+            self.logger.error(message)
+            raise RobotMapException(
+                error_description=message,
+            )
+
+        return [response["addPointOfInterest"]["id"] for response in responses]
+
     def upsert_point_of_interest(
         self, point_of_interest_input: UpsertPointOfInterestInput
     ) -> str:
@@ -246,21 +588,13 @@ class EnergyRoboticsApi:
             "UpsertPointOfInterestInput": upsert_point_of_interest_input,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        upsert_point_of_interest_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.upsertPointOfInterest.args(
-                input=variable_definitions_graphql.UpsertPointOfInterestInput
-            ).select(self.schema.PointOfInterestType.id)
-        )
-
-        upsert_point_of_interest_mutation.variable_definitions = (
-            variable_definitions_graphql
+        upsert_point_of_interest_mutation: DocumentNode = self.operations.get(
+            "UpsertPointOfInterest"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(upsert_point_of_interest_mutation), params
+                upsert_point_of_interest_mutation, params
             )
         except Exception:
             message: str = "Could not upsert POI"
@@ -274,35 +608,19 @@ class EnergyRoboticsApi:
     def create_dock_robot_task_definition(
         self, site_id: str, task_name: str, docking_station_id: str
     ) -> str:
-        params: dict[str, Any] = {
-            "siteId": site_id,
-            "name": task_name,
-            "dockingStationId": docking_station_id,
-        }
-
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        mutation_args: dict[str, Any] = {
-            "input": {
-                "siteId": variable_definitions_graphql.siteId,
-                "name": variable_definitions_graphql.name,
-                "dockingStationId": variable_definitions_graphql.dockingStationId,
-            }
-        }
-
-        create_dock_robot_task_definition_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.createDockRobotTaskDefinition.args(
-                **mutation_args
-            ).select(self.schema.DockRobotTaskDefinitionType.id)
-        )
-
-        create_dock_robot_task_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        params: dict[str, Any] = dock_robot_task_definition(
+            site_id=site_id,
+            task_name=task_name,
+            docking_station_id=docking_station_id,
+        )[1]
+
+        create_dock_robot_task_definition_mutation: DocumentNode = self.operations.get(
+            "CreateDockRobotTaskDefinition"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_dock_robot_task_definition_mutation), params
+                create_dock_robot_task_definition_mutation, params
             )
         except Exception:
             message: str = "Could not create dock task definition"
@@ -316,35 +634,19 @@ class EnergyRoboticsApi:
     def create_point_of_interest_inspection_task_definition(
         self, site_id: str, task_name: str, point_of_interest_id: str
     ) -> str:
-        params: dict[str, Any] = {
-            "siteId": site_id,
-            "name": task_name,
-            "poiId": point_of_interest_id,
-        }
-
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        mutation_args: dict[str, Any] = {
-            "input": {
-                "siteId": variable_definitions_graphql.siteId,
-                "name": variable_definitions_graphql.name,
-                "poiId": variable_definitions_graphql.poiId,
-            }
-        }
-
-        create_poi_inspection_task_definition_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.createPoiInspectionTaskDefinition.args(
-                **mutation_args
-            ).select(self.schema.PoiInspectionTaskDefinitionType.id)
-        )
-
-        create_poi_inspection_task_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        params: dict[str, Any] = point_of_interest_inspection_task_definition(
+            site_id=site_id,
+            task_name=task_name,
+            point_of_interest_id=point_of_interest_id,
+        )[1]
+
+        create_poi_inspection_task_definition_mutation: DocumentNode = (
+            self.operations.get("CreatePoiInspectionTaskDefinition")
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_poi_inspection_task_definition_mutation), params
+                create_poi_inspection_task_definition_mutation, params
             )
         except Exception:
             message: str = "Could not create dock task definition"
@@ -358,34 +660,19 @@ class EnergyRoboticsApi:
     def create_waypoint_task_definition(
         self, site_id: str, task_name: str, pose_3D_stamped_input: Pose3DStampedInput
     ) -> str:
-        params: dict[str, Any] = {
-            "siteId": site_id,
-            "name": task_name,
-            "waypoint": to_dict(pose_3D_stamped_input),
-        }
-
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        mutation_args: dict[str, Any] = {
-            "input": {
-                "siteId": variable_definitions_graphql.siteId,
-                "name": variable_definitions_graphql.name,
-                "waypoint": variable_definitions_graphql.waypoint,
-            }
-        }
-        create_waypoint_task_definition_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.createWaypointTaskDefinition.args(
-                **mutation_args
-            ).select(self.schema.WaypointTaskDefinitionType.id)
-        )
-
-        create_waypoint_task_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        params: dict[str, Any] = waypoint_task_definition(
+            site_id=site_id,
+            task_name=task_name,
+            pose_3D_stamped_input=pose_3D_stamped_input,
+        )[1]
+
+        create_waypoint_task_definition_mutation: DocumentNode = self.operations.get(
+            "CreateWaypointTaskDefinition"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_waypoint_task_definition_mutation), params
+                create_waypoint_task_definition_mutation, params
             )
         except TransportQueryError as e:
             raise RobotInfeasibleMissionException(
@@ -400,6 +687,87 @@ class EnergyRoboticsApi:
 
         return response_dict["createWaypointTaskDefinition"]["id"]
 
+    @tracer.traced()
+    def create_task_definitions(
+        self, task_definitions: Sequence[Tuple[str, Dict[str, Any]]]
+    ) -> List[str]:
+        """
+        Creates task definitions of any type with as few requests as possible, which
+        are sent concurrently.
+
+        :param task_definitions: The creating operation, e.g.
+            'CreateWaypointTaskDefinition', and its variables for each task definition
+        :return: The ids of the created task definitions, in the order they were given
+        """
+        params_by_operation: Dict[str, List[Dict[str, Any]]] = {}
+        for operation_name, params in task_definitions:
+            params_by_operation.setdefault(operation_name, []).append(params)
+        operation_names: List[str] = list(params_by_operation)
+
+        try:
+            responses: List[List[Dict[str, Any]]] = self.query_repeated_concurrently(
+                [
+                    (operation_name, params_by_operation[operation_name])
+                    for operation_name in operation_names
+                ]
+            )
+        except TransportQueryError as e:
+            raise RobotInfeasibleMissionException(
+                f"Unable to create task definitions, e.g. as a waypoint is not "
+                f"reachable: {e}"
+            )
+        except Exception:
+            message: str = "Could not create task definitions"
+            self.logger.error(message)
+            raise RobotAPIException(
+                error_description=message,
+            )
+
+        # Each operation has a single root field holding the created task definition
+        created_ids: Dict[str, Iterator[str]] = {
+            operation_name: iter(
+                next(iter(response.values()))["id"] for response in operation_responses
+            )
+            for operation_name, operation_responses in zip(operation_names, responses)
+        }
+        return [
+            next(created_ids[operation_name]) for operation_name, _ in task_definitions
+        ]
+
+    @tracer.traced()
+    def add_tasks_to_mission_definition(
+        self, task_ids: Sequence[str], mission_definition_id: str
+    ) -> None:
+        """
+        Appends the tasks to the mission definition in the given order. Mutations in
+        one request are executed one after another, so the tasks are added in
+        batches that are sent one at a time.
+        """
+        batch_size: int = settings.ROBOT_API_MAX_BATCH_SIZE
+        params: List[Dict[str, Any]] = [
+            {
+                "missionTaskDefinitionId": task_id,
+                "missionDefinitionId": mission_definition_id,
+            }
+            for task_id in task_ids
+        ]
+
+        try:
+            for i in range(0, len(params), batch_size):
+                batch: List[Dict[str, Any]] = params[i : i + batch_size]
+                self.client.query(
+                    self.operations.get_repeated_batch(
+                        "AddTaskToMissionDefinition", len(batch)
+                    ),
+                    self.operations.get_repeated_variables(batch),
+                )
+        except Exception:
+            message: str = "Could not add tasks to mission definition"
+            self.logger.error(message)
+            raise RobotAPIException(
+                error_description=message,
+            )
+
     def add_task_to_mission_definition(
         self, task_id: str, mission_definition_id: str, index: int = -1
     ):
@@ -408,28 +776,18 @@ class EnergyRoboticsApi:
             "missionDefinitionId": mission_definition_id,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-        mutation_args: dict[str, Any] = {
-            "missionTaskDefinitionId": variable_definitions_graphql.missionTaskDefinitionId,
-            "missionDefinitionId": variable_definitions_graphql.missionDefinitionId,
-        }
+        operation_name: str = "AddTaskToMissionDefinition"
         if index >= 0:
-            mutation_args["index"] = variable_definitions_graphql.index
+            operation_name = "AddTaskToMissionDefinitionAtIndex"
             params["index"] = index
 
-        add_task_to_mission_definition_mutation: DSLMutation = DSLMutation(
-            self.client.schema.Mutation.addTaskToMissionDefinition.args(
-                **mutation_args
-            ).select(self.client.schema.MissionDefinitionType.id)
-        )
-
-        add_task_to_mission_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        add_task_to_mission_definition_mutation: DocumentNode = self.operations.get(
+            operation_name
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(add_task_to_mission_definition_mutation), params
+                add_task_to_mission_definition_mutation, params
             )
         except Exception:
             message: str = "Could not add task to mission definition"
@@ -448,25 +806,13 @@ class EnergyRoboticsApi:
             "missionDefinitionId": mission_definition_id,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-        mutation_args: dict[str, Any] = {
-            "missionTaskDefinitionId": variable_definitions_graphql.missionTaskDefinitionId,
-            "missionDefinitionId": variable_definitions_graphql.missionDefinitionId,
-        }
-
-        remove_task_from_mission_definition_mutation: DSLMutation = DSLMutation(
-            self.client.schema.Mutation.removeTaskFromMissionDefinition.args(
-                **mutation_args
-            ).select(self.client.schema.MissionDefinitionType.id)
-        )
-
-        remove_task_from_mission_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        remove_task_from_mission_definition_mutation: DocumentNode = (
+            self.operations.get("RemoveTaskFromMissionDefinition")
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(remove_task_from_mission_definition_mutation), params
+                remove_task_from_mission_definition_mutation, params
             )
         except Exception:
             message: str = "Could not remove task from mission definition"
@@ -482,23 +828,14 @@ class EnergyRoboticsApi:
     ) -> None:
         params: dict = {"robotID": exr_robot_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        wake_up_robot_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.executeAwakeCommand.args(
-                targetState=AwakeStatus.Awake,
-                robotID=variable_definitions_graphql.robotID,
-            ).select(
-                self.schema.RobotCommandExecutionType.id,
-            )
+        wake_up_robot_mutation: DocumentNode = self.operations.get(
+            "ExecuteAwakeCommand"
         )
 
-        wake_up_robot_mutation.variable_definitions = variable_definitions_graphql
-
         try:
             result: Dict[str, Any] = (
                 self.client.query(  # TODO: consider checking if request was accepted
-                    dsl_gql(wake_up_robot_mutation), params
+                    wake_up_robot_mutation, params
                 )
             )
         except TransportQueryError as e:
@@ -526,23 +863,10 @@ class EnergyRoboticsApi:
     def is_robot_awake(self, exr_robot_id: str) -> bool:
         params: dict = {"robotID": exr_robot_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        check_if_awake_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentRobotStatus.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(
-                self.schema.RobotStatusType.isConnected,
-                self.schema.RobotStatusType.awakeStatus,
-            )
-        )
-
-        check_if_awake_query.variable_definitions = variable_definitions_graphql
+        check_if_awake_query: DocumentNode = self.operations.get("RobotAwakeStatus")
 
         try:
-            result: Dict[str, Any] = self.client.query(
-                dsl_gql(check_if_awake_query), params
-            )
+            result: Dict[str, Any] = self.client.query(check_if_awake_query, params)
         except Exception:
             message: str = "Could not check if robot is awake"
             self.logger.error(message)
@@ -562,29 +886,12 @@ class EnergyRoboticsApi:
     def get_battery_level(self, exr_robot_id: str) -> Optional[float]:
         params: dict = {"robotID": exr_robot_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        check_battery_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentRobotStatus.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(
-                self.schema.RobotStatusType.isConnected,
-                self.schema.RobotStatusType.batteryStatus.select(
-                    self.schema.BatteryStatusType.percentage
-                ),
-            )
-        )
-
-        check_battery_query.variable_definitions = variable_definitions_graphql
+        check_battery_query: DocumentNode = self.operations.get("RobotBatteryLevel")
 
         try:
-            result: Dict[str, Any] = self.client.query(
-                dsl_gql(check_battery_query), params
-            )
-        except TimeoutError as e:
-            self.logger.warning(
-                f"Could not check robot battery level due to timeout: {e}"
-            )
+            result: Dict[str, Any] = self.client.query(check_battery_query, params)
+        except (TimeoutError, CircuitOpenException) as e:
+            self.logger.warning(f"Could not check robot battery level: {e}")
             return None
         except Exception as e:
             message: str = "Could not check robot battery level"
@@ -610,28 +917,17 @@ class EnergyRoboticsApi:
     def is_connected(self, exr_robot_id: str) -> bool:
         params: dict = {"robotID": exr_robot_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        check_is_connected_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentRobotStatus.args(
-                robotID=variable_definitions_graphql.robotID
-            ).select(
-                self.schema.RobotStatusType.isConnected,
-            )
-        )
-
-        check_is_connected_query.variable_definitions = variable_definitions_graphql
+        check_is_connected_query: DocumentNode = self.operations.get("RobotIsConnected")
 
         try:
-            result: Dict[str, Any] = self.client.query(
-                dsl_gql(check_is_connected_query), params
-            )
-        except TimeoutError as e:
-            self.logger.warning(f"Could not check robot due to timeout: {e}")
+            result: Dict[str, Any] = self.client.query(check_is_connected_query, params)
+        except (TimeoutError, CircuitOpenException) as e:
+            self.logger.warning(f"Could not check robot: {e}")
             return False
 
         return result["currentRobotStatus"]["isConnected"]
 
+    @tracer.traced()
     def create_mission_definition(
         self, site_id: str, mission_name: str, robot_id: str
     ) -> str:
@@ -641,28 +937,13 @@ class EnergyRoboticsApi:
             "requiredRobotConfig": {"robotId": robot_id},
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        mutation_args: dict[str, Any] = {
-            "input": {
-                "siteId": variable_definitions_graphql.siteId,
-                "name": variable_definitions_graphql.name,
-                "requiredRobotConfig": variable_definitions_graphql.requiredRobotConfig,
-            }
-        }
-        create_mission_definition_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.createMissionDefinition.args(**mutation_args).select(
-                self.schema.MissionDefinitionType.id
-            )
-        )
-
-        create_mission_definition_mutation.variable_definitions = (
-            variable_definitions_graphql
+        create_mission_definition_mutation: DocumentNode = self.operations.get(
+            "CreateMissionDefinition"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_mission_definition_mutation), params
+                create_mission_definition_mutation, params
             )
         except Exception:
             message: str = "Could not create mission definition"
@@ -674,33 +955,56 @@ class EnergyRoboticsApi:
         mission_definition_id = response_dict["createMissionDefinition"]["id"]
         return mission_definition_id
 
+    def get_mission_definition_task_ids(
+        self, mission_definition_id: str
+    ) -> Optional[List[str]]:
+        """
+        :return: The ids of the tasks of the mission definition in order, or None if
+            the mission definition does not exist.
+
+        :raises RobotAPIException: The mission definition could not be requested
+        """
+        mission_definition_query: DocumentNode = self.operations.get(
+            "MissionDefinitionTasks"
+        )
+
+        params: dict[str, Any] = {"id": mission_definition_id}
+
+        try:
+            response_dict: dict[str, Any] = self.client.query(
+                mission_definition_query, params
+            )
+        except TransportQueryError as e:
+            self.logger.debug(
+                f"Mission definition {mission_definition_id} was not found: {e}"
+            )
+            return None
+        except Exception:
+            message: str = "Could not get mission definition"
+            self.logger.error(message)
+            raise RobotAPIException(
+                error_description=message,
+            )
+
+        if response_dict["missionDefinition"] is None:
+            return None
+
+        return [task["id"] for task in response_dict["missionDefinition"]["tasks"]]
+
+    @tracer.traced()
     def start_mission_execution(self, mission_definition_id: str, robot_id: str) -> str:
         params: dict[str, Any] = {
             "robotID": robot_id,
             "missionDefinitionID": mission_definition_id,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        mutation_args: dict[str, Any] = {
-            "input": {
-                "robotID": variable_definitions_graphql.robotID,
-                "missionDefinitionID": variable_definitions_graphql.missionDefinitionID,
-            }
-        }
-        start_mission_execution_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.startMissionExecution.args(**mutation_args).select(
-                self.schema.MissionExecutionType.id
-            )
-        )
-
-        start_mission_execution_mutation.variable_definitions = (
-            variable_definitions_graphql
+        start_mission_execution_mutation: DocumentNode = self.operations.get(
+            "StartMissionExecution"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(start_mission_execution_mutation), params
+                start_mission_execution_mutation, params
             )
         except Exception:
             message: str = "Could not start mission execution"
@@ -712,24 +1016,17 @@ class EnergyRoboticsApi:
         mission_execution_id = response_dict["startMissionExecution"]["id"]
         return mission_execution_id
 
+    @tracer.traced()
     def discard_stage(self, stage_id: str) -> str:
         params: dict[str, Any] = {
             "siteStageId": stage_id,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        discard_stage_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.discardSiteStage.args(
-                siteStageId=variable_definitions_graphql.siteStageId,
-            ).select(self.schema.SiteStageType.id)
-        )
-
-        discard_stage_mutation.variable_definitions = variable_definitions_graphql
+        discard_stage_mutation: DocumentNode = self.operations.get("DiscardSiteStage")
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(discard_stage_mutation), params
+                discard_stage_mutation, params
             )
         except Exception:
             raise RobotAPIException(
@@ -738,24 +1035,17 @@ class EnergyRoboticsApi:
 
         return response_dict["discardSiteStage"]["id"]
 
+    @tracer.traced()
     def create_stage(self, site_id: str) -> str:
         params: dict[str, Any] = {
             "siteId": site_id,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        create_stage_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.openSiteStage.args(
-                siteId=variable_definitions_graphql.siteId,
-            ).select(self.schema.SiteStageType.id)
-        )
-
-        create_stage_mutation.variable_definitions = variable_definitions_graphql
+        create_stage_mutation: DocumentNode = self.operations.get("OpenSiteStage")
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(create_stage_mutation), params
+                create_stage_mutation, params
             )
         except Exception:
             message: str = "Could not create stage"
@@ -769,22 +1059,13 @@ class EnergyRoboticsApi:
     def add_point_of_interest_to_stage(self, POI_id: str, stage_id: str) -> str:
         params: dict[str, Any] = {"siteStageId": stage_id, "pointOfInterestId": POI_id}
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        add_point_of_interest_to_stage_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.addPointOfInterestToStage.args(
-                siteStageId=variable_definitions_graphql.siteStageId,
-                pointOfInterestId=variable_definitions_graphql.pointOfInterestId,
-            ).select(self.schema.SiteStageType.id)
-        )
-
-        add_point_of_interest_to_stage_mutation.variable_definitions = (
-            variable_definitions_graphql
+        add_point_of_interest_to_stage_mutation: DocumentNode = self.operations.get(
+            "AddPointOfInterestToStage"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(add_point_of_interest_to_stage_mutation), params
+                add_point_of_interest_to_stage_mutation, params
             )
         except Exception:
             raise RobotAPIException(
@@ -793,26 +1074,41 @@ class EnergyRoboticsApi:
 
         return response_dict["addPointOfInterestToStage"]["id"]
 
-    def commit_site_to_snapshot(self, stage_id: str) -> str:
+    @tracer.traced()
+    def add_points_of_interest_to_stage(self, POI_ids: List[str], stage_id: str) -> str:
         params: dict[str, Any] = {
             "siteStageId": stage_id,
+            "pointOfInterestIds": POI_ids,
         }
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        commit_site_to_snapshot_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.commitSiteChanges.args(
-                siteStageId=variable_definitions_graphql.siteStageId,
-            ).select(self.schema.SiteSnapshotType.id)
+        add_points_of_interest_to_stage_mutation: DocumentNode = self.operations.get(
+            "AddPointsOfInterestToStage"
         )
 
-        commit_site_to_snapshot_mutation.variable_definitions = (
-            variable_definitions_graphql
+        try:
+            response_dict: dict[str, Any] = self.client.query(
+                add_points_of_interest_to_stage_mutation, params
+            )
+        except Exception:
+            raise RobotAPIException(
+                error_description="Could not add POIs to stage",
+            )
+
+        return response_dict["addPointsOfInterestToStage"]["id"]
+
+    @tracer.traced()
+    def commit_site_to_snapshot(self, stage_id: str) -> str:
+        params: dict[str, Any] = {
+            "siteStageId": stage_id,
+        }
+
+        commit_site_to_snapshot_mutation: DocumentNode = self.operations.get(
+            "CommitSiteChanges"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(commit_site_to_snapshot_mutation), params
+                commit_site_to_snapshot_mutation, params
             )
         except Exception:
             message: str = "Could not commit site to snapshot"
@@ -824,25 +1120,15 @@ class EnergyRoboticsApi:
         return response_dict["commitSiteChanges"]["id"]
 
     def is_pipeline_completed(self, site_id: str) -> bool:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        current_processing_pipeline: DSLQuery = DSLQuery(
-            self.schema.Query.currentSiteSnapshotHeadSelectionProcessingPipeline.args(
-                siteId=variable_definitions_graphql.siteId
-            ).select(
-                self.schema.ProcessingPipelineType.stages.select(
-                    self.schema.ProcessingPipelineStageType.state
-                )
-            )
+        current_processing_pipeline: DocumentNode = self.operations.get(
+            "CurrentSiteSnapshotHeadSelectionProcessingPipeline"
         )
 
-        current_processing_pipeline.variable_definitions = variable_definitions_graphql
-
         params: dict = {"siteId": site_id}
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(current_processing_pipeline), params
+                current_processing_pipeline, params
             )
         except Exception as e:
             message: str = "Could not get current processing pipeline"
@@ -851,34 +1137,75 @@ class EnergyRoboticsApi:
                 error_description=message,
             )
 
-        if (
-            response_dict["currentSiteSnapshotHeadSelectionProcessingPipeline"][
-                "stages"
-            ][0]["state"]
-            == "COMPLETED"
-        ):
-            return True
-        return False
+        return is_pipeline_completed(
+            response_dict["currentSiteSnapshotHeadSelectionProcessingPipeline"]
+        )
 
-    def set_snapshot_as_head(self, snapshot_id: str, site_id: str) -> str:
-        params: dict[str, Any] = {"siteId": site_id, "siteSnapshotId": snapshot_id}
+    @tracer.traced()
+    def wait_for_pipeline_completion(
+        self, site_id: str, timeout: float = settings.PIPELINE_COMPLETION_TIMEOUT
+    ) -> None:
+        """
+        Waits for the site processing pipeline to complete after a site change.
+
+        With subscriptions enabled, the wait ends as soon as the API pushes the
+        completed pipeline. The pipeline is polled as well, with an exponential
+        backoff, which covers the pipeline completing before the subscription is
+        in place and the subscription being unavailable.
+
+        :raises RobotAPIException: The pipeline did not complete within the timeout
+        """
+        deadline: float = monotonic() + timeout
+        completed: Event = Event()
+
+        subscription: Optional[Future] = None
+        if settings.ROBOT_API_SUBSCRIPTIONS_ENABLED:
+            subscription = self.client.subscriptions.wait_for(
+                "OnSiteSnapshotHeadSelectionProcessingPipeline",
+                {"siteId": site_id},
+                lambda result: is_pipeline_completed(
+                    result["onSiteSnapshotHeadSelectionProcessingPipeline"]["pipeline"]
+                ),
+            )
+            subscription.add_done_callback(
+                lambda future: (
+                    completed.set()
+                    if not future.cancelled() and future.exception() is None
+                    else None
+                )
+            )
 
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+        poll_interval: float = settings.PIPELINE_POLL_INITIAL_INTERVAL
+        try:
+            while not self.is_pipeline_completed(site_id=site_id):
+                remaining_time: float = deadline - monotonic()
+                if remaining_time <= 0:
+                    message: str = (
+                        f"Site processing pipeline did not complete within "
+                        f"{timeout} seconds"
+                    )
+                    self.logger.error(message)
+                    raise RobotAPIException(error_description=message)
+                if completed.wait(min(poll_interval, remaining_time)):
+                    return
+                poll_interval = min(
+                    poll_interval * 2, settings.PIPELINE_POLL_MAX_INTERVAL
+                )
+        finally:
+            if subscription is not None:
+                subscription.cancel()
 
-        set_snapshot_as_head_mutation: DSLMutation = DSLMutation(
-            self.schema.Mutation.processSiteSnapshotHeadSelection.args(
-                siteId=variable_definitions_graphql.siteId,
-                siteSnapshotId=variable_definitions_graphql.siteSnapshotId,
-            ).select(self.schema.ProcessingPipelineType.id)
-        )
+    @tracer.traced()
+    def set_snapshot_as_head(self, snapshot_id: str, site_id: str) -> str:
+        params: dict[str, Any] = {"siteId": site_id, "siteSnapshotId": snapshot_id}
 
-        set_snapshot_as_head_mutation.variable_definitions = (
-            variable_definitions_graphql
+        set_snapshot_as_head_mutation: DocumentNode = self.operations.get(
+            "ProcessSiteSnapshotHeadSelection"
         )
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(set_snapshot_as_head_mutation), params
+                set_snapshot_as_head_mutation, params
             )
         except Exception:
             message: str = "Could not set snapshop as head"
@@ -890,21 +1217,13 @@ class EnergyRoboticsApi:
         return response_dict["processSiteSnapshotHeadSelection"]["id"]
 
     def get_current_site_stage(self, site_id: str) -> str:
-        variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
-
-        current_site_stage_query: DSLQuery = DSLQuery(
-            self.schema.Query.currentSiteStage.args(
-                siteId=variable_definitions_graphql.siteId
-            ).select(self.schema.SiteStageType.id)
-        )
-
-        current_site_stage_query.variable_definitions = variable_definitions_graphql
+        current_site_stage_query: DocumentNode = self.operations.get("CurrentSiteStage")
 
         params: dict = {"siteId": site_id}
 
         try:
             response_dict: dict[str, Any] = self.client.query(
-                dsl_gql(current_site_stage_query), params
+                current_site_stage_query, params
             )
 
             if response_dict["currentSiteStage"] is not None:
@@ -1,9 +1,12 @@
+import atexit
+import json
+from asyncio import CancelledError
+from concurrent.futures import Future
 from logging import Logger, getLogger
-from typing import Any, Dict
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from gql import Client
 from gql.dsl import DSLSchema
-from gql.transport.httpx import HTTPXTransport
 from gql.transport.exceptions import (
     TransportClosed,
     TransportProtocolError,
@@ -11,58 +14,212 @@ from gql.transport.exceptions import (
     TransportServerError,
     TransportAlreadyConnected,
 )
-from graphql import DocumentNode, GraphQLError, GraphQLSchema, build_ast_schema, parse
+from graphql import DocumentNode, GraphQLError, GraphQLSchema
 from httpx import ConnectTimeout, ReadTimeout
 
-from isar_exr.api.authentication import get_access_token
+from isar_exr.api.api_metrics import ApiMetrics
+from isar_exr.api.async_graphql_session import AsyncGraphqlSession
+from isar_exr.api.authentication import TokenManager, get_access_token
+from isar_exr.api.cassette import (
+    REPLAY_TOKEN,
+    CassetteMode,
+    CassettePlayer,
+    CassetteRecorder,
+)
+from isar_exr.api.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenException,
+)
+from isar_exr.api.operations import operation_registry
+from isar_exr.api.request_coalescer import RequestCoalescer
+from isar_exr.api.schema_cache import schema_cache
+from isar_exr.api.subscriptions import SubscriptionManager
 from isar_exr.config.settings import settings
+from isar_exr.tracing import tracer
 
 
 class GraphqlClient:
+    """
+    Client for the Energy Robotics GraphQL API, shared by the state machine and the
+    telemetry publisher threads.
+
+    All requests are executed on the event loop of one session, which hands out
+    connections from its pool, so any thread may query at any time. The access
+    token is replaced atomically by the token manager, and whether a request has
+    already been retried with a new token is tracked per request.
+    """
+
     def __init__(self) -> None:
-        # Parameter used for retrying query with new authentication
-        # in case of expired token
-        self._reauthenticated: bool = False
         self.logger: Logger = getLogger("graphql_client")
         self._initialize_session()
 
-    def _get_updated_auth_header(self) -> Dict:
-        try:
-            token: str = get_access_token()
-        except Exception as e:
-            self.logger.critical(f"CRITICAL - Error getting access token: \n{e}")
-            raise
+    def _get_auth_header(self, token: str) -> Dict:
         auth_header: dict = {
             "authorization": "Bearer " + token,
         }
         return auth_header
 
-    def _refresh_session(self) -> None:
-        auth_header = self._get_updated_auth_header()
-        transport: HTTPXTransport = HTTPXTransport(
-            url=settings.ROBOT_API_URL, headers=auth_header
-        )
-        # self.session.transport = transport
-        schema: GraphQLSchema = build_ast_schema(self.document)
-        self.client = Client(transport=transport, schema=schema)
-        self.session = self.client.connect_sync()
+    def _update_auth_header(self, token: str) -> None:
+        self.session.update_headers(self._get_auth_header(token))
+
+    def _refresh_session(self, rejected_token: str) -> None:
+        # The new token is swapped into the live transport by '_update_auth_header'
+        self.token_manager.refresh(rejected_token=rejected_token)
+
+    def _initialize_cassette(self) -> None:
+        # Requests are recorded to, or answered from, the cassette by '_execute'
+        self.cassette_recorder: Optional[CassetteRecorder] = None
+        self.cassette_player: Optional[CassettePlayer] = None
+        cassette_mode: CassetteMode = CassetteMode(settings.ROBOT_API_CASSETTE_MODE)
+        if cassette_mode == CassetteMode.Record:
+            self.cassette_recorder = CassetteRecorder(settings.ROBOT_API_CASSETTE_PATH)
+            # ISAR does not shut down the robot interface, so the recording is
+            # completed when the process exits
+            atexit.register(self.close)
+        elif cassette_mode == CassetteMode.Replay:
+            self.cassette_player = CassettePlayer.load(
+                settings.ROBOT_API_CASSETTE_PATH,
+                time_scale=settings.ROBOT_API_CASSETTE_TIME_SCALE,
+            )
 
     def _initialize_session(self) -> None:
-        auth_header = self._get_updated_auth_header()
+        self._initialize_cassette()
+        fetch_token: Callable[[], str] = get_access_token
+        if self.cassette_player is not None:
+            fetch_token = lambda: REPLAY_TOKEN
+        self.token_manager: TokenManager = TokenManager(fetch_token=fetch_token)
+        auth_header = self._get_auth_header(self.token_manager.token)
+
+        self.graphql_schema: GraphQLSchema = schema_cache.get_schema()
 
-        # Loading schema from file is recommended,
-        # ref https://github.com/graphql-python/gql/issues/331
-        with open(settings.PATH_TO_GRAPHQL_SCHEMA, encoding="utf-8") as source:
-            self.document = parse(source.read())
+        self.session: AsyncGraphqlSession = AsyncGraphqlSession(
+            url=settings.ROBOT_API_URL,
+            headers=auth_header,
+            schema=self.graphql_schema,
+            timeout=settings.ROBOT_API_TIMEOUT,
+            max_connections=settings.ROBOT_API_MAX_CONNECTIONS,
+        )
+        self.client = self.session.client
+        self.circuit_breakers: CircuitBreakerRegistry = CircuitBreakerRegistry()
+        self.metrics: ApiMetrics = ApiMetrics()
+        # Identical queries in flight at the same time share one request
+        self.requests: RequestCoalescer = RequestCoalescer(submit=self._submit)
+        self.schema: DSLSchema = schema_cache.get_dsl_schema()
+        self.token_manager.add_listener(self._update_auth_header)
+
+        # Only connects once a consumer starts it
+        self.subscriptions: SubscriptionManager = SubscriptionManager(
+            session=self.session,
+            token_manager=self.token_manager,
+            schema=self.graphql_schema,
+        )
+
+    def close(self) -> None:
+        """
+        Closes the connection to the API, and then the cassette being recorded, so
+        that every completed request is in the recording.
+        """
+        self.session.close()
+        if self.cassette_recorder is not None:
+            self.cassette_recorder.close()
 
-        schema: GraphQLSchema = build_ast_schema(self.document)
+    def _submit(
+        self, document: DocumentNode, variable_values: Dict[str, Any]
+    ) -> Future:
+        operation_name: str = self._get_operation_name(document)
+        circuit: Optional[CircuitBreaker] = self.circuit_breakers.get_for_document(
+            document
+        )
+        if circuit is not None:
+            try:
+                circuit.before_request()
+            except CircuitOpenException as e:
+                self.metrics.record_rejected(operation_name, e)
+                # Raised by '_get_response' like the errors of requests that were sent
+                rejected: Future = Future()
+                rejected.set_exception(e)
+                return rejected
 
-        transport: HTTPXTransport = HTTPXTransport(
-            url=settings.ROBOT_API_URL, headers=auth_header, timeout=30
+        # Counted here, as the event loop is shared by all requests
+        request_bytes: int = self._get_request_bytes(document, variable_values)
+        return self.session.submit_coroutine(
+            self._execute(
+                document,
+                variable_values,
+                operation_name,
+                request_bytes,
+                circuit,
+                # The request runs on the event loop, in a span of the calling thread
+                tracer.get_context(),
+            )
         )
-        self.client: Client = Client(transport=transport, schema=schema)  # type: ignore
-        self.schema: DSLSchema = DSLSchema(self.client.schema)
-        self.session = self.client.connect_sync()
+
+    async def _execute(
+        self,
+        document: DocumentNode,
+        variable_values: Dict[str, Any],
+        operation_name: str,
+        request_bytes: int,
+        circuit: Optional[CircuitBreaker],
+        trace_context: Optional[Any],
+    ) -> Dict[str, Any]:
+        # Recorded before the response is handed to the caller
+        started_at: float = perf_counter()
+        response: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+        try:
+            with tracer.span(
+                operation_name,
+                attributes={
+                    "graphql.operation.name": operation_name,
+                    "request_bytes": request_bytes,
+                },
+                parent=trace_context,
+            ):
+                if self.cassette_player is not None:
+                    response = await self.cassette_player.play(
+                        operation_name, variable_values
+                    )
+                else:
+                    response = await self.session.execute_async(
+                        document, variable_values
+                    )
+                return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            latency: float = perf_counter() - started_at
+            self.metrics.record_request(
+                operation_name,
+                latency=latency,
+                request_bytes=request_bytes,
+                error=error,
+            )
+            if circuit is not None:
+                circuit.record(error)
+            if self.cassette_recorder is not None and not isinstance(
+                error, CancelledError
+            ):
+                self.cassette_recorder.record(
+                    operation_name,
+                    variable_values,
+                    latency,
+                    response=response,
+                    error=error,
+                )
+
+    def _get_operation_name(self, document: DocumentNode) -> str:
+        operation_name: Optional[str] = operation_registry.get_operation_name(document)
+        return operation_name if operation_name is not None else "unregistered"
+
+    def _get_request_bytes(
+        self, document: DocumentNode, variable_values: Dict[str, Any]
+    ) -> int:
+        # Approximate, documents outside the registry are not printed to count them
+        query_string: Optional[str] = operation_registry.get_query_string(document)
+        return len(query_string or "") + len(json.dumps(variable_values, default=str))
 
     def query(
         self, query: DocumentNode, query_parameters: dict[str, Any]
@@ -74,10 +231,62 @@ class GraphqlClient:
 
         :raises GrahpQLError: Something went related to the query
         :raises TransportError: Something went wrong during transfer or on the API server side
+        :raises CircuitOpenException: The API has failed the operation repeatedly and is not sent it
         :raises Exception: Unknown error
         """
+        return self._query(query, query_parameters, reauthenticated=False)
+
+    def _query(
+        self,
+        query: DocumentNode,
+        query_parameters: dict[str, Any],
+        reauthenticated: bool,
+    ) -> Dict[str, Any]:
+        token: str = self.token_manager.token
+        return self._get_response(
+            self.requests.submit(query, query_parameters),
+            query,
+            query_parameters,
+            token,
+            reauthenticated,
+        )
+
+    def query_concurrently(
+        self, queries: Sequence[Tuple[DocumentNode, dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sends independent GraphQL queries at the same time over the connection pool.
+
+        :return: One response dictionary per query, in the order the queries were given.
+
+        :raises: The same exceptions as 'query', for the first query that failed
+        """
+        token: str = self.token_manager.token
+        futures: List[Future] = [
+            self.requests.submit(query, query_parameters)
+            for query, query_parameters in queries
+        ]
+        return [
+            self._get_response(
+                future, query, query_parameters, token, reauthenticated=False
+            )
+            for future, (query, query_parameters) in zip(futures, queries)
+        ]
+
+    def _get_response(
+        self,
+        future: Future,
+        query: DocumentNode,
+        query_parameters: dict[str, Any],
+        token: str,
+        reauthenticated: bool,
+    ) -> Dict[str, Any]:
+        """
+        :param token: The access token the request was sent with
+        :param reauthenticated: Whether the request is already a retry with a new token
+        """
         try:
-            response: Dict[str, Any] = self.session.execute(query, query_parameters)
+            response: Dict[str, Any] = future.result()
             return response
         except GraphQLError as e:
             self.logger.error(
@@ -85,16 +294,16 @@ class GraphqlClient:
             )
             raise
         except TransportProtocolError as e:
-            if self._reauthenticated:
+            if reauthenticated:
                 self.logger.error(
                     "Transport protocol error - Error in configuration of GraphQL client even after reauthentication"
                 )
                 raise
             else:
                 # The token might have expired, try again with a new token
-                self._refresh_session()
-                self._reauthenticated = True
-                return self.query(query=query, query_parameters=query_parameters)
+                self._refresh_session(rejected_token=token)
+                self.metrics.record_reauthentication(self._get_operation_name(query))
+                return self._query(query, query_parameters, reauthenticated=True)
         except TransportQueryError as e:
             self.logger.error(
                 f"The Energy Robotics server returned an error: {e.errors}"
@@ -105,15 +314,17 @@ class GraphqlClient:
             raise
         except TransportServerError as e:
             if e.code == 302 or e.code == 401:
-                if self._reauthenticated:
+                if reauthenticated:
                     self.logger.error(
                         "Transport server error - Error in Energy Robotics server even after reauthentication"
                     )
                     raise
                 else:
-                    self._refresh_session()
-                    self._reauthenticated = True
-                    return self.query(query=query, query_parameters=query_parameters)
+                    self._refresh_session(rejected_token=token)
+                    self.metrics.record_reauthentication(
+                        self._get_operation_name(query)
+                    )
+                    return self._query(query, query_parameters, reauthenticated=True)
             else:
                 self.logger.error(f"Error in Energy Robotics server: {e}")
                 raise
@@ -124,8 +335,10 @@ class GraphqlClient:
             raise TimeoutError(f"Request to GraphQL API timed out: {e}")
         except ConnectTimeout as e:
             raise TimeoutError(f"Connection to GraphQL API timed out: {e}")
+        except CircuitOpenException as e:
+            # The request was not sent, as the API is known to be unavailable
+            self.logger.warning(f"Request not sent: {e}")
+            raise
         except Exception as e:
             self.logger.error(f"Unknown error in GraphQL client: {e}")
             raise
-        finally:
-            self._reauthenticated = False
@@ -0,0 +1,910 @@
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from gql.dsl import (
+    DSLExecutable,
+    DSLMutation,
+    DSLQuery,
+    DSLSchema,
+    DSLSubscription,
+    DSLVariableDefinitions,
+    dsl_gql,
+)
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    GraphQLSchema,
+    NameNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    VariableDefinitionNode,
+    VariableNode,
+    Visitor,
+    print_ast,
+    validate,
+    visit,
+)
+
+from isar_exr.api.models.enums import AwakeStatus
+from isar_exr.api.schema_cache import schema_cache
+
+OperationBuilder = Callable[[DSLSchema], DSLExecutable]
+
+_operation_builders: Dict[str, OperationBuilder] = {}
+
+
+def operation(name: str) -> Callable[[OperationBuilder], OperationBuilder]:
+    """
+    Registers a function that builds the GraphQL operation with the given name.
+    """
+
+    def register(builder: OperationBuilder) -> OperationBuilder:
+        _operation_builders[name] = builder
+        return builder
+
+    return register
+
+
+class OperationRegistry:
+    """
+    Holds the GraphQL documents sent by the EnergyRoboticsApi.
+
+    Each document is built from the DSL, validated against the schema and printed
+    once, on first use, and then reused for every call. Documents from the registry
+    are trusted, so the GraphQL client skips validating them again on every request
+    and sends the query string that was printed when the document was built.
+    """
+
+    def __init__(
+        self, get_schema: Callable[[], DSLSchema] = schema_cache.get_dsl_schema
+    ) -> None:
+        self._get_schema: Callable[[], DSLSchema] = get_schema
+        self._lock: RLock = RLock()
+        self._documents: Dict[str, DocumentNode] = {}
+        # Keyed by document id, the documents are kept alive by '_documents'
+        self._query_strings: Dict[int, str] = {}
+
+    def get(self, name: str) -> DocumentNode:
+        document: Optional[DocumentNode] = self._documents.get(name)
+        if document is None:
+            document = self._build(name)
+        return document
+
+    def get_batch(self, names: Sequence[str]) -> DocumentNode:
+        """
+        Returns one document with the root fields of all the given operations, each
+        aliased by the name of its operation. Variables with the same name are
+        shared between the operations. Mutations in a batch are executed by the
+        server in the given order.
+        """
+        batch_name: str = "_".join(["Batch", *names])
+        return self._get_or_build_batch(
+            batch_name,
+            lambda: [(name, self._operation_definition(name)) for name in names],
+        )
+
+    def get_repeated_batch(self, name: str, count: int) -> DocumentNode:
+        """
+        Returns one document with the root field of the operation repeated 'count'
+        times, e.g. to create many objects in a single request. The fields are
+        aliased '<name>_<i>' and every variable gets the suffix '_<i>', see
+        'get_repeated_variables'.
+        """
+        batch_name: str = f"Batch_{name}_x{count}"
+        return self._get_or_build_batch(
+            batch_name,
+            lambda: [
+                (f"{name}_{i}", _rename_variables(self._operation_definition(name), i))
+                for i in range(count)
+            ],
+        )
+
+    def get_repeated_variables(
+        self, variables: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            f"{key}_{i}": value
+            for i, operation_variables in enumerate(variables)
+            for key, value in operation_variables.items()
+        }
+
+    def split_repeated_response(
+        self, name: str, count: int, response: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        Splits the response to a repeated batch into the responses of each repetition,
+        in order.
+        """
+        field_name: str = self._root_field(name).name.value
+        return [{field_name: response[f"{name}_{i}"]} for i in range(count)]
+
+    def split_batch_response(
+        self, names: Sequence[str], response: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Splits the response to a batch into the responses of each operation, shaped
+        as if the operation had been sent on its own.
+        """
+        return {
+            name: {self._root_field(name).name.value: response[name]} for name in names
+        }
+
+    def register(self, name: str, executable: DSLExecutable) -> DocumentNode:
+        """
+        Adds a document built elsewhere to the registry. Registering the same name
+        twice returns the first document.
+        """
+        with self._lock:
+            if name not in self._documents:
+                executable.name = name
+                self._add_document(name, dsl_gql(executable))
+            return self._documents[name]
+
+    def is_trusted(self, document: DocumentNode) -> bool:
+        return id(document) in self._query_strings
+
+    def get_query_string(self, document: DocumentNode) -> Optional[str]:
+        return self._query_strings.get(id(document))
+
+    def get_operation_name(self, document: DocumentNode) -> Optional[str]:
+        """
+        :return: The name the document was registered under, None for documents that
+            are not from the registry
+        """
+        if not self.is_trusted(document):
+            return None
+        return document.definitions[0].name.value
+
+    def _build(self, name: str) -> DocumentNode:
+        with self._lock:
+            if name not in self._documents:
+                executable: DSLExecutable = _operation_builders[name](
+                    self._get_schema()
+                )
+                executable.name = name
+                self._add_document(name, dsl_gql(executable))
+            return self._documents[name]
+
+    def _get_or_build_batch(
+        self,
+        batch_name: str,
+        get_definitions: Callable[[], List[Tuple[str, OperationDefinitionNode]]],
+    ) -> DocumentNode:
+        document: Optional[DocumentNode] = self._documents.get(batch_name)
+        if document is None:
+            with self._lock:
+                if batch_name not in self._documents:
+                    self._add_document(
+                        batch_name, self._build_batch(batch_name, get_definitions())
+                    )
+                document = self._documents[batch_name]
+        return document
+
+    def _build_batch(
+        self, batch_name: str, definitions: List[Tuple[str, OperationDefinitionNode]]
+    ) -> DocumentNode:
+        variable_definitions: Dict[str, VariableDefinitionNode] = {}
+        selections: List[FieldNode] = []
+        for alias, definition in definitions:
+            for variable_definition in definition.variable_definitions:
+                variable_definitions.setdefault(
+                    variable_definition.variable.name.value, variable_definition
+                )
+            field: FieldNode = definition.selection_set.selections[0]
+            selections.append(
+                FieldNode(
+                    alias=NameNode(value=alias),
+                    name=field.name,
+                    arguments=field.arguments,
+                    directives=field.directives,
+                    selection_set=field.selection_set,
+                )
+            )
+
+        return DocumentNode(
+            definitions=[
+                OperationDefinitionNode(
+                    operation=definitions[0][1].operation,
+                    name=NameNode(value=batch_name),
+                    variable_definitions=list(variable_definitions.values()),
+                    directives=[],
+                    selection_set=SelectionSetNode(selections=selections),
+                )
+            ]
+        )
+
+    def _operation_definition(self, name: str) -> OperationDefinitionNode:
+        return self.get(name).definitions[0]
+
+    def _root_field(self, name: str) -> FieldNode:
+        return self._operation_definition(name).selection_set.selections[0]
+
+    def _add_document(self, name: str, document: DocumentNode) -> None:
+        graphql_schema: GraphQLSchema = self._get_schema()._schema
+        validation_errors = validate(graphql_schema, document)
+        if validation_errors:
+            raise validation_errors[0]
+
+        self._query_strings[id(document)] = print_ast(document)
+        self._documents[name] = document
+
+
+class _VariableRenamer(Visitor):
+    def __init__(self, suffix: str) -> None:
+        super().__init__()
+        self.suffix: str = suffix
+
+    def enter_variable(self, node: VariableNode, *args: Any) -> VariableNode:
+        return VariableNode(name=NameNode(value=node.name.value + self.suffix))
+
+
+def _rename_variables(
+    definition: OperationDefinitionNode, index: int
+) -> OperationDefinitionNode:
+    return visit(definition, _VariableRenamer(suffix=f"_{index}"))
+
+
+operation_registry: OperationRegistry = OperationRegistry()
+
+
+@operation("CurrentMissionExecutionStatus")
+def _current_mission_execution_status(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    current_mission_execution_query: DSLQuery = DSLQuery(
+        schema.Query.currentMissionExecution.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(schema.MissionExecutionType.status)
+    )
+
+    current_mission_execution_query.variable_definitions = variable_definitions_graphql
+    return current_mission_execution_query
+
+
+@operation("CurrentMissionExecutionStatusAndTask")
+def _current_mission_execution_status_and_task(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    current_mission_execution_query: DSLQuery = DSLQuery(
+        schema.Query.currentMissionExecution.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.MissionExecutionType.status,
+            schema.MissionExecutionType.currentExecutedTaskId,
+        )
+    )
+
+    current_mission_execution_query.variable_definitions = variable_definitions_graphql
+    return current_mission_execution_query
+
+
+@operation("IsMissionRunning")
+def _is_mission_running(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    is_mission_running_query: DSLQuery = DSLQuery(
+        schema.Query.isMissionRunning.args(robotID=variable_definitions_graphql.robotID)
+    )
+
+    is_mission_running_query.variable_definitions = variable_definitions_graphql
+    return is_mission_running_query
+
+
+@operation("PauseMissionExecution")
+def _pause_mission_execution(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    pause_current_mission_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.pauseMissionExecution.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.MissionExecutionType.id,
+            schema.MissionExecutionType.status,
+            schema.MissionExecutionType.failures,
+        )
+    )
+
+    pause_current_mission_mutation.variable_definitions = variable_definitions_graphql
+    return pause_current_mission_mutation
+
+
+@operation("PointOfInterestByCustomerTag")
+def _point_of_interest_by_customer_tag(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    point_of_interest_query: DSLQuery = DSLQuery(
+        schema.Query.pointOfInterestByCustomerTag.args(
+            customerTag=variable_definitions_graphql.customerTag,
+            siteId=variable_definitions_graphql.siteId,
+        ).select(schema.PointOfInterestType.id)
+    )
+
+    point_of_interest_query.variable_definitions = variable_definitions_graphql
+    return point_of_interest_query
+
+
+@operation("AddPointOfInterest")
+def _add_point_of_interest(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_point_of_interest_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.addPointOfInterest.args(
+            input=variable_definitions_graphql.AddPointOfInterestInput
+        ).select(schema.PointOfInterestType.id)
+    )
+
+    create_point_of_interest_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return create_point_of_interest_mutation
+
+
+@operation("UpsertPointOfInterest")
+def _upsert_point_of_interest(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    upsert_point_of_interest_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.upsertPointOfInterest.args(
+            input=variable_definitions_graphql.UpsertPointOfInterestInput
+        ).select(schema.PointOfInterestType.id)
+    )
+
+    upsert_point_of_interest_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return upsert_point_of_interest_mutation
+
+
+@operation("CreateDockRobotTaskDefinition")
+def _create_dock_robot_task_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_dock_robot_task_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.createDockRobotTaskDefinition.args(
+            input={
+                "siteId": variable_definitions_graphql.siteId,
+                "name": variable_definitions_graphql.name,
+                "dockingStationId": variable_definitions_graphql.dockingStationId,
+            }
+        ).select(schema.DockRobotTaskDefinitionType.id)
+    )
+
+    create_dock_robot_task_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return create_dock_robot_task_definition_mutation
+
+
+@operation("CreatePoiInspectionTaskDefinition")
+def _create_poi_inspection_task_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_poi_inspection_task_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.createPoiInspectionTaskDefinition.args(
+            input={
+                "siteId": variable_definitions_graphql.siteId,
+                "name": variable_definitions_graphql.name,
+                "poiId": variable_definitions_graphql.poiId,
+            }
+        ).select(schema.PoiInspectionTaskDefinitionType.id)
+    )
+
+    create_poi_inspection_task_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return create_poi_inspection_task_definition_mutation
+
+
+@operation("CreateWaypointTaskDefinition")
+def _create_waypoint_task_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_waypoint_task_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.createWaypointTaskDefinition.args(
+            input={
+                "siteId": variable_definitions_graphql.siteId,
+                "name": variable_definitions_graphql.name,
+                "waypoint": variable_definitions_graphql.waypoint,
+            }
+        ).select(schema.WaypointTaskDefinitionType.id)
+    )
+
+    create_waypoint_task_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return create_waypoint_task_definition_mutation
+
+
+@operation("AddTaskToMissionDefinition")
+def _add_task_to_mission_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    add_task_to_mission_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.addTaskToMissionDefinition.args(
+            missionTaskDefinitionId=variable_definitions_graphql.missionTaskDefinitionId,
+            missionDefinitionId=variable_definitions_graphql.missionDefinitionId,
+        ).select(schema.MissionDefinitionType.id)
+    )
+
+    add_task_to_mission_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return add_task_to_mission_definition_mutation
+
+
+@operation("AddTaskToMissionDefinitionAtIndex")
+def _add_task_to_mission_definition_at_index(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    add_task_to_mission_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.addTaskToMissionDefinition.args(
+            missionTaskDefinitionId=variable_definitions_graphql.missionTaskDefinitionId,
+            missionDefinitionId=variable_definitions_graphql.missionDefinitionId,
+            index=variable_definitions_graphql.index,
+        ).select(schema.MissionDefinitionType.id)
+    )
+
+    add_task_to_mission_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return add_task_to_mission_definition_mutation
+
+
+@operation("RemoveTaskFromMissionDefinition")
+def _remove_task_from_mission_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    remove_task_from_mission_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.removeTaskFromMissionDefinition.args(
+            missionTaskDefinitionId=variable_definitions_graphql.missionTaskDefinitionId,
+            missionDefinitionId=variable_definitions_graphql.missionDefinitionId,
+        ).select(schema.MissionDefinitionType.id)
+    )
+
+    remove_task_from_mission_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return remove_task_from_mission_definition_mutation
+
+
+@operation("ExecuteAwakeCommand")
+def _execute_awake_command(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    wake_up_robot_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.executeAwakeCommand.args(
+            targetState=AwakeStatus.Awake,
+            robotID=variable_definitions_graphql.robotID,
+        ).select(
+            schema.RobotCommandExecutionType.id,
+        )
+    )
+
+    wake_up_robot_mutation.variable_definitions = variable_definitions_graphql
+    return wake_up_robot_mutation
+
+
+@operation("RobotAwakeStatus")
+def _robot_awake_status(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    check_if_awake_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.RobotStatusType.isConnected,
+            schema.RobotStatusType.awakeStatus,
+        )
+    )
+
+    check_if_awake_query.variable_definitions = variable_definitions_graphql
+    return check_if_awake_query
+
+
+@operation("RobotBatteryLevel")
+def _robot_battery_level(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    check_battery_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.RobotStatusType.isConnected,
+            schema.RobotStatusType.batteryStatus.select(
+                schema.BatteryStatusType.percentage
+            ),
+        )
+    )
+
+    check_battery_query.variable_definitions = variable_definitions_graphql
+    return check_battery_query
+
+
+@operation("RobotIsConnected")
+def _robot_is_connected(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    check_is_connected_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.RobotStatusType.isConnected,
+        )
+    )
+
+    check_is_connected_query.variable_definitions = variable_definitions_graphql
+    return check_is_connected_query
+
+
+@operation("RobotStatus")
+def _robot_status(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    # Selects the same fields as the OnRobotStatus subscription
+    robot_status_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.RobotStatusType.timestamp,
+            schema.RobotStatusType.isConnected,
+            schema.RobotStatusType.awakeStatus,
+            schema.RobotStatusType.batteryStatus.select(
+                schema.BatteryStatusType.percentage
+            ),
+        )
+    )
+
+    robot_status_query.variable_definitions = variable_definitions_graphql
+    return robot_status_query
+
+
+@operation("RobotStatuses")
+def _robot_statuses(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    # Selects the same status fields as RobotStatus, for several robots at once
+    robot_statuses_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatuses.args(
+            robotIDs=variable_definitions_graphql.robotIDs
+        ).select(
+            schema.StatusPerRobotType.robotID,
+            schema.StatusPerRobotType.status.select(
+                schema.RobotStatusType.timestamp,
+                schema.RobotStatusType.isConnected,
+                schema.RobotStatusType.awakeStatus,
+                schema.RobotStatusType.batteryStatus.select(
+                    schema.BatteryStatusType.percentage
+                ),
+            ),
+        )
+    )
+
+    robot_statuses_query.variable_definitions = variable_definitions_graphql
+    return robot_statuses_query
+
+
+@operation("RobotStatusesPerSite")
+def _robot_statuses_per_site(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    # Selects the same status fields as RobotStatus, for all robots of a site
+    robot_statuses_per_site_query: DSLQuery = DSLQuery(
+        schema.Query.currentRobotStatusesPerSite.args(
+            siteID=variable_definitions_graphql.siteID
+        ).select(
+            schema.StatusPerRobotType.robotID,
+            schema.StatusPerRobotType.status.select(
+                schema.RobotStatusType.timestamp,
+                schema.RobotStatusType.isConnected,
+                schema.RobotStatusType.awakeStatus,
+                schema.RobotStatusType.batteryStatus.select(
+                    schema.BatteryStatusType.percentage
+                ),
+            ),
+        )
+    )
+
+    robot_statuses_per_site_query.variable_definitions = variable_definitions_graphql
+    return robot_statuses_per_site_query
+
+
+@operation("CreateMissionDefinition")
+def _create_mission_definition(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_mission_definition_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.createMissionDefinition.args(
+            input={
+                "siteId": variable_definitions_graphql.siteId,
+                "name": variable_definitions_graphql.name,
+                "requiredRobotConfig": variable_definitions_graphql.requiredRobotConfig,
+            }
+        ).select(schema.MissionDefinitionType.id)
+    )
+
+    create_mission_definition_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return create_mission_definition_mutation
+
+
+@operation("StartMissionExecution")
+def _start_mission_execution(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    start_mission_execution_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.startMissionExecution.args(
+            input={
+                "robotID": variable_definitions_graphql.robotID,
+                "missionDefinitionID": variable_definitions_graphql.missionDefinitionID,
+            }
+        ).select(schema.MissionExecutionType.id)
+    )
+
+    start_mission_execution_mutation.variable_definitions = variable_definitions_graphql
+    return start_mission_execution_mutation
+
+
+@operation("DiscardSiteStage")
+def _discard_site_stage(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    discard_stage_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.discardSiteStage.args(
+            siteStageId=variable_definitions_graphql.siteStageId,
+        ).select(schema.SiteStageType.id)
+    )
+
+    discard_stage_mutation.variable_definitions = variable_definitions_graphql
+    return discard_stage_mutation
+
+
+@operation("OpenSiteStage")
+def _open_site_stage(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    create_stage_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.openSiteStage.args(
+            siteId=variable_definitions_graphql.siteId,
+        ).select(schema.SiteStageType.id)
+    )
+
+    create_stage_mutation.variable_definitions = variable_definitions_graphql
+    return create_stage_mutation
+
+
+@operation("AddPointOfInterestToStage")
+def _add_point_of_interest_to_stage(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    add_point_of_interest_to_stage_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.addPointOfInterestToStage.args(
+            siteStageId=variable_definitions_graphql.siteStageId,
+            pointOfInterestId=variable_definitions_graphql.pointOfInterestId,
+        ).select(schema.SiteStageType.id)
+    )
+
+    add_point_of_interest_to_stage_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return add_point_of_interest_to_stage_mutation
+
+
+@operation("CommitSiteChanges")
+def _commit_site_changes(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    commit_site_to_snapshot_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.commitSiteChanges.args(
+            siteStageId=variable_definitions_graphql.siteStageId,
+        ).select(schema.SiteSnapshotType.id)
+    )
+
+    commit_site_to_snapshot_mutation.variable_definitions = variable_definitions_graphql
+    return commit_site_to_snapshot_mutation
+
+
+@operation("CurrentSiteSnapshotHeadSelectionProcessingPipeline")
+def _current_processing_pipeline(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    current_processing_pipeline: DSLQuery = DSLQuery(
+        schema.Query.currentSiteSnapshotHeadSelectionProcessingPipeline.args(
+            siteId=variable_definitions_graphql.siteId
+        ).select(
+            schema.ProcessingPipelineType.stages.select(
+                schema.ProcessingPipelineStageType.state
+            )
+        )
+    )
+
+    current_processing_pipeline.variable_definitions = variable_definitions_graphql
+    return current_processing_pipeline
+
+
+@operation("ProcessSiteSnapshotHeadSelection")
+def _process_site_snapshot_head_selection(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    set_snapshot_as_head_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.processSiteSnapshotHeadSelection.args(
+            siteId=variable_definitions_graphql.siteId,
+            siteSnapshotId=variable_definitions_graphql.siteSnapshotId,
+        ).select(schema.ProcessingPipelineType.id)
+    )
+
+    set_snapshot_as_head_mutation.variable_definitions = variable_definitions_graphql
+    return set_snapshot_as_head_mutation
+
+
+@operation("CurrentSiteStage")
+def _current_site_stage(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    current_site_stage_query: DSLQuery = DSLQuery(
+        schema.Query.currentSiteStage.args(
+            siteId=variable_definitions_graphql.siteId
+        ).select(schema.SiteStageType.id)
+    )
+
+    current_site_stage_query.variable_definitions = variable_definitions_graphql
+    return current_site_stage_query
+
+
+@operation("OnRobotStatus")
+def _on_robot_status(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    robot_status_subscription: DSLSubscription = DSLSubscription(
+        schema.Subscription.onRobotStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.RobotStatusType.timestamp,
+            schema.RobotStatusType.isConnected,
+            schema.RobotStatusType.awakeStatus,
+            schema.RobotStatusType.batteryStatus.select(
+                schema.BatteryStatusType.percentage
+            ),
+        )
+    )
+
+    robot_status_subscription.variable_definitions = variable_definitions_graphql
+    return robot_status_subscription
+
+
+@operation("OnRobotStatuses")
+def _on_robot_statuses(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    robot_statuses_subscription: DSLSubscription = DSLSubscription(
+        schema.Subscription.onRobotStatuses.args(
+            robotIDs=variable_definitions_graphql.robotIDs
+        ).select(
+            schema.StatusPerRobotType.robotID,
+            schema.StatusPerRobotType.status.select(
+                schema.RobotStatusType.timestamp,
+                schema.RobotStatusType.isConnected,
+                schema.RobotStatusType.awakeStatus,
+                schema.RobotStatusType.batteryStatus.select(
+                    schema.BatteryStatusType.percentage
+                ),
+            ),
+        )
+    )
+
+    robot_statuses_subscription.variable_definitions = variable_definitions_graphql
+    return robot_statuses_subscription
+
+
+@operation("OnMissionExecutionStatus")
+def _on_mission_execution_status(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    mission_execution_status_subscription: DSLSubscription = DSLSubscription(
+        schema.Subscription.onMissionExecutionStatus.args(
+            robotID=variable_definitions_graphql.robotID
+        ).select(
+            schema.MissionExecutionStatusType.timestamp,
+            schema.MissionExecutionStatusType.missionExecution.select(
+                schema.MissionExecutionType.status,
+                schema.MissionExecutionType.currentExecutedTaskId,
+            ),
+        )
+    )
+
+    mission_execution_status_subscription.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return mission_execution_status_subscription
+
+
+@operation("OnSiteSnapshotHeadSelectionProcessingPipeline")
+def _on_processing_pipeline(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    processing_pipeline_subscription: DSLSubscription = DSLSubscription(
+        schema.Subscription.onSiteSnapshotHeadSelectionProcessingPipeline.args(
+            siteId=variable_definitions_graphql.siteId
+        ).select(
+            schema.ProcessingPipelineStatusType.timestamp,
+            schema.ProcessingPipelineStatusType.pipeline.select(
+                schema.ProcessingPipelineType.stages.select(
+                    schema.ProcessingPipelineStageType.state
+                )
+            ),
+        )
+    )
+
+    processing_pipeline_subscription.variable_definitions = variable_definitions_graphql
+    return processing_pipeline_subscription
+
+
+@operation("AddPointsOfInterestToStage")
+def _add_points_of_interest_to_stage(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    add_points_of_interest_to_stage_mutation: DSLMutation = DSLMutation(
+        schema.Mutation.addPointsOfInterestToStage.args(
+            siteStageId=variable_definitions_graphql.siteStageId,
+            input={"ids": variable_definitions_graphql.pointOfInterestIds},
+        ).select(schema.SiteStageType.id)
+    )
+
+    add_points_of_interest_to_stage_mutation.variable_definitions = (
+        variable_definitions_graphql
+    )
+    return add_points_of_interest_to_stage_mutation
+
+
+@operation("PointsOfInterestBySite")
+def _points_of_interest_by_site(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    points_of_interest_query: DSLQuery = DSLQuery(
+        schema.Query.pointOfInterestBySite.args(
+            siteId=variable_definitions_graphql.siteId
+        ).select(
+            schema.PointOfInterestType.id,
+            schema.PointOfInterestType.customerTag,
+        )
+    )
+
+    points_of_interest_query.variable_definitions = variable_definitions_graphql
+    return points_of_interest_query
+
+
+@operation("OnPointOfInterest")
+def _on_point_of_interest(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    point_of_interest_subscription: DSLSubscription = DSLSubscription(
+        schema.Subscription.onPointOfInterest.args(
+            siteId=variable_definitions_graphql.siteId
+        ).select(
+            schema.PointOfInterestSubscriptionType.operation,
+            schema.PointOfInterestSubscriptionType.pointOfInterest.select(
+                schema.PointOfInterestType.id,
+                schema.PointOfInterestType.customerTag,
+            ),
+        )
+    )
+
+    point_of_interest_subscription.variable_definitions = variable_definitions_graphql
+    return point_of_interest_subscription
+
+
+@operation("MissionDefinitionTasks")
+def _mission_definition_tasks(schema: DSLSchema) -> DSLExecutable:
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+
+    mission_definition_query: DSLQuery = DSLQuery(
+        schema.Query.missionDefinition.args(id=variable_definitions_graphql.id).select(
+            schema.MissionDefinitionType.id,
+            schema.MissionDefinitionType.tasks.select(
+                schema.AbstractMissionTaskDefinitionType.id
+            ),
+        )
+    )
+
+    mission_definition_query.variable_definitions = variable_definitions_graphql
+    return mission_definition_query
@@ -0,0 +1,89 @@
+import json
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from graphql import DocumentNode, OperationDefinitionNode, OperationType
+
+from isar_exr.api.operations import OperationRegistry, operation_registry
+from isar_exr.config.settings import settings
+
+# Document id and the variables serialized with sorted keys
+RequestKey = Tuple[int, str]
+
+
+class RequestCoalescer:
+    """
+    Lets concurrent callers that send the same query with the same variables share
+    one request, e.g. the state machine and the telemetry publishers asking for the
+    robot status at the same moment. All of them receive the result of the request
+    that is already in flight.
+
+    Results of the operations in 'cache_ttls' are also reused for the given number
+    of seconds after they were received. Only queries from the operation registry
+    are coalesced, as mutations must always be executed and other documents have no
+    stable identity. Results are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        submit: Callable[[DocumentNode, Dict[str, Any]], Future],
+        operations: OperationRegistry = operation_registry,
+        cache_ttls: Dict[str, float] = settings.ROBOT_API_QUERY_CACHE_TTLS,
+    ) -> None:
+        self._submit: Callable[[DocumentNode, Dict[str, Any]], Future] = submit
+        self._operations: OperationRegistry = operations
+        self._cache_ttls: Dict[str, float] = cache_ttls
+        self._lock: Lock = Lock()
+        self._in_flight: Dict[RequestKey, Future] = {}
+        # Monotonic time the result expires at, and the result
+        self._results: Dict[RequestKey, Tuple[float, Dict[str, Any]]] = {}
+
+    def submit(self, document: DocumentNode, variables: Dict[str, Any]) -> Future:
+        operation_name: Optional[str] = self._get_query_name(document)
+        if operation_name is None:
+            return self._submit(document, variables)
+
+        key: RequestKey = (
+            id(document),
+            json.dumps(variables, sort_keys=True, default=str),
+        )
+        with self._lock:
+            result: Optional[Tuple[float, Dict[str, Any]]] = self._results.get(key)
+            if result is not None:
+                expires_at, response = result
+                if monotonic() < expires_at:
+                    cached: Future = Future()
+                    cached.set_result(response)
+                    return cached
+                del self._results[key]
+
+            future: Optional[Future] = self._in_flight.get(key)
+            if future is not None and not future.done():
+                return future
+            # A future wakes its waiters before running its done callbacks, so a
+            # caller retrying a failed request may get here before '_on_done' has
+            # removed it
+            future = self._submit(document, variables)
+            self._in_flight[key] = future
+
+        future.add_done_callback(lambda done: self._on_done(key, operation_name, done))
+        return future
+
+    def _on_done(self, key: RequestKey, operation_name: str, future: Future) -> None:
+        ttl: float = self._cache_ttls.get(operation_name, 0)
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if ttl > 0 and not future.cancelled() and future.exception() is None:
+                self._results[key] = (monotonic() + ttl, future.result())
+
+    def _get_query_name(self, document: DocumentNode) -> Optional[str]:
+        operation_name: Optional[str] = self._operations.get_operation_name(document)
+        if operation_name is None:
+            return None
+        definition: OperationDefinitionNode = document.definitions[0]
+        if definition.operation != OperationType.QUERY:
+            return None
+        return operation_name
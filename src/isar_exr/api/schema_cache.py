@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+from logging import Logger, getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from gql.dsl import DSLSchema
+from graphql import (
+    GraphQLSchema,
+    build_ast_schema,
+    build_client_schema,
+    introspection_from_schema,
+    parse,
+    version,
+)
+
+from isar_exr.config.settings import settings
+
+
+class SchemaCache:
+    """
+    Builds the GraphQL schema of the Energy Robotics API once and shares it.
+
+    Parsing the SDL file and running 'build_ast_schema' is slow, so the built schema
+    is serialized as a compact introspection artefact in the cache directory.
+    The artefact is keyed by a hash of the schema file, which means that it is rebuilt
+    automatically whenever the schema file changes. Within the process the schema is
+    loaded lazily on first use and the same GraphQLSchema and DSLSchema instances are
+    handed out to every client, including clients recreated after reauthentication.
+    """
+
+    def __init__(
+        self,
+        schema_path: Path = settings.PATH_TO_GRAPHQL_SCHEMA,
+        cache_directory: Path = settings.PATH_TO_GRAPHQL_SCHEMA_CACHE,
+    ) -> None:
+        self.logger: Logger = getLogger("graphql_client")
+        self.schema_path: Path = schema_path
+        self.cache_directory: Path = cache_directory
+        self._lock: Lock = Lock()
+        self._schema: Optional[GraphQLSchema] = None
+        self._dsl_schema: Optional[DSLSchema] = None
+
+    def get_schema(self) -> GraphQLSchema:
+        with self._lock:
+            if self._schema is None:
+                self._schema = self._load_schema()
+            return self._schema
+
+    def get_dsl_schema(self) -> DSLSchema:
+        schema: GraphQLSchema = self.get_schema()
+        with self._lock:
+            if self._dsl_schema is None:
+                self._dsl_schema = DSLSchema(schema)
+            return self._dsl_schema
+
+    def get_artefact_path(self, schema_source: bytes) -> Path:
+        # The artefact format depends on graphql-core, so its version is part of the key
+        schema_hash: str = hashlib.sha256(
+            schema_source + version.encode("utf-8")
+        ).hexdigest()
+        return self.cache_directory.joinpath(f"schema-{schema_hash[:16]}.json")
+
+    def build_artefact(self) -> Path:
+        """
+        Builds the schema from the SDL file and writes the artefact to the cache
+        directory, replacing any existing artefact for the same schema file and
+        removing the artefacts of other schema files.
+        """
+        schema_source: bytes = self.schema_path.read_bytes()
+        schema: GraphQLSchema = self._build_from_source(schema_source)
+        artefact_path: Path = self.get_artefact_path(schema_source)
+        self._write_artefact(schema, artefact_path)
+        return artefact_path
+
+    def _load_schema(self) -> GraphQLSchema:
+        schema_source: bytes = self.schema_path.read_bytes()
+        artefact_path: Path = self.get_artefact_path(schema_source)
+
+        if artefact_path.is_file():
+            try:
+                introspection: Dict[str, Any] = json.loads(artefact_path.read_bytes())
+                return build_client_schema(introspection, assume_valid=True)
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not load cached GraphQL schema '{artefact_path}', "
+                    f"rebuilding it: {e}"
+                )
+
+        schema: GraphQLSchema = self._build_from_source(schema_source)
+        try:
+            self._write_artefact(schema, artefact_path)
+        except OSError as e:
+            self.logger.warning(
+                f"Could not cache GraphQL schema '{artefact_path}': {e}"
+            )
+        return schema
+
+    def _build_from_source(self, schema_source: bytes) -> GraphQLSchema:
+        # Loading schema from file is recommended,
+        # ref https://github.com/graphql-python/gql/issues/331
+        return build_ast_schema(parse(schema_source.decode("utf-8")))
+
+    def _write_artefact(self, schema: GraphQLSchema, artefact_path: Path) -> None:
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        temporary_path: Path = artefact_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as artefact:
+            json.dump(
+                introspection_from_schema(schema), artefact, separators=(",", ":")
+            )
+        # Atomic on POSIX, so concurrent processes never read a partial artefact
+        os.replace(temporary_path, artefact_path)
+        self._remove_stale_artefacts(artefact_path)
+
+    def _remove_stale_artefacts(self, artefact_path: Path) -> None:
+        # Artefacts of earlier schema files or graphql-core versions are never read
+        # again, so they are removed instead of piling up in the cache directory
+        for stale_path in self.cache_directory.glob("schema-*.json"):
+            if stale_path == artefact_path:
+                continue
+            try:
+                stale_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+schema_cache: SchemaCache = SchemaCache()
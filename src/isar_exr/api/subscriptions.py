@@ -0,0 +1,226 @@
+import asyncio
+from concurrent.futures import Future
+from logging import Logger, getLogger
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from gql.client import AsyncClientSession
+from gql.transport.exceptions import TransportClosed
+from gql.transport.websockets import WebsocketsTransport
+from graphql import DocumentNode, GraphQLSchema
+from pydantic import BaseModel
+
+from isar_exr.api.async_graphql_session import (
+    AsyncGraphqlSession,
+    TrustedDocumentsClient,
+)
+from isar_exr.api.authentication import TokenManager
+from isar_exr.api.operations import OperationRegistry, operation_registry
+from isar_exr.config.settings import settings
+
+
+class Subscription(BaseModel):
+    operation_name: str
+    variables: Dict[str, Any]
+    callback: Callable[[Dict[str, Any]], None]
+
+
+class SubscriptionManager:
+    """
+    Keeps one websocket connection to the Energy Robotics API that carries all
+    GraphQL subscriptions.
+
+    The connection runs on the event loop of the GraphQL session. When it drops, it
+    is re-established with an exponential backoff and every registered subscription
+    is subscribed to again. Connection listeners are told when the connection goes
+    up or down, so that consumers can stop trusting pushed values while it is down.
+    Callbacks are called on the event loop and must not block.
+    """
+
+    # Seconds to wait before reconnecting, doubled after each failed attempt
+    reconnect_delay: float = 1
+    max_reconnect_delay: float = 30
+
+    def __init__(
+        self,
+        session: AsyncGraphqlSession,
+        token_manager: TokenManager,
+        schema: GraphQLSchema,
+        url: str = settings.ROBOT_API_WEBSOCKET_URL,
+        operations: OperationRegistry = operation_registry,
+    ) -> None:
+        self.logger: Logger = getLogger("graphql_client")
+        self.url: str = url
+        self._session: AsyncGraphqlSession = session
+        self._token_manager: TokenManager = token_manager
+        self._schema: GraphQLSchema = schema
+        self._operations: OperationRegistry = operations
+        self._subscriptions: List[Subscription] = []
+        self._connection_listeners: List[Callable[[bool], None]] = []
+        self._connection: Optional[AsyncClientSession] = None
+        self._connection_lost: Optional[asyncio.Event] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._runner: Optional[Future] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+    def subscribe(
+        self,
+        operation_name: str,
+        variables: Dict[str, Any],
+        callback: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        """
+        Registers a subscription from the operation registry. It is started right
+        away if the connection is up, and again after every reconnect.
+        """
+        subscription: Subscription = Subscription(
+            operation_name=operation_name, variables=variables, callback=callback
+        )
+        self._session.loop.call_soon_threadsafe(self._add_subscription, subscription)
+
+    def wait_for(
+        self,
+        operation_name: str,
+        variables: Dict[str, Any],
+        condition: Callable[[Dict[str, Any]], bool],
+    ) -> Future:
+        """
+        Subscribes on a separate websocket until an update satisfies the condition.
+
+        :return: A future for the first matching update. It fails if the websocket
+            cannot be opened or the subscription ends, and cancelling it closes the
+            websocket.
+        """
+        return self._session.submit_coroutine(
+            self._wait_for(operation_name, variables, condition)
+        )
+
+    def add_connection_listener(self, listener: Callable[[bool], None]) -> None:
+        self._connection_listeners.append(listener)
+
+    def start(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._runner = self._session.submit_coroutine(self._run())
+
+    def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+
+    def _add_subscription(self, subscription: Subscription) -> None:
+        self._subscriptions.append(subscription)
+        if self._connection is not None:
+            self._start_subscription(self._connection, subscription)
+
+    async def _run(self) -> None:
+        delay: float = self.reconnect_delay
+        while True:
+            client: TrustedDocumentsClient = await self._create_client()
+            try:
+                self._connection = await client.connect_async()
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not open the subscription websocket, retrying in "
+                    f"{delay} s: {e}"
+                )
+            else:
+                self.logger.info("Subscription websocket connected")
+                delay = self.reconnect_delay
+                self._connection_lost = asyncio.Event()
+                for subscription in self._subscriptions:
+                    self._start_subscription(self._connection, subscription)
+                self._notify_connection_listeners(connected=True)
+
+                try:
+                    await self._connection_lost.wait()
+                finally:
+                    await self._disconnect(client)
+                self.logger.warning(
+                    f"Subscription websocket disconnected, reconnecting in {delay} s"
+                )
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _wait_for(
+        self,
+        operation_name: str,
+        variables: Dict[str, Any],
+        condition: Callable[[Dict[str, Any]], bool],
+    ) -> Dict[str, Any]:
+        document: DocumentNode = self._operations.get(operation_name)
+        client: TrustedDocumentsClient = await self._create_client()
+        async with client as connection:
+            async for result in connection.subscribe(document, variables):
+                if condition(result):
+                    return result
+        raise TransportClosed(f"{operation_name} was ended by the API")
+
+    async def _create_client(self) -> TrustedDocumentsClient:
+        # The token is read in a worker thread as it might have to be fetched
+        token: str = await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._token_manager.token
+        )
+        authorization: Dict[str, str] = {"authorization": "Bearer " + token}
+        transport: WebsocketsTransport = WebsocketsTransport(
+            url=self.url,
+            headers=authorization,
+            init_payload=authorization,
+            ping_interval=settings.ROBOT_API_WEBSOCKET_PING_INTERVAL,
+        )
+        return TrustedDocumentsClient(
+            operations=self._operations,
+            transport=transport,
+            schema=self._schema,
+            execute_timeout=None,
+        )
+
+    async def _disconnect(self, client: TrustedDocumentsClient) -> None:
+        self._connection = None
+        self._notify_connection_listeners(connected=False)
+        for task in list(self._tasks):
+            task.cancel()
+        try:
+            await client.close_async()
+        except Exception as e:
+            self.logger.debug(f"Could not close the subscription websocket: {e}")
+
+    def _start_subscription(
+        self, connection: AsyncClientSession, subscription: Subscription
+    ) -> None:
+        task: asyncio.Task = asyncio.get_running_loop().create_task(
+            self._consume(connection, subscription)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _consume(
+        self, connection: AsyncClientSession, subscription: Subscription
+    ) -> None:
+        document: DocumentNode = self._operations.get(subscription.operation_name)
+        try:
+            async for result in connection.subscribe(document, subscription.variables):
+                try:
+                    subscription.callback(result)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error handling {subscription.operation_name} update: {e}"
+                    )
+            self.logger.warning(f"{subscription.operation_name} was ended by the API")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"{subscription.operation_name} failed: {e}")
+
+        # Resubscribe everything on a fresh connection
+        if self._connection is connection and self._connection_lost is not None:
+            self._connection_lost.set()
+
+    def _notify_connection_listeners(self, connected: bool) -> None:
+        for listener in self._connection_listeners:
+            try:
+                listener(connected)
+            except Exception as e:
+                self.logger.error(f"Error in subscription connection listener: {e}")
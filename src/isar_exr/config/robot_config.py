@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+from isar_exr.config.settings import settings
+
+
+class RobotConfig(BaseModel):
+    """
+    The Energy Robotics ids a Robot works with. They default to the settings, and are
+    given per robot when several robots are run by one process, see 'Fleet'.
+    """
+
+    robot_id: str = Field(default_factory=lambda: settings.ROBOT_EXR_ID)
+    site_id: str = Field(default_factory=lambda: settings.ROBOT_EXR_SITE_ID)
+    docking_station_id: str = Field(default_factory=lambda: settings.DOCKING_STATION_ID)
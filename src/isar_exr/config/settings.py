@@ -1,5 +1,6 @@
 import importlib.resources as pkg_resources
 from pathlib import Path
+from typing import Dict, List
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -24,12 +25,78 @@ class Settings(BaseSettings):
     # The ID of the relevant site in the EXR database (default=KAA)
     ROBOT_EXR_SITE_ID: str = Field(default="61a0a1f45f71913ebbb4657d")
 
+    # Robots run by one process in fleet mode, each given as its "robot_id", "site_id"
+    # and "docking_station_id", which default to the ids above
+    FLEET_ROBOTS: List[Dict[str, str]] = Field(default=[])
+
+    # Whether a fleet fetches the statuses of all its robots in one request per poll
+    # interval when neither subscriptions nor robot state polling are enabled
+    FLEET_STATUS_AGGREGATION_ENABLED: bool = Field(default=True)
+
     # Map to be used for creation of alitra transformation
     MAP: str = Field(default="exr_klab_sst")
 
     # URL for Ex-Robotics API
     ROBOT_API_URL: str = Field(default="https://developer.energy-robotics.com/graphql/")
 
+    # Seconds before a request to the Energy Robotics API times out
+    ROBOT_API_TIMEOUT: int = Field(default=30)
+
+    # Maximum number of concurrent connections to the Energy Robotics API
+    ROBOT_API_MAX_CONNECTIONS: int = Field(default=10)
+
+    # Maximum number of operations sent in one batched GraphQL document
+    ROBOT_API_MAX_BATCH_SIZE: int = Field(default=25)
+
+    # Seconds the result of a query operation is reused for, by operation name
+    ROBOT_API_QUERY_CACHE_TTLS: Dict[str, float] = Field(default={})
+
+    # Failed requests in a row after which an operation is no longer sent to the API
+    ROBOT_API_CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5)
+
+    # Seconds an operation is first held back for, doubled while the API stays down
+    ROBOT_API_CIRCUIT_INITIAL_BACKOFF: float = Field(default=2)
+    ROBOT_API_CIRCUIT_MAX_BACKOFF: float = Field(default=60)
+
+    # Whether latency and error counts per API operation are published over MQTT
+    ROBOT_API_METRICS_PUBLISHING_ENABLED: bool = Field(default=False)
+
+    # Seconds between publishing the API metrics
+    ROBOT_API_METRICS_PUBLISH_INTERVAL: float = Field(default=60)
+
+    # Whether tracing spans are created, exported by the OpenTelemetry tracer provider
+    TRACING_ENABLED: bool = Field(default=False)
+
+    # Whether requests to the API are recorded to the cassette file, or answered from
+    # it without reaching the API: "off", "record" or "replay"
+    ROBOT_API_CASSETTE_MODE: str = Field(default="off")
+
+    # Cassette file of recorded requests, gzipped if the name ends in .gz
+    ROBOT_API_CASSETTE_PATH: Path = Field(default=Path("graphql_cassette.jsonl.gz"))
+
+    # Factor applied to the recorded latencies when replaying, 0 replays without delay
+    ROBOT_API_CASSETTE_TIME_SCALE: float = Field(default=1)
+
+    # Websocket URL for GraphQL subscriptions to the Energy Robotics API
+    ROBOT_API_WEBSOCKET_URL: str = Field(
+        default="wss://developer.energy-robotics.com/graphql/"
+    )
+
+    # Seconds between keep-alive pings on the subscription websocket
+    ROBOT_API_WEBSOCKET_PING_INTERVAL: int = Field(default=20)
+
+    # Whether robot and mission state is pushed over subscriptions instead of polled
+    ROBOT_API_SUBSCRIPTIONS_ENABLED: bool = Field(default=False)
+
+    # Whether robot and mission state is polled in the background when not pushed
+    ROBOT_STATE_POLLING_ENABLED: bool = Field(default=False)
+
+    # Seconds between polls of the robot and mission state
+    ROBOT_STATE_POLL_INTERVAL: float = Field(default=1)
+
+    # Seconds a polled robot and mission state is used for before it is queried live
+    ROBOT_STATE_MAX_AGE: float = Field(default=5)
+
     # Maximum amount of seconds to wait for the robot to wake up after sent wakeup call
     MAX_TIME_FOR_WAKEUP: int = 120
 
@@ -40,13 +107,41 @@ class Settings(BaseSettings):
         default="https://login.energy-robotics.com/api/loginApi"
     )
 
+    # Seconds before the access token expires that it is refreshed in the background
+    ROBOT_AUTH_REFRESH_MARGIN: int = Field(default=60)
+
     PATH_TO_GRAPHQL_SCHEMA: Path = Path(__file__).parent.joinpath(
         "../api/schema/schema.graphql"
     )
 
+    # Directory for the prebuilt GraphQL schema artefact, keyed by the schema file hash
+    PATH_TO_GRAPHQL_SCHEMA_CACHE: Path = Path(__file__).parent.joinpath(
+        "../api/schema/cache"
+    )
+
+    # Seconds before the POIs of the site are reloaded when not kept current by subscriptions
+    SITE_INDEX_MAX_AGE: int = Field(default=300)
+
+    # Whether mission definitions are reused when the same mission is sent again
+    MISSION_DEFINITION_CACHE_ENABLED: bool = Field(default=True)
+
+    # File with the mission definitions created for earlier missions, by fingerprint.
+    # Relative to the working directory, as the installed package may be read-only
+    # and is replaced with every image, so point it at a persistent volume.
+    PATH_TO_MISSION_DEFINITION_CACHE: Path = Field(
+        default=Path("data/mission_definitions.json")
+    )
+
     # API sleep time
     API_SLEEP_TIME: int = Field(default=1)
 
+    # Maximum amount of seconds to wait for the site processing pipeline after a site change
+    PIPELINE_COMPLETION_TIMEOUT: int = Field(default=300)
+
+    # Seconds before the processing pipeline is polled again, doubled after each poll
+    PIPELINE_POLL_INITIAL_INTERVAL: float = Field(default=0.25)
+    PIPELINE_POLL_MAX_INTERVAL: float = Field(default=4)
+
     model_config = SettingsConfigDict(
         env_prefix="EXR_",
         env_file_encoding="utf-8",
@@ -0,0 +1,76 @@
+from logging import Logger, getLogger
+from typing import Dict, List, Sequence
+
+from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.config.robot_config import RobotConfig
+from isar_exr.config.settings import settings
+from isar_exr.robotinterface import Robot
+from isar_exr.state.fleet_state_poller import FleetStatePoller
+from isar_exr.state.fleet_status_aggregator import FleetStatusAggregator
+from isar_exr.state.mission_definition_cache import MissionDefinitionCache
+from isar_exr.state.robot_state_store import RobotStateStore
+from isar_exr.state.site_index import SiteIndex
+
+
+class Fleet:
+    """
+    Several robots run by one process, each with its own ids.
+
+    The robots share one API client, with one access token, connection pool and
+    schema, one site index per site and one mission definition cache. Their state
+    is kept up to date for all of them at once, over one robot status subscription
+    or by polling the statuses of all robots in one request. Without either, the
+    statuses the robots publish as telemetry are still fetched in one request.
+    """
+
+    def __init__(self, configs: Sequence[RobotConfig]) -> None:
+        self.logger: Logger = getLogger(Fleet.__name__)
+        self.api: EnergyRoboticsApi = EnergyRoboticsApi()
+        self.mission_definition_cache: MissionDefinitionCache = MissionDefinitionCache()
+        self.site_indices: Dict[str, SiteIndex] = {
+            config.site_id: SiteIndex(api=self.api, site_id=config.site_id)
+            for config in configs
+        }
+        self.robots: Dict[str, Robot] = {
+            config.robot_id: Robot(
+                config=config,
+                api=self.api,
+                site_index=self.site_indices[config.site_id],
+                mission_definition_cache=self.mission_definition_cache,
+            )
+            for config in configs
+        }
+        robot_states: Dict[str, RobotStateStore] = {
+            robot_id: robot.robot_state for robot_id, robot in self.robots.items()
+        }
+        self.state_poller: FleetStatePoller = FleetStatePoller(
+            api=self.api, robot_states=robot_states
+        )
+        # Telemetry of every robot is published from the statuses of all robots
+        self.status_aggregator: FleetStatusAggregator = FleetStatusAggregator(
+            api=self.api, robot_states=robot_states, site_ids=list(self.site_indices)
+        )
+        if settings.ROBOT_API_SUBSCRIPTIONS_ENABLED:
+            self.api.subscribe_to_fleet_state(robot_states)
+            for site_index in self.site_indices.values():
+                site_index.subscribe()
+        elif settings.ROBOT_STATE_POLLING_ENABLED:
+            self.state_poller.start()
+        elif settings.FLEET_STATUS_AGGREGATION_ENABLED:
+            self.status_aggregator.start()
+        self.logger.info(
+            f"Running {len(self.robots)} robots on {len(self.site_indices)} sites"
+        )
+
+    @classmethod
+    def from_settings(cls) -> "Fleet":
+        """
+        :return: A fleet of the robots in 'FLEET_ROBOTS'
+        """
+        configs: List[RobotConfig] = [
+            RobotConfig(**robot) for robot in settings.FLEET_ROBOTS
+        ]
+        return cls(configs)
+
+    def get_robot(self, robot_id: str) -> Robot:
+        return self.robots[robot_id]
@@ -0,0 +1,82 @@
+import numpy as np
+from alitra import Frame, Orientation, Pose, Position, Transform
+from scipy.spatial.transform import Rotation
+
+
+class CachedTransform:
+    """
+    One direction of an alitra transform, precomputed as a rotation matrix and a
+    translation vector.
+
+    'Transform.transform_pose' works out the direction on every call, and inverts
+    the rotation when going against the direction of the alignment. Both are done
+    once here instead, which keeps converting all the poses of a mission before it
+    is uploaded cheap. The results are the same as those of the transform.
+    """
+
+    def __init__(self, transform: Transform, from_: Frame, to_: Frame) -> None:
+        self.from_: Frame = from_
+        self.to_: Frame = to_
+
+        origin: Position = transform.transform_position(
+            positions=Position(x=0, y=0, z=0, frame=from_), from_=from_, to_=to_
+        )
+        self._translation: np.ndarray = origin.to_array()
+        # Column i is where the i-th unit vector ends up, without the translation
+        self._rotation_matrix: np.ndarray = np.column_stack(
+            [
+                transform.transform_position(
+                    positions=Position.from_array(unit_vector, from_),
+                    from_=from_,
+                    to_=to_,
+                ).to_array()
+                - self._translation
+                for unit_vector in np.eye(3)
+            ]
+        )
+        self._rotation: Rotation = transform.transform_rotation(
+            rotation=Rotation.identity(), from_=from_, to_=to_
+        )
+
+    def transform_position(self, position: Position) -> Position:
+        if position.frame != self.from_:
+            raise ValueError(
+                f"Expected position in frame {self.from_}, got position in frame "
+                f"{position.frame}"
+            )
+        return Position.from_array(
+            self._rotation_matrix @ position.to_array() + self._translation, self.to_
+        )
+
+    def transform_orientation(self, orientation: Orientation) -> Orientation:
+        if orientation.frame != self.from_:
+            raise ValueError(
+                f"Expected orientation in frame {self.from_}, got orientation in "
+                f"frame {orientation.frame}"
+            )
+        rotation: Rotation = orientation.to_rotation() * self._rotation
+        return Orientation(*rotation.as_quat(), frame=self.to_)
+
+    def transform_pose(self, pose: Pose) -> Pose:
+        return Pose(
+            position=self.transform_position(pose.position),
+            orientation=self.transform_orientation(pose.orientation),
+            frame=self.to_,
+        )
+
+    def transform_position_array(self, positions: np.ndarray) -> np.ndarray:
+        """
+        :param positions: Positions in the 'from_' frame, one [x, y, z] row each
+        :return: The positions in the 'to_' frame, in the same layout
+        """
+        return positions @ self._rotation_matrix.T + self._translation
+
+    def transform_orientation_array(self, orientations: np.ndarray) -> np.ndarray:
+        """
+        :param orientations: Orientations in the 'from_' frame, one [x, y, z, w]
+            quaternion row each
+        :return: The orientations in the 'to_' frame, in the same layout
+        """
+        if len(orientations) == 0:
+            return orientations
+        return (Rotation.from_quat(orientations) * self._rotation).as_quat()
@@ -0,0 +1,100 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from alitra import Frame
+from robot_interface.models.mission.step import DriveToPose, InspectionStep
+from robot_interface.models.mission.task import Task
+
+from isar_exr.models.cached_transform import CachedTransform
+
+
+class RobotFramePoses:
+    """
+    The DriveToPose poses and inspection targets of a mission in the robot frame.
+
+    Transforming the steps one by one creates several alitra objects per step. Here
+    all positions and orientations of the mission are gathered in arrays and each
+    array is transformed in one vectorized operation. Steps that are already in the
+    robot frame are left as they are.
+    """
+
+    def __init__(self, tasks: Sequence[Task], transform: CachedTransform) -> None:
+        self._transform: CachedTransform = transform
+
+        drive_steps: List[DriveToPose] = []
+        inspection_steps: List[InspectionStep] = []
+        for task in tasks:
+            for step in task.steps:
+                if isinstance(step, DriveToPose):
+                    drive_steps.append(step)
+                if isinstance(step, InspectionStep):
+                    inspection_steps.append(step)
+
+        self._pose_rows: Dict[str, int] = {
+            step.id: row for row, step in enumerate(drive_steps)
+        }
+        pose_frames: List[Frame] = [step.pose.frame for step in drive_steps]
+        self._pose_positions: np.ndarray = self._to_robot_frame(
+            np.array(
+                [
+                    [step.pose.position.x, step.pose.position.y, step.pose.position.z]
+                    for step in drive_steps
+                ],
+                dtype=float,
+            ).reshape(-1, 3),
+            pose_frames,
+            transform.transform_position_array,
+        )
+        self._pose_orientations: np.ndarray = self._to_robot_frame(
+            np.array(
+                [step.pose.orientation.to_quat_array() for step in drive_steps],
+                dtype=float,
+            ).reshape(-1, 4),
+            pose_frames,
+            transform.transform_orientation_array,
+        )
+
+        self._target_rows: Dict[str, int] = {
+            step.id: row for row, step in enumerate(inspection_steps)
+        }
+        self._targets: np.ndarray = self._to_robot_frame(
+            np.array(
+                [
+                    [step.target.x, step.target.y, step.target.z]
+                    for step in inspection_steps
+                ],
+                dtype=float,
+            ).reshape(-1, 3),
+            [step.target.frame for step in inspection_steps],
+            transform.transform_position_array,
+        )
+
+    def get_pose(self, step: DriveToPose) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: The [x, y, z] position and [x, y, z, w] orientation of the step
+        """
+        row: int = self._pose_rows[step.id]
+        return self._pose_positions[row], self._pose_orientations[row]
+
+    def get_target(self, step: InspectionStep) -> np.ndarray:
+        """
+        :return: The [x, y, z] position of the target of the step
+        """
+        return self._targets[self._target_rows[step.id]]
+
+    def _to_robot_frame(
+        self,
+        rows: np.ndarray,
+        frames: Sequence[Frame],
+        transform_rows: Callable[[np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        for frame in frames:
+            if frame != self._transform.from_ and frame != self._transform.to_:
+                raise ValueError(f"Transform not specified from frame {frame}")
+
+        is_transformed: np.ndarray = np.array(
+            [frame == self._transform.from_ for frame in frames], dtype=bool
+        )
+        result: np.ndarray = rows.copy()
+        result[is_transformed] = transform_rows(rows[is_transformed])
+        return result
@@ -7,8 +7,9 @@ from logging import Logger
 from pathlib import Path
 from queue import Queue
 from threading import Thread
-from typing import List, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from alitra import (
     Frame,
     MapAlignment,
@@ -19,8 +20,9 @@ from alitra import (
     align_maps,
 )
 from isar_exr.models.exceptions import NoMissionRunningException
-from isar_exr.models.step_status import ExrStepStatus
+from isar_exr.models.step_status import ExrMissionStatus, ExrStepStatus
 from robot_interface.models.exceptions.robot_exceptions import (
+    RobotAPIException,
     RobotCommunicationException,
     RobotInfeasibleStepException,
     RobotInitializeException,
@@ -51,7 +53,14 @@ from robot_interface.telemetry.payloads import (
 )
 from robot_interface.utilities.json_service import EnhancedJSONEncoder
 
-from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.api.api_metrics import OperationStats
+from isar_exr.api.circuit_breaker import CircuitOpenException, is_outage
+from isar_exr.api.energy_robotics_api import (
+    EnergyRoboticsApi,
+    dock_robot_task_definition,
+    point_of_interest_inspection_task_definition,
+    waypoint_task_definition,
+)
 from isar_exr.api.models.models import (
     AddPointOfInterestInput,
     Point3DInput,
@@ -62,14 +71,43 @@ from isar_exr.api.models.models import (
     Pose3DStampedInput,
     QuaternionInput,
 )
+from isar_exr.config.robot_config import RobotConfig
 from isar_exr.config.settings import settings
+from isar_exr.models.cached_transform import CachedTransform
+from isar_exr.models.robot_frame_poses import RobotFramePoses
+from isar_exr.state.mission_definition_cache import (
+    CachedMissionDefinition,
+    MissionDefinitionCache,
+    get_mission_fingerprint,
+)
+from isar_exr.state.robot_state_poller import RobotStatePoller
+from isar_exr.state.robot_state_store import (
+    RobotStateKey,
+    RobotStateStore,
+    StateEntry,
+)
+from isar_exr.state.site_index import SiteIndex
+from isar_exr.tracing import tracer
 
 
 class Robot(RobotInterface):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        config: Optional[RobotConfig] = None,
+        api: Optional[EnergyRoboticsApi] = None,
+        site_index: Optional[SiteIndex] = None,
+        mission_definition_cache: Optional[MissionDefinitionCache] = None,
+    ) -> None:
+        """
+        Without arguments the robot is configured from the settings and has an API
+        client of its own. A Fleet passes the API client, site index and mission
+        definition cache its robots share, and keeps their state up to date itself.
+        """
         self.logger: Logger = logging.getLogger(Robot.__name__)
-        self.api: EnergyRoboticsApi = EnergyRoboticsApi()
-        self.exr_robot_id: str = settings.ROBOT_EXR_ID
+        self.config: RobotConfig = config if config is not None else RobotConfig()
+        is_fleet_robot: bool = api is not None
+        self.api: EnergyRoboticsApi = api if api is not None else EnergyRoboticsApi()
+        self.exr_robot_id: str = self.config.robot_id
 
         self.position: Position = Position(x=1, y=1, z=1, frame=Frame("asset"))
         self.orientation: Orientation = Orientation(
@@ -88,54 +126,98 @@ class Robot(RobotInterface):
         self.transform: Transform = align_maps(
             map_alignment.map_from, map_alignment.map_to, rot_axes="xyz"
         )
+        self.asset_to_robot_transform: CachedTransform = CachedTransform(
+            self.transform, from_=Frame("asset"), to_=Frame("robot")
+        )
         self.mission_task_ids: List[List[str]] = []
+        # (task index, step index) in 'mission_task_ids' by mission task id
+        self.mission_task_index: Dict[str, Tuple[int, int]] = {}
         self.current_mission_task_index: int = 0
+        # Index of the furthest task the robot has been seen executing
+        self.reached_mission_task_index: int = 0
+        self.mission_definition_cache: MissionDefinitionCache = (
+            mission_definition_cache
+            if mission_definition_cache is not None
+            else MissionDefinitionCache()
+        )
 
+        self.robot_state: RobotStateStore = RobotStateStore()
+        self.site_index: SiteIndex = (
+            site_index
+            if site_index is not None
+            else SiteIndex(api=self.api, site_id=self.config.site_id)
+        )
+        self.robot_state_poller: RobotStatePoller = RobotStatePoller(
+            api=self.api, exr_robot_id=self.exr_robot_id, robot_state=self.robot_state
+        )
+        if is_fleet_robot:
+            return
+        if settings.ROBOT_API_SUBSCRIPTIONS_ENABLED:
+            self.api.subscribe_to_robot_state(self.exr_robot_id, self.robot_state)
+            self.site_index.subscribe()
+        elif settings.ROBOT_STATE_POLLING_ENABLED:
+            self.robot_state_poller.start()
+
+    @tracer.traced()
     def create_new_stage(self) -> str:
-        current_stage_id = self.api.get_current_site_stage(settings.ROBOT_EXR_SITE_ID)
+        current_stage_id = self.api.get_current_site_stage(self.config.site_id)
         if current_stage_id is not None:
             self.api.discard_stage(stage_id=current_stage_id)
-        stage_id: str = self.api.create_stage(site_id=settings.ROBOT_EXR_SITE_ID)
+        stage_id: str = self.api.create_stage(site_id=self.config.site_id)
         return stage_id
 
+    @tracer.traced()
     def update_site_with_tasks(
         self, tasks: List[Task]
     ) -> List[str]:  # Returns a list of POI IDs
+        # Robots of a fleet may share the site, which has one open stage at a time
+        with self.site_index.update_lock:
+            return self._update_site_with_tasks(tasks)
+
+    def _update_site_with_tasks(self, tasks: List[Task]) -> List[str]:
         new_stage_id: str = None
         poi_ids: List[str] = []
+        # POIs that do not exist yet, created in bulk once all steps are read. Steps
+        # with the same customer tag share one POI, as they did when each tag was
+        # looked up after the previous POI had been created.
+        new_poi_indices: Dict[str, List[int]] = {}
+        new_poi_inputs: List[AddPointOfInterestInput] = []
         is_possible_return_to_home_mission = True
         steps_n = 0
         try:
+            robot_frame_poses: RobotFramePoses = RobotFramePoses(
+                tasks, self.asset_to_robot_transform
+            )
             for task in tasks:
                 for step in task.steps:
                     steps_n += 1
                     if isinstance(step, Localize):
                         steps_n -= 1
                     if isinstance(step, DriveToPose):
+                        drive_step: DriveToPose = step
                         robot_pose: Pose = step.pose
                     if isinstance(step, InspectionStep):
                         is_possible_return_to_home_mission = False
                         customer_tag: str = (
                             task.tag_id + "|" + str(robot_pose) + "|" + str(step.target)
                         )
-                        existing_poi_id = (
-                            self.api.get_point_of_interest_by_customer_tag(
-                                customer_tag=customer_tag,
-                                site_id=settings.ROBOT_EXR_SITE_ID,
-                            )
+                        existing_poi_id = self.site_index.get_point_of_interest_id(
+                            customer_tag
                         )
                         if existing_poi_id == None:
-                            new_stage_id = self.create_new_stage()
-                            poi_id: str = self._create_and_add_poi(
-                                task=task,
-                                step=step,
-                                robot_pose=robot_pose,  # This pose is set by the previously received DriveToStep
-                                stage_id=new_stage_id,
-                                customer_tag=customer_tag,
-                            )
-                            poi_ids.append(poi_id)
-                        else:
-                            poi_ids.append(existing_poi_id)
+                            if customer_tag not in new_poi_indices:
+                                new_poi_indices[customer_tag] = []
+                                new_poi_inputs.append(
+                                    self._get_point_of_interest_input(
+                                        task=task,
+                                        step=step,
+                                        drive_step=drive_step,  # This step is set by the previously received DriveToStep
+                                        customer_tag=customer_tag,
+                                        robot_frame_poses=robot_frame_poses,
+                                    )
+                                )
+                            new_poi_indices[customer_tag].append(len(poi_ids))
+                        poi_ids.append(existing_poi_id)
 
             if steps_n == 0 or (steps_n == 1 and is_possible_return_to_home_mission):
                 time.sleep(
@@ -144,6 +226,30 @@ class Robot(RobotInterface):
                 raise RobotMissionNotSupportedException(
                     "Robot does not support localisation or return to home mission"
                 )
+            new_poi_steps_n: int = sum(
+                len(poi_indices) for poi_indices in new_poi_indices.values()
+            )
+            tracer.set_attributes(
+                step_count=steps_n,
+                inspection_count=len(poi_ids),
+                poi_cache_hits=len(poi_ids) - new_poi_steps_n,
+            )
+
+            if new_poi_inputs:
+                # All new POIs are added to one stage, which becomes one snapshot
+                new_stage_id = self.create_new_stage()
+                new_poi_ids: List[str] = self.api.create_points_of_interest(
+                    new_poi_inputs
+                )
+                self.api.add_points_of_interest_to_stage(
+                    POI_ids=new_poi_ids, stage_id=new_stage_id
+                )
+                for (customer_tag, poi_indices), poi_id in zip(
+                    new_poi_indices.items(), new_poi_ids
+                ):
+                    for poi_index in poi_indices:
+                        poi_ids[poi_index] = poi_id
+                    self.site_index.add(customer_tag, poi_id)
 
             if new_stage_id is not None:
                 # We should only do the following if we changed the site
@@ -152,7 +258,7 @@ class Robot(RobotInterface):
                 )
 
                 self.api.set_snapshot_as_head(
-                    snapshot_id=snapshot_id, site_id=settings.ROBOT_EXR_SITE_ID
+                    snapshot_id=snapshot_id, site_id=self.config.site_id
                 )
         except Exception as e:
             if new_stage_id is not None:
@@ -162,65 +268,217 @@ class Robot(RobotInterface):
             raise e
 
         if new_stage_id is not None:  # Here we wait for the site update to complete
-            while not self.api.is_pipeline_completed(
-                site_id=settings.ROBOT_EXR_SITE_ID
-            ):
-                time.sleep(settings.API_SLEEP_TIME)
+            self.api.wait_for_pipeline_completion(site_id=self.config.site_id)
         return poi_ids
 
+    @tracer.traced()
     def create_mission_definition(
         self, mission_name: str, tasks: List[Task], poi_ids: List[str]
     ) -> str:  # Returns a mission definition ID
         # Note that the POI IDs need to be in the same order as inspection steps in the provided mission
+        robot_frame_poses: RobotFramePoses = RobotFramePoses(
+            tasks, self.asset_to_robot_transform
+        )
+        fingerprint: Optional[str] = None
+        if settings.MISSION_DEFINITION_CACHE_ENABLED:
+            fingerprint = self._get_mission_fingerprint(
+                tasks, poi_ids, robot_frame_poses
+            )
+            cached_mission_definition: Optional[CachedMissionDefinition] = (
+                self._get_cached_mission_definition(fingerprint)
+            )
+            tracer.set_attributes(
+                mission_definition_cache_hit=cached_mission_definition is not None
+            )
+            if cached_mission_definition is not None:
+                self.mission_task_ids.extend(
+                    list(step_ids)
+                    for step_ids in cached_mission_definition.mission_task_ids
+                )
+                self._index_mission_task_ids()
+                return cached_mission_definition.mission_definition_id
+
         mission_definition_id: str = self.api.create_mission_definition(
-            site_id=settings.ROBOT_EXR_SITE_ID,
+            site_id=self.config.site_id,
             mission_name=mission_name,
-            robot_id=settings.ROBOT_EXR_ID,
+            robot_id=self.config.robot_id,
         )
 
+        # All task definitions are created at once and then added in mission order
+        remaining_poi_ids = iter(poi_ids)
+        task_definitions: List[Tuple[str, Dict[str, Any]]] = []
+        steps_per_task: List[int] = []
         for task in tasks:
-            step_ids: List[str] = []
+            steps_n: int = len(task_definitions)
             for step in task.steps:
                 if isinstance(step, DriveToPose):
-                    task_id = self._add_waypoint_task_to_mission(
-                        mission_definition_id=mission_definition_id, step=step
+                    task_definitions.append(
+                        self._get_waypoint_task_definition(step, robot_frame_poses)
                     )
-                    step_ids.append(task_id)
                 if isinstance(step, InspectionStep):
-                    task_id = self._add_point_of_interest_inspection_task_to_mission(
-                        task_name=step.id,
-                        point_of_interest_id=poi_ids.pop(0),
-                        mission_definition_id=mission_definition_id,
+                    task_definitions.append(
+                        point_of_interest_inspection_task_definition(
+                            site_id=self.config.site_id,
+                            task_name=step.id,
+                            point_of_interest_id=next(remaining_poi_ids),
+                        )
                     )
-                    step_ids.append(task_id)
-            self.mission_task_ids.append(step_ids)
+            steps_per_task.append(len(task_definitions) - steps_n)
+        task_definitions.append(
+            dock_robot_task_definition(
+                site_id=self.config.site_id,
+                task_name="dock",
+                docking_station_id=self.config.docking_station_id,
+            )
+        )
+        steps_per_task.append(1)
+        tracer.set_attributes(task_definition_count=len(task_definitions))
 
-        dock_task_id: str = self._add_dock_robot_task_to_mission(
-            task_name="dock",
-            mission_definition_id=mission_definition_id,
+        task_ids: List[str] = self.api.create_task_definitions(task_definitions)
+        self.api.add_tasks_to_mission_definition(
+            task_ids=task_ids, mission_definition_id=mission_definition_id
         )
-        self.mission_task_ids.append([dock_task_id])
+
+        remaining_task_ids = iter(task_ids)
+        for steps_n in steps_per_task:
+            self.mission_task_ids.append(
+                [next(remaining_task_ids) for _ in range(steps_n)]
+            )
+        self._index_mission_task_ids()
+
+        if fingerprint is not None:
+            self.mission_definition_cache.put(
+                fingerprint,
+                CachedMissionDefinition(
+                    mission_definition_id=mission_definition_id,
+                    mission_task_ids=self.mission_task_ids,
+                ),
+            )
         return mission_definition_id
 
-    def initiate_mission(self, mission: Mission) -> None:
-        try:
-            poi_ids: List[str] = self.update_site_with_tasks(mission.tasks)
-        except RobotMissionNotSupportedException:
-            return
+    def _index_mission_task_ids(self) -> None:
+        self.mission_task_index = {
+            task_id: (task_index, step_index)
+            for task_index, step_ids in enumerate(self.mission_task_ids)
+            for step_index, task_id in enumerate(step_ids)
+        }
+
+    def _get_mission_fingerprint(
+        self,
+        tasks: List[Task],
+        poi_ids: List[str],
+        robot_frame_poses: RobotFramePoses,
+    ) -> str:
+        # Mirrors the task definitions created in 'create_mission_definition'
+        remaining_poi_ids = iter(poi_ids)
+        task_layouts: List[List[Dict[str, Any]]] = []
+        for task in tasks:
+            step_layouts: List[Dict[str, Any]] = []
+            for step in task.steps:
+                if isinstance(step, DriveToPose):
+                    position, orientation = robot_frame_poses.get_pose(step)
+                    step_layouts.append(
+                        {
+                            "waypoint": [
+                                round(float(value), 6)
+                                for value in [*position, *orientation]
+                            ]
+                        }
+                    )
+                if isinstance(step, InspectionStep):
+                    step_layouts.append({"point_of_interest": next(remaining_poi_ids)})
+            task_layouts.append(step_layouts)
+
+        return get_mission_fingerprint(
+            {
+                "site_id": self.config.site_id,
+                "robot_id": self.config.robot_id,
+                "docking_station_id": self.config.docking_station_id,
+                "tasks": task_layouts,
+            }
+        )
 
-        self.mission_task_ids = []
-        self.current_mission_task_index = 0
-        mission_definition_id: str = self.create_mission_definition(
-            mission.id, mission.tasks, poi_ids
+    def _get_cached_mission_definition(
+        self, fingerprint: str
+    ) -> Optional[CachedMissionDefinition]:
+        cached_mission_definition: Optional[CachedMissionDefinition] = (
+            self.mission_definition_cache.get(fingerprint)
         )
+        if cached_mission_definition is None:
+            return None
+
+        try:
+            task_ids: Optional[List[str]] = self.api.get_mission_definition_task_ids(
+                cached_mission_definition.mission_definition_id
+            )
+        except RobotAPIException:
+            # Creating a new mission definition is always safe
+            return None
+
+        expected_task_ids: List[str] = [
+            task_id
+            for step_ids in cached_mission_definition.mission_task_ids
+            for task_id in step_ids
+        ]
+        # The API may add tasks of its own, e.g. to start and end the mission
+        if (
+            task_ids is None
+            or [task_id for task_id in task_ids if task_id in expected_task_ids]
+            != expected_task_ids
+        ):
+            self.logger.info(
+                f"Cached mission definition "
+                f"{cached_mission_definition.mission_definition_id} has changed on "
+                f"the API, creating a new one"
+            )
+            self.mission_definition_cache.remove(fingerprint)
+            return None
 
-        self.api.start_mission_execution(
-            mission_definition_id=mission_definition_id, robot_id=settings.ROBOT_EXR_ID
+        self.logger.info(
+            f"Reusing mission definition "
+            f"{cached_mission_definition.mission_definition_id}"
         )
+        return cached_mission_definition
+
+    def initiate_mission(self, mission: Mission) -> None:
+        # Not decorated, as the signature is checked against the RobotInterface
+        with tracer.span(
+            "Robot.initiate_mission",
+            attributes={"mission_id": mission.id, "task_count": len(mission.tasks)},
+        ):
+            try:
+                poi_ids: List[str] = self.update_site_with_tasks(mission.tasks)
+            except RobotMissionNotSupportedException:
+                return
+
+            self.mission_task_ids = []
+            self.mission_task_index = {}
+            self.current_mission_task_index = 0
+            self.reached_mission_task_index = 0
+            mission_definition_id: str = self.create_mission_definition(
+                mission.id, mission.tasks, poi_ids
+            )
+
+            self.api.start_mission_execution(
+                mission_definition_id=mission_definition_id,
+                robot_id=self.config.robot_id,
+            )
+            # The mission execution known so far is from before the mission was started
+            self.robot_state.invalidate(RobotStateKey.MissionExecution)
 
     def mission_status(self) -> MissionStatus:
+        mission_execution: Optional[StateEntry] = self.robot_state.get(
+            RobotStateKey.MissionExecution
+        )
         try:
-            return self.api.get_mission_status(settings.ROBOT_EXR_ID)
+            if mission_execution is not None:
+                if mission_execution.value is None:
+                    # No mission is running, see the NoMissionRunningException below
+                    return MissionStatus.Successful
+                return ExrMissionStatus(
+                    mission_execution.value["status"]
+                ).to_mission_status()
+            return self.api.get_mission_status(self.config.robot_id)
         except NoMissionRunningException:
             # This is a temporary solution until we have mission status by mission id
             return MissionStatus.Successful
@@ -236,10 +494,28 @@ class Robot(RobotInterface):
         raise NotImplementedError
 
     def step_status(self) -> StepStatus:
+        # Tasks the robot has already gone past are reported without a request
+        if self.current_mission_task_index < self.reached_mission_task_index:
+            self.current_mission_task_index += 1
+            return StepStatus.Successful
+
+        mission_execution: Optional[StateEntry] = self.robot_state.get(
+            RobotStateKey.MissionExecution
+        )
         try:
-            (mission_status, current_task_id) = (
-                self.api.get_mission_status_and_current_task(settings.ROBOT_EXR_ID)
-            )
+            if mission_execution is not None:
+                if mission_execution.value is None:
+                    raise NoMissionRunningException(
+                        "No EXR mission is running according to the robot state"
+                    )
+                mission_status: str = mission_execution.value["status"]
+                current_task_id: Optional[str] = mission_execution.value[
+                    "currentExecutedTaskId"
+                ]
+            else:
+                mission_status, current_task_id = (
+                    self.api.get_mission_status_and_current_task(self.config.robot_id)
+                )
             step_status: StepStatus = ExrStepStatus(mission_status).to_step_status()
         except NoMissionRunningException:
             # This is a temporary solution until we have mission status by mission id
@@ -262,19 +538,19 @@ class Robot(RobotInterface):
             return StepStatus.NotStarted
 
         try:
-            step: List[str] = list(
-                filter(lambda step: current_task_id in step, self.mission_task_ids)
-            )[0]
-            task_index: int = self.mission_task_ids.index(step)
-        except ValueError or IndexError:
-            value_error_message: str = (
+            task_index, _ = self.mission_task_index[current_task_id]
+        except KeyError:
+            key_error_message: str = (
                 f"Could not find mission task with ID {current_task_id}\n"
             )
-            self.logger.error(value_error_message)
+            self.logger.error(key_error_message)
             raise RobotStepStatusException(
-                error_description=value_error_message,
+                error_description=key_error_message,
             )
 
+        self.reached_mission_task_index = max(
+            self.reached_mission_task_index, task_index
+        )
         if task_index > self.current_mission_task_index:
             self.current_mission_task_index += 1
             return StepStatus.Successful
@@ -290,6 +566,7 @@ class Robot(RobotInterface):
             raise RobotCommunicationException(
                 error_description=message,
             )
+        self.robot_state.invalidate(RobotStateKey.MissionExecution)
 
     def get_inspections(self, step: InspectionStep) -> Sequence[Inspection]:
         raise NotImplementedError
@@ -339,38 +616,77 @@ class Robot(RobotInterface):
         )
         publisher_threads.append(battery_thread)
 
+        if settings.ROBOT_API_METRICS_PUBLISHING_ENABLED:
+            api_metrics_publisher: MqttTelemetryPublisher = MqttTelemetryPublisher(
+                mqtt_queue=queue,
+                telemetry_method=self._get_api_metrics_telemetry,
+                topic=f"isar/{isar_id}/api_metrics",
+                interval=settings.ROBOT_API_METRICS_PUBLISH_INTERVAL,
+                retain=False,
+            )
+            api_metrics_thread: Thread = Thread(
+                target=api_metrics_publisher.run,
+                args=[isar_id, robot_name],
+                name="ISAR Exr API Metrics Publisher",
+                daemon=True,
+            )
+            publisher_threads.append(api_metrics_thread)
+
         return publisher_threads
 
     def robot_status(self) -> RobotStatus:
         # TODO: find endpoint to check if it is stuck, maybe MissionExecutionStatusEnum.PAUSED
         try:
-            if not self.api.is_connected(settings.ROBOT_EXR_ID):
-                return RobotStatus.Offline
+            is_connected, mission_status = self._get_connection_and_mission_status()
+        except ValueError as e:
+            logging.warning(f"Failed to get mission status from robot: {e}")
+            return RobotStatus.Offline
+        except CircuitOpenException as e:
+            self.logger.warning(f"Reporting the robot as offline: {e}")
+            return RobotStatus.Offline
         except Exception as e:
+            if is_outage(e):
+                # Timeouts and transport errors report the robot as offline, as they
+                # did when connection and mission status were queried separately
+                self.logger.warning(f"Reporting the robot as offline: {e}")
+                return RobotStatus.Offline
             message: str = f"Could not check if the robot is connected: {e}"
             self.logger.error(message)
             raise RobotCommunicationException(
                 error_description=message,
             )
 
-        try:
-            mission_status: MissionStatus = self.api.get_mission_status(
-                settings.ROBOT_EXR_ID
-            )
-            if (
-                mission_status == MissionStatus.Paused
-                or mission_status == MissionStatus.NotStarted
-                or mission_status == MissionStatus.InProgress
-            ):
-                return RobotStatus.Busy
-        except NoMissionRunningException as e:
-            return RobotStatus.Available
-        except Exception as e:
-            logging.warning(f"Failed to get mission status from robot: {e}")
+        if not is_connected:
             return RobotStatus.Offline
 
+        if (
+            mission_status == MissionStatus.Paused
+            or mission_status == MissionStatus.NotStarted
+            or mission_status == MissionStatus.InProgress
+        ):
+            return RobotStatus.Busy
+
         return RobotStatus.Available
 
+    def _get_connection_and_mission_status(
+        self,
+    ) -> Tuple[bool, Optional[MissionStatus]]:
+        robot_status: Optional[StateEntry] = self.robot_state.get(
+            RobotStateKey.RobotStatus
+        )
+        mission_execution: Optional[StateEntry] = self.robot_state.get(
+            RobotStateKey.MissionExecution
+        )
+        if robot_status is None or mission_execution is None:
+            return self.api.get_connection_and_mission_status(self.config.robot_id)
+
+        mission_status: Optional[MissionStatus] = None
+        if mission_execution.value is not None:
+            mission_status = ExrMissionStatus(
+                mission_execution.value["status"]
+            ).to_mission_status()
+        return robot_status.value["isConnected"], mission_status
+
     def _get_pose_telemetry(self, isar_id: str, robot_name: str) -> str:
         pose_payload: TelemetryPosePayload = TelemetryPosePayload(
             pose=self.pose,
@@ -381,7 +697,16 @@ class Robot(RobotInterface):
         return json.dumps(pose_payload, cls=EnhancedJSONEncoder)
 
     def _get_battery_telemetry(self, isar_id: str, robot_name: str) -> str:
-        battery_level = self.api.get_battery_level(settings.ROBOT_EXR_ID)
+        robot_status: Optional[StateEntry] = self.robot_state.get(
+            RobotStateKey.RobotStatus
+        )
+        if robot_status is not None:
+            battery_status: Optional[dict] = robot_status.value["batteryStatus"]
+            battery_level: Optional[float] = (
+                battery_status["percentage"] if battery_status else None
+            )
+        else:
+            battery_level = self.api.get_battery_level(self.config.robot_id)
         battery_payload: TelemetryBatteryPayload = TelemetryBatteryPayload(
             battery_level=battery_level,
             isar_id=isar_id,
@@ -390,22 +715,37 @@ class Robot(RobotInterface):
         )
         return json.dumps(battery_payload, cls=EnhancedJSONEncoder)
 
+    def _get_api_metrics_telemetry(self, isar_id: str, robot_name: str) -> str:
+        snapshot: Dict[str, OperationStats] = self.api.client.metrics.get_snapshot()
+        api_metrics: Dict[str, Any] = {
+            "isar_id": isar_id,
+            "robot_name": robot_name,
+            "timestamp": datetime.datetime.now(),
+            "operations": {
+                operation_name: stats.model_dump()
+                for operation_name, stats in snapshot.items()
+            },
+            "circuits": self.api.client.circuit_breakers.get_states(),
+        }
+        return json.dumps(api_metrics, cls=EnhancedJSONEncoder)
+
     def _create_image(self, step: Union[TakeImage, TakeThermalImage]):
         raise NotImplementedError
 
     def _create_video(self, step: Union[TakeVideo, TakeThermalVideo]):
         raise NotImplementedError
 
-    def _create_and_add_poi(
-        self, task: Task, step: Step, robot_pose: Pose, stage_id: str, customer_tag: str
-    ) -> str:
-        target: Position = self.transform.transform_position(
-            positions=step.target,
-            from_=step.target.frame,
-            to_=Frame("robot"),
-        )
+    def _get_point_of_interest_input(
+        self,
+        task: Task,
+        step: Step,
+        drive_step: DriveToPose,
+        customer_tag: str,
+        robot_frame_poses: RobotFramePoses,
+    ) -> AddPointOfInterestInput:
+        target: np.ndarray = robot_frame_poses.get_target(step)
         pose: Pose3DInput = Pose3DInput(
-            position=Point3DInput(x=target.x, y=target.y, z=target.z),
+            position=Point3DInput(x=target[0], y=target[1], z=target[2]),
             orientation=QuaternionInput(  # Ask Energy Robotics what is this used for
                 x=0,
                 y=0,
@@ -414,23 +754,21 @@ class Robot(RobotInterface):
             ),
         )
 
-        transformed_robot_pose = self.transform.transform_position(
-            positions=robot_pose.position,
-            from_=robot_pose.position.frame,
-            to_=Frame("robot"),
-        )
+        robot_position: np.ndarray = robot_frame_poses.get_pose(drive_step)[0]
+        # The orientation is passed on as given in the mission
+        robot_orientation: Orientation = drive_step.pose.orientation
 
         photo_input_pose: Pose3DInput = Pose3DInput(
             position=Point3DInput(
-                x=transformed_robot_pose.x,
-                y=transformed_robot_pose.y,
-                z=transformed_robot_pose.z,
+                x=robot_position[0],
+                y=robot_position[1],
+                z=robot_position[2],
             ),
             orientation=QuaternionInput(
-                w=robot_pose.orientation.w,
-                x=robot_pose.orientation.x,
-                y=robot_pose.orientation.y,
-                z=robot_pose.orientation.z,
+                w=robot_orientation.w,
+                x=robot_orientation.x,
+                y=robot_orientation.y,
+                z=robot_orientation.z,
             ),
         )
 
@@ -439,7 +777,7 @@ class Robot(RobotInterface):
             "customerTag": customer_tag,
             "frame": "map",
             "type": PointOfInterestTypeEnum.GENERIC,
-            "site": settings.ROBOT_EXR_SITE_ID,
+            "site": self.config.site_id,
             "pose": pose,
         }
 
@@ -470,73 +808,25 @@ class Robot(RobotInterface):
                 error_description=f"Step of type {type(step)} not supported"
             )
 
-        poi_input: AddPointOfInterestInput = AddPointOfInterestInput(
-            **add_point_of_interest_input
-        )
-
-        poi_id: str = self.api.create_point_of_interest(
-            point_of_interest_input=poi_input
-        )
-
-        self.api.add_point_of_interest_to_stage(POI_id=poi_id, stage_id=stage_id)
-
-        return poi_id
+        return AddPointOfInterestInput(**add_point_of_interest_input)
 
-    def _add_waypoint_task_to_mission(
-        self, mission_definition_id: str, step: Step
-    ) -> str:
-        pose: Pose = self.transform.transform_pose(
-            pose=step.pose, from_=step.pose.frame, to_=Frame("robot")
-        )
+    def _get_waypoint_task_definition(
+        self, step: DriveToPose, robot_frame_poses: RobotFramePoses
+    ) -> Tuple[str, Dict[str, Any]]:
+        position, orientation = robot_frame_poses.get_pose(step)
         pose_3d_stamped: Pose3DStampedInput = Pose3DStampedInput(
             timestamp=int(round(datetime.datetime.now().timestamp())),
             frameID="map",
-            position=Point3DInput(
-                x=pose.position.x, y=pose.position.y, z=pose.position.z
-            ),
+            position=Point3DInput(x=position[0], y=position[1], z=position[2]),
             orientation=QuaternionInput(
-                x=pose.orientation.x,
-                y=pose.orientation.y,
-                z=pose.orientation.z,
-                w=pose.orientation.w,
+                x=orientation[0],
+                y=orientation[1],
+                z=orientation[2],
+                w=orientation[3],
             ),
         )
-        waypoint_id: str = self.api.create_waypoint_task_definition(
-            site_id=settings.ROBOT_EXR_SITE_ID,
+        return waypoint_task_definition(
+            site_id=self.config.site_id,
             task_name=step.id,
             pose_3D_stamped_input=pose_3d_stamped,
         )
-        self.api.add_task_to_mission_definition(
-            task_id=waypoint_id,
-            mission_definition_id=mission_definition_id,
-        )
-
-        return waypoint_id
-
-    def _add_point_of_interest_inspection_task_to_mission(
-        self, task_name: str, point_of_interest_id: str, mission_definition_id: str
-    ):
-        poi_task_id: str = self.api.create_point_of_interest_inspection_task_definition(
-            site_id=settings.ROBOT_EXR_SITE_ID,
-            task_name=task_name,
-            point_of_interest_id=point_of_interest_id,
-        )
-        self.api.add_task_to_mission_definition(
-            task_id=poi_task_id,
-            mission_definition_id=mission_definition_id,
-        )
-        return poi_task_id
-
-    def _add_dock_robot_task_to_mission(
-        self, task_name: str, mission_definition_id: str
-    ):
-        dock_task_id: str = self.api.create_dock_robot_task_definition(
-            site_id=settings.ROBOT_EXR_SITE_ID,
-            task_name=task_name,
-            docking_station_id=settings.DOCKING_STATION_ID,
-        )
-        self.api.add_task_to_mission_definition(
-            task_id=dock_task_id,
-            mission_definition_id=mission_definition_id,
-        )
-        return dock_task_id
@@ -0,0 +1,80 @@
+import time
+from logging import Logger, getLogger
+from threading import Event, Thread
+from typing import Any, Dict, Optional, Tuple
+
+from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.config.settings import settings
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+class FleetStatePoller:
+    """
+    Keeps the robot state stores of all robots of a fleet up to date by polling,
+    like the RobotStatePoller does for a single robot.
+
+    The statuses of all robots are fetched in one request per 'interval', and the
+    running mission executions in one request per 'ROBOT_API_MAX_BATCH_SIZE'
+    robots, so the number of requests does not grow with every robot added.
+    """
+
+    thread_name: str = "ISAR Exr Fleet State Poller"
+
+    def __init__(
+        self,
+        api: EnergyRoboticsApi,
+        robot_states: Dict[str, RobotStateStore],
+        interval: float = settings.ROBOT_STATE_POLL_INTERVAL,
+        max_age: float = settings.ROBOT_STATE_MAX_AGE,
+    ) -> None:
+        """
+        :param robot_states: The robot state store of each robot, by robot id
+        """
+        self.logger: Logger = getLogger(FleetStatePoller.__name__)
+        self.api: EnergyRoboticsApi = api
+        self.robot_states: Dict[str, RobotStateStore] = robot_states
+        self.interval: float = interval
+        self.max_age: float = max_age
+        self._stopped: Event = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def poll(self) -> None:
+        requested_at: float = time.time()
+        fleet_state: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = (
+            self.api.get_fleet_state(list(self.robot_states))
+        )
+        for exr_robot_id, (robot_status, mission_execution) in fleet_state.items():
+            robot_state: RobotStateStore = self.robot_states[exr_robot_id]
+            robot_state.update(
+                RobotStateKey.RobotStatus,
+                robot_status,
+                max_age=self.max_age,
+                requested_at=requested_at,
+            )
+            robot_state.update(
+                RobotStateKey.MissionExecution,
+                mission_execution,
+                max_age=self.max_age,
+                requested_at=requested_at,
+            )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            started_at: float = time.monotonic()
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.warning(f"Could not poll the fleet: {e}")
+            self._stopped.wait(
+                max(0.0, self.interval - (time.monotonic() - started_at))
+            )
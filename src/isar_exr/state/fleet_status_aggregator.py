@@ -0,0 +1,60 @@
+import time
+from logging import Logger, getLogger
+from typing import Any, Dict, List, Optional, Sequence
+
+from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.config.settings import settings
+from isar_exr.state.fleet_state_poller import FleetStatePoller
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+class FleetStatusAggregator(FleetStatePoller):
+    """
+    Fetches the status of every robot of a fleet, with its connectivity and battery,
+    in a single request per 'interval', and hands each robot its own status through
+    its robot state store. The battery publishers of the robots read the status from
+    there, so publishing telemetry for more robots adds no requests.
+
+    When all robots are on one site the statuses of the site are fetched, otherwise
+    those of the robot ids of the fleet. Unlike the FleetStatePoller, the mission
+    executions are left for the robots to query when they need them.
+    """
+
+    thread_name: str = "ISAR Exr Fleet Status Aggregator"
+
+    def __init__(
+        self,
+        api: EnergyRoboticsApi,
+        robot_states: Dict[str, RobotStateStore],
+        site_ids: Sequence[str],
+        interval: float = settings.ROBOT_STATE_POLL_INTERVAL,
+        max_age: float = settings.ROBOT_STATE_MAX_AGE,
+    ) -> None:
+        """
+        :param site_ids: The sites the robots of the fleet are on
+        """
+        super().__init__(
+            api=api, robot_states=robot_states, interval=interval, max_age=max_age
+        )
+        self.logger: Logger = getLogger(FleetStatusAggregator.__name__)
+        self.site_ids: List[str] = list(site_ids)
+
+    def poll(self) -> None:
+        requested_at: float = time.time()
+        robot_statuses: Dict[str, Dict[str, Any]]
+        if len(self.site_ids) == 1:
+            robot_statuses = self.api.get_robot_statuses_per_site(self.site_ids[0])
+        else:
+            robot_statuses = self.api.get_robot_statuses(list(self.robot_states))
+
+        for exr_robot_id, robot_status in robot_statuses.items():
+            robot_state: Optional[RobotStateStore] = self.robot_states.get(exr_robot_id)
+            if robot_state is None:
+                # Robots on the site that are not part of the fleet
+                continue
+            robot_state.update(
+                RobotStateKey.RobotStatus,
+                robot_status,
+                max_age=self.max_age,
+                requested_at=requested_at,
+            )
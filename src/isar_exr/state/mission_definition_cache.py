@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from logging import Logger, getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from isar_exr.config.settings import settings
+
+
+class CachedMissionDefinition(BaseModel):
+    mission_definition_id: str
+    # Task definition ids per mission task, the last entry holds the dock task
+    mission_task_ids: List[List[str]]
+
+
+def get_mission_fingerprint(mission_layout: Dict[str, Any]) -> str:
+    """
+    :param mission_layout: Everything that determines the content of a mission
+        definition, as plain JSON values. Step and mission ids must not be part of it,
+        as they change every time the same mission is sent.
+    :return: A hash of the canonical JSON form of the layout
+    """
+    canonical: str = json.dumps(mission_layout, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MissionDefinitionCache:
+    """
+    Mission definitions created on the Energy Robotics API, keyed by the fingerprint
+    of the mission they were created for, so that sending the same mission again
+    can reuse the definition instead of creating every task definition anew.
+
+    The cache is persisted to a JSON file, which survives restarts when it is kept on
+    persistent storage, see 'PATH_TO_MISSION_DEFINITION_CACHE'. Entries may refer to
+    definitions that have since been deleted on the API, so callers verify a hit
+    before using it and 'remove' it if it is no longer valid.
+    """
+
+    def __init__(self, path: Path = settings.PATH_TO_MISSION_DEFINITION_CACHE) -> None:
+        self.logger: Logger = getLogger(MissionDefinitionCache.__name__)
+        self.path: Path = path
+        self._lock: Lock = Lock()
+        self._entries: Optional[Dict[str, CachedMissionDefinition]] = None
+
+    def get(self, fingerprint: str) -> Optional[CachedMissionDefinition]:
+        with self._lock:
+            return self._get_entries().get(fingerprint)
+
+    def put(self, fingerprint: str, entry: CachedMissionDefinition) -> None:
+        with self._lock:
+            self._get_entries()[fingerprint] = entry
+            self._save()
+
+    def remove(self, fingerprint: str) -> None:
+        with self._lock:
+            if self._get_entries().pop(fingerprint, None) is not None:
+                self._save()
+
+    def _get_entries(self) -> Dict[str, CachedMissionDefinition]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, CachedMissionDefinition]:
+        if not self.path.is_file():
+            return {}
+        try:
+            content: Dict[str, Any] = json.loads(self.path.read_bytes())
+            return {
+                fingerprint: CachedMissionDefinition(**entry)
+                for fingerprint, entry in content.items()
+            }
+        except Exception as e:
+            self.logger.warning(
+                f"Could not load mission definition cache '{self.path}', "
+                f"starting empty: {e}"
+            )
+            return {}
+
+    def _save(self) -> None:
+        content: Dict[str, Any] = {
+            fingerprint: entry.model_dump()
+            for fingerprint, entry in self._entries.items()
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path: Path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporary_path, "w", encoding="utf-8") as cache_file:
+                json.dump(content, cache_file, separators=(",", ":"))
+            # Atomic on POSIX, so a crash never leaves a partial cache behind
+            os.replace(temporary_path, self.path)
+        except OSError as e:
+            self.logger.warning(
+                f"Could not write mission definition cache '{self.path}': {e}"
+            )
@@ -0,0 +1,76 @@
+import time
+from logging import Logger, getLogger
+from threading import Event, Thread
+from typing import Optional
+
+from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.config.settings import settings
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+class RobotStatePoller:
+    """
+    Keeps the robot state store up to date by polling, for when the state is not
+    pushed over subscriptions.
+
+    The robot status, with its connectivity and battery, and the running mission
+    execution, with its status and current task, are fetched in one request per
+    'interval' on a background thread. The polled values expire after 'max_age',
+    so that readers fall back to querying the API themselves if polling stalls.
+    """
+
+    def __init__(
+        self,
+        api: EnergyRoboticsApi,
+        exr_robot_id: str,
+        robot_state: RobotStateStore,
+        interval: float = settings.ROBOT_STATE_POLL_INTERVAL,
+        max_age: float = settings.ROBOT_STATE_MAX_AGE,
+    ) -> None:
+        self.logger: Logger = getLogger(RobotStatePoller.__name__)
+        self.api: EnergyRoboticsApi = api
+        self.exr_robot_id: str = exr_robot_id
+        self.robot_state: RobotStateStore = robot_state
+        self.interval: float = interval
+        self.max_age: float = max_age
+        self._stopped: Event = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, name="ISAR Exr Robot State Poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def poll(self) -> None:
+        requested_at: float = time.time()
+        robot_status, mission_execution = self.api.get_robot_state(self.exr_robot_id)
+        self.robot_state.update(
+            RobotStateKey.RobotStatus,
+            robot_status,
+            max_age=self.max_age,
+            requested_at=requested_at,
+        )
+        self.robot_state.update(
+            RobotStateKey.MissionExecution,
+            mission_execution,
+            max_age=self.max_age,
+            requested_at=requested_at,
+        )
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            started_at: float = time.monotonic()
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.warning(f"Could not poll the robot state: {e}")
+            self._stopped.wait(
+                max(0.0, self.interval - (time.monotonic() - started_at))
+            )
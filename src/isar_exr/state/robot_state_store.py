@@ -0,0 +1,81 @@
+import time
+from enum import Enum
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class RobotStateKey(str, Enum):
+    RobotStatus = "ROBOT_STATUS"
+    MissionExecution = "MISSION_EXECUTION"
+
+
+class StateEntry(BaseModel):
+    value: Any
+    # Unix timestamp of when the value was received
+    received_at: float
+    # Unix timestamp after which the value is no longer used, None to keep it
+    expires_at: Optional[float] = None
+
+
+class RobotStateStore:
+    """
+    Latest robot state as pushed by the Energy Robotics API or polled from it.
+
+    A pushed value is kept until the source that feeds it is lost, at which point the
+    store is cleared. A polled value is kept until it is older than its maximum age.
+    Readers fall back to querying the API whenever 'get' returns None, so an empty
+    store is always safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock: Lock = Lock()
+        self._entries: Dict[RobotStateKey, StateEntry] = {}
+        # Unix timestamp of when each key was last invalidated
+        self._invalidated_at: Dict[RobotStateKey, float] = {}
+
+    def update(
+        self,
+        key: RobotStateKey,
+        value: Any,
+        max_age: Optional[float] = None,
+        requested_at: Optional[float] = None,
+    ) -> None:
+        """
+        :param max_age: Seconds the value is used for, None to keep it until cleared
+        :param requested_at: Unix timestamp of when a polled value was requested. The
+            value is dropped if the key has been invalidated since.
+        """
+        received_at: float = time.time()
+        entry: StateEntry = StateEntry(
+            value=value,
+            received_at=received_at,
+            expires_at=None if max_age is None else received_at + max_age,
+        )
+        with self._lock:
+            invalidated_at: float = self._invalidated_at.get(key, 0)
+            if requested_at is not None and requested_at < invalidated_at:
+                return
+            self._entries[key] = entry
+
+    def get(self, key: RobotStateKey) -> Optional[StateEntry]:
+        with self._lock:
+            entry: Optional[StateEntry] = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None:
+            if time.time() > entry.expires_at:
+                return None
+        return entry
+
+    def invalidate(self, key: RobotStateKey) -> None:
+        """
+        Removes the value of the key, e.g. as a command has made it outdated. Polls
+        that were already in flight do not bring it back.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._invalidated_at[key] = time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,121 @@
+import time
+from logging import Logger, getLogger
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.config.settings import settings
+
+
+class SiteIndex:
+    """
+    The POIs of a site keyed by customer tag, so that POIs can be looked up in
+    memory while uploading a mission.
+
+    All POIs are loaded with one request on the first lookup. With subscriptions
+    enabled, the index is kept current by the POI changes pushed for the site and
+    reloaded after the subscription connection has been down. Without subscriptions,
+    the index is reloaded once it is older than 'SITE_INDEX_MAX_AGE'. POIs created
+    by this client are added as soon as they exist.
+    """
+
+    def __init__(
+        self,
+        api: EnergyRoboticsApi,
+        site_id: str,
+        max_age: float = settings.SITE_INDEX_MAX_AGE,
+    ) -> None:
+        self.logger: Logger = getLogger(SiteIndex.__name__)
+        self.api: EnergyRoboticsApi = api
+        self.site_id: str = site_id
+        self.max_age: float = max_age
+        self._lock: Lock = Lock()
+        self._point_of_interest_ids: Dict[str, str] = {}
+        # Reverse lookup for changes pushed by POI id
+        self._customer_tags: Dict[str, str] = {}
+        # Unix timestamp of the last load, None while the index has to be reloaded
+        self._loaded_at: Optional[float] = None
+        self._is_subscribed: bool = False
+        # Held while the site is changed through a stage, by any robot on the site
+        self.update_lock: Lock = Lock()
+
+    def get_point_of_interest_id(self, customer_tag: str) -> Optional[str]:
+        """
+        :return: The id of the POI with the customer tag, or None if there is none.
+
+        :raises RobotAPIException: The POIs of the site could not be loaded
+        """
+        with self._lock:
+            if self._needs_reload():
+                self._load()
+            return self._point_of_interest_ids.get(customer_tag)
+
+    def add(self, customer_tag: str, point_of_interest_id: str) -> None:
+        with self._lock:
+            self._add(customer_tag, point_of_interest_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def subscribe(self) -> None:
+        self.api.subscribe_to_points_of_interest(
+            site_id=self.site_id,
+            callback=self.apply_update,
+            connection_listener=self._on_connection_change,
+        )
+
+    def apply_update(self, update: Dict[str, Any]) -> None:
+        """
+        Applies a POI change pushed by the API, see 'PointOfInterestSubscriptionType'.
+        """
+        point_of_interest: Optional[Dict[str, Any]] = update["pointOfInterest"]
+        if point_of_interest is None:
+            # Several POIs were affected, e.g. by 'DELETE_MANY'
+            self.invalidate()
+            return
+
+        with self._lock:
+            self._remove(point_of_interest["id"])
+            if update["operation"] in ["CREATE", "UPDATE"]:
+                customer_tag: Optional[str] = point_of_interest["customerTag"]
+                if customer_tag is not None:
+                    self._add(customer_tag, point_of_interest["id"])
+
+    def _on_connection_change(self, connected: bool) -> None:
+        # Changes are missed while the connection is down, so the POIs are reloaded
+        self._is_subscribed = connected
+        self.invalidate()
+
+    def _needs_reload(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        return not self._is_subscribed and time.time() - self._loaded_at > self.max_age
+
+    def _load(self) -> None:
+        points_of_interest: List[Dict[str, Any]] = (
+            self.api.get_points_of_interest_by_site(site_id=self.site_id)
+        )
+        self._point_of_interest_ids = {}
+        self._customer_tags = {}
+        for point_of_interest in points_of_interest:
+            if point_of_interest["customerTag"] is not None:
+                self._add(point_of_interest["customerTag"], point_of_interest["id"])
+        self._loaded_at = time.time()
+        self.logger.info(
+            f"Loaded {len(self._point_of_interest_ids)} POIs for site {self.site_id}"
+        )
+
+    def _add(self, customer_tag: str, point_of_interest_id: str) -> None:
+        replaced_id: Optional[str] = self._point_of_interest_ids.get(customer_tag)
+        if replaced_id is not None:
+            self._customer_tags.pop(replaced_id, None)
+        self._point_of_interest_ids[customer_tag] = point_of_interest_id
+        self._customer_tags[point_of_interest_id] = customer_tag
+
+    def _remove(self, point_of_interest_id: str) -> None:
+        customer_tag: Optional[str] = self._customer_tags.pop(
+            point_of_interest_id, None
+        )
+        if customer_tag is not None:
+            del self._point_of_interest_ids[customer_tag]
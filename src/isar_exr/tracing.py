@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+from functools import wraps
+from logging import Logger, getLogger
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar, cast
+
+from isar_exr.config.settings import settings
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+class NoOpSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+class Tracer:
+    """
+    Tracing spans around the phases of a mission upload and every request to the
+    Energy Robotics API.
+
+    Spans are created with the OpenTelemetry API when tracing is enabled, and are
+    exported by whichever tracer provider the process has been set up with, e.g.
+    by 'opentelemetry-instrument'. When tracing is disabled, or the OpenTelemetry
+    API is not installed, nothing is recorded and the overhead is a function call.
+    """
+
+    def __init__(self, enabled: bool = settings.TRACING_ENABLED) -> None:
+        self.logger: Logger = getLogger("tracing")
+        self._tracer: Optional[Any] = None
+        self.configure(enabled)
+
+    def configure(self, enabled: bool, tracer_provider: Optional[Any] = None) -> None:
+        """
+        :param tracer_provider: The OpenTelemetry tracer provider to create spans
+            with, the global one if None
+        """
+        if not enabled:
+            self._tracer = None
+            return
+        if trace is None:
+            self.logger.warning(
+                "Tracing is enabled but opentelemetry-api is not installed"
+            )
+            self._tracer = None
+            return
+        self._tracer = trace.get_tracer("isar_exr", tracer_provider=tracer_provider)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[Any] = None,
+    ) -> Iterator[Any]:
+        """
+        :param parent: Context from 'get_context' to start the span in, for spans
+            started on another thread than their parent, e.g. the event loop
+        """
+        if self._tracer is None:
+            yield NoOpSpan()
+            return
+        with self._tracer.start_as_current_span(
+            name, context=parent, attributes=attributes
+        ) as span:
+            yield span
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Function], Function]:
+        """
+        Decorates a function to run in a span, named after the function by default.
+        """
+
+        def decorate(function: Function) -> Function:
+            span_name: str = name if name is not None else function.__qualname__
+
+            @wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self._tracer is None:
+                    return function(*args, **kwargs)
+                with self._tracer.start_as_current_span(span_name):
+                    return function(*args, **kwargs)
+
+            return cast(Function, wrapper)
+
+        return decorate
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """
+        Adds attributes to the current span, e.g. counts only known at its end.
+        """
+        if self._tracer is None:
+            return
+        trace.get_current_span().set_attributes(attributes)
+
+    def get_context(self) -> Optional[Any]:
+        if self._tracer is None:
+            return None
+        return otel_context.get_current()
+
+
+tracer: Tracer = Tracer()
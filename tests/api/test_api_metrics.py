@@ -0,0 +1,72 @@
+from typing import Dict
+
+from isar_exr.api.api_metrics import ApiMetrics, OperationStats
+from isar_exr.api.circuit_breaker import CircuitOpenException, CircuitState
+
+
+class TestApiMetrics:
+    def test_requests_are_counted_per_operation(self) -> None:
+        metrics: ApiMetrics = ApiMetrics()
+
+        metrics.record_request("RobotStatus", latency=0.07, request_bytes=100)
+        metrics.record_request(
+            "RobotStatus", latency=3, request_bytes=100, error=TimeoutError()
+        )
+        metrics.record_rejected(
+            "RobotStatus", CircuitOpenException("RobotStatus", retry_in=1)
+        )
+        metrics.record_reauthentication("RobotStatus")
+        metrics.record_request("IsMissionRunning", latency=0.01, request_bytes=50)
+
+        snapshot: Dict[str, OperationStats] = metrics.get_snapshot()
+        robot_status: OperationStats = snapshot["RobotStatus"]
+        assert robot_status.requests == 2
+        assert robot_status.latency_buckets == [0, 1, 0, 0, 0, 0, 1, 0, 0, 0]
+        assert robot_status.latency_sum == 3.07
+        assert robot_status.request_bytes == 200
+        assert robot_status.reauthentications == 1
+        assert robot_status.errors == {"TimeoutError": 1, "CircuitOpenException": 1}
+        assert snapshot["IsMissionRunning"].requests == 1
+
+    def test_snapshot_is_not_changed_by_later_requests(self) -> None:
+        metrics: ApiMetrics = ApiMetrics()
+        metrics.record_request("RobotStatus", latency=0.1, request_bytes=100)
+
+        snapshot: Dict[str, OperationStats] = metrics.get_snapshot()
+        metrics.record_request("RobotStatus", latency=0.1, request_bytes=100)
+
+        assert snapshot["RobotStatus"].requests == 1
+
+    def test_prometheus_text_has_cumulative_buckets(self) -> None:
+        metrics: ApiMetrics = ApiMetrics()
+        metrics.record_request("RobotStatus", latency=0.07, request_bytes=100)
+        metrics.record_request(
+            "RobotStatus", latency=60, request_bytes=100, error=TimeoutError()
+        )
+
+        text: str = metrics.to_prometheus_text(
+            circuit_states={"RobotStatus": CircuitState.Open}
+        )
+
+        lines = text.splitlines()
+        assert (
+            'isar_exr_api_request_duration_seconds_bucket{operation="RobotStatus",'
+            'le="0.05"} 0' in lines
+        )
+        assert (
+            'isar_exr_api_request_duration_seconds_bucket{operation="RobotStatus",'
+            'le="0.1"} 1' in lines
+        )
+        assert (
+            'isar_exr_api_request_duration_seconds_bucket{operation="RobotStatus",'
+            'le="+Inf"} 2' in lines
+        )
+        assert (
+            'isar_exr_api_request_duration_seconds_count{operation="RobotStatus"} 2'
+            in lines
+        )
+        assert (
+            'isar_exr_api_errors_total{operation="RobotStatus",error="TimeoutError"} 1'
+            in lines
+        )
+        assert 'isar_exr_api_circuit_open{operation="RobotStatus"} 1' in lines
@@ -0,0 +1,85 @@
+import base64
+import json
+import time
+from threading import Event, Thread
+from typing import List
+from unittest.mock import Mock
+
+from isar_exr.api.authentication import TokenManager, get_token_expiry
+
+
+def create_token(expires_at: float) -> str:
+    payload: bytes = base64.urlsafe_b64encode(json.dumps({"exp": expires_at}).encode())
+    return f"header.{payload.decode().rstrip('=')}.signature"
+
+
+def test_token_expiry_is_read_from_jwt() -> None:
+    assert get_token_expiry(create_token(1700000000)) == 1700000000
+
+
+def test_token_without_expiry_returns_none() -> None:
+    assert get_token_expiry("test_token") is None
+
+
+def test_listeners_receive_refreshed_token() -> None:
+    received_tokens: List[str] = []
+    token_manager: TokenManager = TokenManager(
+        fetch_token=Mock(side_effect=["first", "second"])
+    )
+    token_manager.add_listener(received_tokens.append)
+
+    assert token_manager.token == "first"
+    token_manager.refresh()
+
+    assert received_tokens == ["first", "second"]
+
+
+def test_rejected_token_is_only_replaced_once() -> None:
+    fetch_token: Mock = Mock(side_effect=["first", "second", "third"])
+    token_manager: TokenManager = TokenManager(fetch_token=fetch_token)
+    rejected_token: str = token_manager.token
+
+    token_manager.refresh(rejected_token=rejected_token)
+    token_manager.refresh(rejected_token=rejected_token)
+
+    assert token_manager.token == "second"
+    assert fetch_token.call_count == 2
+
+
+def test_first_token_is_fetched_once_by_concurrent_threads() -> None:
+    def slow_fetch() -> str:
+        time.sleep(0.1)
+        return "first"
+
+    fetch_token: Mock = Mock(side_effect=slow_fetch)
+    token_manager: TokenManager = TokenManager(fetch_token=fetch_token)
+    tokens: List[str] = []
+    threads: List[Thread] = [
+        Thread(target=lambda: tokens.append(token_manager.token)) for _ in range(5)
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["first"] * 5
+    fetch_token.assert_called_once()
+
+
+def test_token_is_refreshed_in_background_before_expiry() -> None:
+    refreshed: Event = Event()
+    fetch_token: Mock = Mock(
+        side_effect=[create_token(time.time() + 10.5), create_token(time.time() + 3600)]
+    )
+    token_manager: TokenManager = TokenManager(
+        fetch_token=fetch_token, refresh_margin=10
+    )
+    token_manager.retry_delay = 0.1
+    token_manager.add_listener(lambda token: refreshed.set())
+    token_manager.refresh()
+    refreshed.clear()
+
+    assert refreshed.wait(timeout=5)
+    assert fetch_token.call_count == 2
+    token_manager.stop()
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+from unittest.mock import Mock
+
+import pytest
+from gql.client import AsyncClientSession
+from gql.transport.exceptions import TransportServerError
+from graphql import DocumentNode
+
+from isar_exr.api.cassette import (
+    CassetteEntry,
+    CassetteMissException,
+    CassettePlayer,
+    CassetteRecorder,
+)
+from isar_exr.api.graphql_client import GraphqlClient
+from isar_exr.api.operations import operation_registry
+from isar_exr.config.settings import settings
+
+request_delay: float = 0.2
+
+
+async def delayed_response(document, variable_values) -> Dict[str, Any]:
+    await asyncio.sleep(request_delay)
+    return {"isMissionRunning": variable_values["robotID"] == "busy_robot"}
+
+
+def get_entry(variables: Dict[str, Any], response: Dict[str, Any]) -> CassetteEntry:
+    return CassetteEntry(
+        operation_name="IsMissionRunning",
+        variables=variables,
+        response=response,
+        started_at=0,
+        latency=0,
+    )
+
+
+def play(player: CassettePlayer, variables: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(player.play("IsMissionRunning", variables))
+
+
+def test_recorded_traffic_is_replayed_without_the_api(tmp_path: Path) -> None:
+    path: Path = tmp_path.joinpath("cassette.jsonl.gz")
+    document: DocumentNode = operation_registry.get("IsMissionRunning")
+    with mock.patch.object(settings, "ROBOT_API_CASSETTE_PATH", path):
+        with mock.patch.object(
+            settings, "ROBOT_API_CASSETTE_MODE", "record"
+        ), mock.patch(
+            "isar_exr.api.graphql_client.get_access_token",
+            Mock(return_value="test_token"),
+        ), mock.patch.object(
+            AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+        ):
+            client: GraphqlClient = GraphqlClient()
+            client.query(document, {"robotID": "busy_robot"})
+            client.query(document, {"robotID": "idle_robot"})
+
+        with mock.patch.object(
+            settings, "ROBOT_API_CASSETTE_MODE", "replay"
+        ), mock.patch.object(
+            settings, "ROBOT_API_CASSETTE_TIME_SCALE", 0.5
+        ), mock.patch(
+            "isar_exr.api.graphql_client.get_access_token",
+            Mock(side_effect=AssertionError("The API must not be reached")),
+        ):
+            client = GraphqlClient()
+            start: float = time.perf_counter()
+            responses: List[Dict[str, Any]] = [
+                client.query(document, {"robotID": "idle_robot"}),
+                client.query(document, {"robotID": "busy_robot"}),
+            ]
+            elapsed: float = time.perf_counter() - start
+
+    assert responses == [{"isMissionRunning": False}, {"isMissionRunning": True}]
+    assert request_delay * 0.5 * 2 <= elapsed < request_delay * 2
+
+
+def test_closing_the_client_completes_the_recording(tmp_path: Path) -> None:
+    path: Path = tmp_path.joinpath("cassette.jsonl.gz")
+    document: DocumentNode = operation_registry.get("IsMissionRunning")
+    with mock.patch.object(
+        settings, "ROBOT_API_CASSETTE_PATH", path
+    ), mock.patch.object(settings, "ROBOT_API_CASSETTE_MODE", "record"), mock.patch(
+        "isar_exr.api.graphql_client.get_access_token",
+        Mock(return_value="test_token"),
+    ), mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    ):
+        client: GraphqlClient = GraphqlClient()
+        client.query(document, {"robotID": "busy_robot"})
+        client.close()
+
+    # The gzip stream is ended, so reading it to the end raises no EOFError
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        assert len(file.read().splitlines()) == 1
+
+
+def test_replayed_errors_keep_their_class() -> None:
+    player: CassettePlayer = CassettePlayer(
+        [
+            CassetteEntry(
+                operation_name="IsMissionRunning",
+                variables={},
+                error={
+                    "error_class": "TransportServerError",
+                    "message": "Service unavailable",
+                    "code": 503,
+                },
+                started_at=0,
+                latency=0,
+            )
+        ]
+    )
+
+    with pytest.raises(TransportServerError) as error:
+        play(player, {})
+    assert error.value.code == 503
+
+
+def test_unmatched_variables_take_the_next_entry_of_the_operation() -> None:
+    player: CassettePlayer = CassettePlayer(
+        [
+            get_entry({"robotID": "first"}, {"isMissionRunning": False}),
+            get_entry({"robotID": "second"}, {"isMissionRunning": True}),
+        ]
+    )
+
+    assert play(player, {"robotID": "second"}) == {"isMissionRunning": True}
+    assert play(player, {"robotID": "unknown"}) == {"isMissionRunning": False}
+
+
+def test_last_entry_is_repeated_once_used_up() -> None:
+    player: CassettePlayer = CassettePlayer(
+        [get_entry({"robotID": "robot"}, {"isMissionRunning": True})]
+    )
+
+    for _ in range(3):
+        assert play(player, {"robotID": "robot"}) == {"isMissionRunning": True}
+    assert player.played == {"IsMissionRunning": 3}
+
+
+def test_unrecorded_operation_raises() -> None:
+    player: CassettePlayer = CassettePlayer([])
+
+    with pytest.raises(CassetteMissException):
+        play(player, {"robotID": "robot"})
+    assert player.misses == 1
+
+
+def test_recorder_writes_one_line_per_request(tmp_path: Path) -> None:
+    path: Path = tmp_path.joinpath("cassette.jsonl")
+    recorder: CassetteRecorder = CassetteRecorder(path)
+    recorder.record("IsMissionRunning", {"robotID": "robot"}, 0.1, response={})
+    recorder.record(
+        "IsMissionRunning",
+        {"robotID": "robot"},
+        0.2,
+        error=TransportServerError("Service unavailable", code=503),
+    )
+    recorder.close()
+
+    lines: List[str] = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert CassetteEntry.model_validate_json(lines[1]).error.code == 503
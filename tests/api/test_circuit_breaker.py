@@ -0,0 +1,81 @@
+from unittest import mock
+
+import pytest
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+from httpx import ConnectError
+
+from isar_exr.api.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenException,
+    CircuitState,
+)
+
+
+def create_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        "RobotStatus", failure_threshold=2, initial_backoff=10, max_backoff=40
+    )
+
+
+@mock.patch("isar_exr.api.circuit_breaker.monotonic", mock.Mock(return_value=100))
+class TestCircuitBreaker:
+    def test_circuit_opens_after_failures_in_a_row(self) -> None:
+        breaker: CircuitBreaker = create_breaker()
+
+        breaker.record(ConnectError("refused"))
+        breaker.before_request()
+        breaker.record(TransportServerError("Bad gateway", code=502))
+
+        assert breaker.state == CircuitState.Open
+        with pytest.raises(CircuitOpenException):
+            breaker.before_request()
+
+    def test_rejected_requests_do_not_open_the_circuit(self) -> None:
+        breaker: CircuitBreaker = create_breaker()
+
+        for _ in range(3):
+            breaker.record(TransportQueryError("Invalid"))
+            breaker.record(TransportServerError("Unauthorized", code=401))
+
+        assert breaker.state == CircuitState.Closed
+
+    def test_success_resets_the_failure_count(self) -> None:
+        breaker: CircuitBreaker = create_breaker()
+
+        breaker.record(TimeoutError())
+        breaker.record(None)
+        breaker.record(TimeoutError())
+
+        assert breaker.state == CircuitState.Closed
+
+    def test_single_probe_is_let_through_after_backoff(self) -> None:
+        breaker: CircuitBreaker = create_breaker()
+        breaker.record(TimeoutError())
+        breaker.record(TimeoutError())
+
+        with mock.patch("isar_exr.api.circuit_breaker.monotonic", return_value=111):
+            breaker.before_request()
+            assert breaker.state == CircuitState.HalfOpen
+            with pytest.raises(CircuitOpenException):
+                breaker.before_request()
+
+            breaker.record(None)
+            assert breaker.state == CircuitState.Closed
+            breaker.before_request()
+
+    def test_backoff_doubles_when_probe_fails(self) -> None:
+        breaker: CircuitBreaker = create_breaker()
+        breaker.record(TimeoutError())
+        breaker.record(TimeoutError())
+
+        with mock.patch("isar_exr.api.circuit_breaker.monotonic", return_value=111):
+            breaker.before_request()
+            breaker.record(TimeoutError())
+
+        assert breaker.state == CircuitState.Open
+        # Jittered between half and all of the doubled backoff of 20 s
+        with mock.patch("isar_exr.api.circuit_breaker.monotonic", return_value=120):
+            with pytest.raises(CircuitOpenException):
+                breaker.before_request()
+        with mock.patch("isar_exr.api.circuit_breaker.monotonic", return_value=131):
+            breaker.before_request()
@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from typing import Any, Dict
 from unittest import mock
 from unittest.mock import Mock
@@ -5,8 +6,13 @@ from unittest.mock import Mock
 import pytest
 from gql import Client
 from robot_interface.models.exceptions.robot_exceptions import RobotException
+from robot_interface.models.mission.status import MissionStatus
 
-from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
+from isar_exr.api.energy_robotics_api import (
+    EnergyRoboticsApi,
+    dock_robot_task_definition,
+    point_of_interest_inspection_task_definition,
+)
 from isar_exr.api.graphql_client import GraphqlClient
 from isar_exr.api.models.enums import AwakeStatus
 from isar_exr.api.models.models import (
@@ -21,6 +27,7 @@ from isar_exr.api.models.models import (
     UpsertPointOfInterestInput,
 )
 from isar_exr.config.settings import settings
+from isar_exr.models.step_status import ExrStepStatus
 
 
 @mock.patch(
@@ -620,3 +627,264 @@ class TestAddRemoveTaskToFromMissionDefinition:
                 task_id=self.task_id,
                 mission_definition_id=self.mission_definition_id,
             )
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestBatchedStatusQueries:
+    running_mission_response: Dict[str, Any] = {
+        "RobotIsConnected": {"isConnected": True},
+        "IsMissionRunning": True,
+        "CurrentMissionExecutionStatus": {"status": "IN_PROGRESS"},
+    }
+    no_mission_response: Dict[str, Any] = {
+        "RobotIsConnected": {"isConnected": False},
+        "IsMissionRunning": False,
+        "CurrentMissionExecutionStatus": None,
+    }
+    current_task_response: Dict[str, Any] = {
+        "IsMissionRunning": True,
+        "CurrentMissionExecutionStatusAndTask": {
+            "status": "IN_PROGRESS",
+            "currentExecutedTaskId": "task_id",
+        },
+    }
+
+    @mock.patch.object(
+        GraphqlClient, "query", Mock(return_value=running_mission_response)
+    )
+    def test_connection_and_mission_status_is_one_request(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        is_connected, mission_status = api.get_connection_and_mission_status(
+            "test_exr_robot_id"
+        )
+
+        assert is_connected
+        assert mission_status == MissionStatus.InProgress
+        GraphqlClient.query.assert_called_once()
+
+    @mock.patch.object(GraphqlClient, "query", Mock(return_value=no_mission_response))
+    def test_connection_and_mission_status_without_mission(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        assert api.get_connection_and_mission_status("test_exr_robot_id") == (
+            False,
+            None,
+        )
+
+    @mock.patch.object(GraphqlClient, "query", Mock(return_value=current_task_response))
+    def test_mission_status_and_current_task_is_one_request(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        step_status, current_task_id = api.get_mission_status_and_current_task(
+            "test_exr_robot_id"
+        )
+
+        assert step_status == ExrStepStatus.InProgress
+        assert current_task_id == "task_id"
+        GraphqlClient.query.assert_called_once()
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestWaitForPipelineCompletion:
+    @staticmethod
+    def pipeline_response(state: str) -> Dict[str, Any]:
+        return {
+            "currentSiteSnapshotHeadSelectionProcessingPipeline": {
+                "stages": [{"state": state}]
+            }
+        }
+
+    @mock.patch.object(settings, "PIPELINE_POLL_INITIAL_INTERVAL", 0.01)
+    def test_polls_with_backoff_until_completed(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        with mock.patch.object(
+            GraphqlClient,
+            "query",
+            Mock(
+                side_effect=[
+                    self.pipeline_response("ACTIVE"),
+                    self.pipeline_response("ACTIVE"),
+                    self.pipeline_response("COMPLETED"),
+                ]
+            ),
+        ):
+            api.wait_for_pipeline_completion(site_id="site_id")
+            assert GraphqlClient.query.call_count == 3
+
+    @mock.patch.object(settings, "PIPELINE_POLL_INITIAL_INTERVAL", 0.01)
+    def test_raises_when_pipeline_does_not_complete(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        with mock.patch.object(
+            GraphqlClient, "query", Mock(return_value=self.pipeline_response("ACTIVE"))
+        ):
+            with pytest.raises(expected_exception=RobotException):
+                api.wait_for_pipeline_completion(site_id="site_id", timeout=0.05)
+
+    @mock.patch.object(settings, "ROBOT_API_SUBSCRIPTIONS_ENABLED", True)
+    def test_returns_when_completion_is_pushed(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        pushed_completion: Future = Future()
+        pushed_completion.set_result({})
+        api.client.subscriptions.wait_for = Mock(return_value=pushed_completion)
+
+        with mock.patch.object(
+            GraphqlClient, "query", Mock(return_value=self.pipeline_response("ACTIVE"))
+        ):
+            api.wait_for_pipeline_completion(site_id="site_id", timeout=10)
+            GraphqlClient.query.assert_called_once()
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestBulkPointOfInterestUpload:
+    @mock.patch.object(settings, "ROBOT_API_MAX_BATCH_SIZE", 2)
+    def test_points_of_interest_are_created_in_batches(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        pose: Pose3DInput = Pose3DInput(
+            position=Point3DInput(x=0, y=0, z=0),
+            orientation=QuaternionInput(x=0, y=0, z=0, w=1),
+        )
+        point_of_interest_input: AddPointOfInterestInput = AddPointOfInterestInput(
+            name="mock_name",
+            site="mock_site",
+            frame="mock_frame",
+            type=PointOfInterestTypeEnum.GENERIC,
+            pose=pose,
+            photoAction=PointOfInterestActionPhotoInput(
+                robotPose=pose, sensor="mock_sensor"
+            ),
+        )
+        batch_responses = [
+            {
+                "AddPointOfInterest_0": {"id": "poi_0"},
+                "AddPointOfInterest_1": {"id": "poi_1"},
+            },
+            {"AddPointOfInterest_0": {"id": "poi_2"}},
+        ]
+
+        with mock.patch.object(
+            GraphqlClient, "query_concurrently", Mock(return_value=batch_responses)
+        ):
+            poi_ids = api.create_points_of_interest([point_of_interest_input] * 3)
+            (queries,) = GraphqlClient.query_concurrently.call_args.args
+
+        assert poi_ids == ["poi_0", "poi_1", "poi_2"]
+        assert len(queries) == 2
+        assert set(queries[0][1].keys()) == {
+            "AddPointOfInterestInput_0",
+            "AddPointOfInterestInput_1",
+        }
+
+    @mock.patch.object(
+        GraphqlClient,
+        "query",
+        Mock(return_value={"addPointsOfInterestToStage": {"id": "stage_id"}}),
+    )
+    def test_points_of_interest_are_added_to_stage_in_one_request(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        stage_id: str = api.add_points_of_interest_to_stage(
+            POI_ids=["poi_0", "poi_1"], stage_id="stage_id"
+        )
+
+        assert stage_id == "stage_id"
+        GraphqlClient.query.assert_called_once()
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestGetPointOfInterestByCustomerTag:
+    @mock.patch.object(
+        GraphqlClient,
+        "query",
+        Mock(return_value={"pointOfInterestByCustomerTag": None}),
+    )
+    def test_returns_none_if_not_found(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        assert api.get_point_of_interest_by_customer_tag("tag", "site_id") is None
+
+    @mock.patch.object(GraphqlClient, "query", Mock(side_effect=TimeoutError))
+    def test_errors_are_not_reported_as_missing_point_of_interest(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        with pytest.raises(expected_exception=RobotException):
+            api.get_point_of_interest_by_customer_tag("tag", "site_id")
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestCreateTaskDefinitions:
+    def test_task_definitions_of_different_types_are_returned_in_order(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        batch_responses = [
+            {
+                "CreatePoiInspectionTaskDefinition_0": {"id": "poi_task_0"},
+                "CreatePoiInspectionTaskDefinition_1": {"id": "poi_task_1"},
+            },
+            {"CreateDockRobotTaskDefinition_0": {"id": "dock_task"}},
+        ]
+
+        with mock.patch.object(
+            GraphqlClient, "query_concurrently", Mock(return_value=batch_responses)
+        ):
+            task_ids = api.create_task_definitions(
+                [
+                    point_of_interest_inspection_task_definition(
+                        "site_id", "task_0", "poi_0"
+                    ),
+                    dock_robot_task_definition("site_id", "dock", "station_id"),
+                    point_of_interest_inspection_task_definition(
+                        "site_id", "task_1", "poi_1"
+                    ),
+                ]
+            )
+            (queries,) = GraphqlClient.query_concurrently.call_args.args
+
+        assert task_ids == ["poi_task_0", "dock_task", "poi_task_1"]
+        assert len(queries) == 2
+
+    @mock.patch.object(settings, "ROBOT_API_MAX_BATCH_SIZE", 2)
+    @mock.patch.object(GraphqlClient, "query", Mock(return_value={}))
+    def test_tasks_are_added_to_mission_definition_in_batches(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        api.add_tasks_to_mission_definition(
+            task_ids=["task_0", "task_1", "task_2"],
+            mission_definition_id="mission_definition_id",
+        )
+
+        assert GraphqlClient.query.call_count == 2
+        first_variables: Dict[str, Any] = GraphqlClient.query.call_args_list[0].args[1]
+        assert first_variables["missionTaskDefinitionId_1"] == "task_1"
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestGetRobotState:
+    @mock.patch.object(
+        GraphqlClient,
+        "query",
+        Mock(
+            return_value={
+                "RobotStatus": {"isConnected": True},
+                "IsMissionRunning": False,
+                "CurrentMissionExecutionStatusAndTask": None,
+            }
+        ),
+    )
+    def test_robot_state_is_one_request(self) -> None:
+        api: EnergyRoboticsApi = EnergyRoboticsApi()
+        robot_status, mission_execution = api.get_robot_state("test_exr_robot_id")
+
+        assert robot_status == {"isConnected": True}
+        assert mission_execution is None
+        GraphqlClient.query.assert_called_once()
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from threading import Thread
+from typing import Any, Dict, List
+from unittest import mock
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from gql.client import AsyncClientSession
+from gql.transport.exceptions import TransportServerError
+from graphql import DocumentNode
+from httpx import ConnectError
+
+from isar_exr.api.api_metrics import OperationStats
+from isar_exr.api.circuit_breaker import CircuitOpenException, CircuitState
+from isar_exr.api.graphql_client import GraphqlClient
+from isar_exr.api.operations import operation_registry
+from isar_exr.config.settings import settings
+
+request_delay: float = 0.2
+
+
+async def delayed_response(document, variable_values) -> Dict[str, Any]:
+    await asyncio.sleep(request_delay)
+    return {"isMissionRunning": variable_values["robotID"]}
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+class TestAsyncGraphqlClient:
+    @mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    )
+    def test_query_returns_response(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        response: Dict[str, Any] = client.query(Mock(), {"robotID": "robot"})
+        assert response == {"isMissionRunning": "robot"}
+
+    @mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    )
+    def test_independent_queries_run_concurrently(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        queries: List = [(Mock(), {"robotID": str(i)}) for i in range(5)]
+
+        start: float = time.perf_counter()
+        responses: List[Dict[str, Any]] = client.query_concurrently(queries)
+        elapsed: float = time.perf_counter() - start
+
+        assert [response["isMissionRunning"] for response in responses] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        assert elapsed < 3 * request_delay
+
+    @mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    )
+    def test_queries_from_several_threads_do_not_queue(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        threads: List[Thread] = [
+            Thread(target=client.query, args=[Mock(), {"robotID": str(i)}])
+            for i in range(5)
+        ]
+
+        start: float = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed: float = time.perf_counter() - start
+
+        assert elapsed < 3 * request_delay
+
+    def test_query_is_retried_with_new_token_on_unauthorized(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        responses: List = [
+            TransportServerError("Unauthorized", code=401),
+            {"isMissionRunning": True},
+        ]
+        fetch_token: Mock = Mock(return_value="new_token")
+        client.token_manager._fetch_token = fetch_token
+        with mock.patch.object(
+            AsyncClientSession, "execute", AsyncMock(side_effect=responses)
+        ):
+            response: Dict[str, Any] = client.query(Mock(), {"robotID": "robot"})
+
+        assert response == {"isMissionRunning": True}
+        fetch_token.assert_called_once()
+        assert (
+            client.session.transport.client.headers["authorization"]
+            == "Bearer new_token"
+        )
+
+    def test_concurrent_queries_rejected_together_are_each_retried_once(
+        self,
+    ) -> None:
+        client: GraphqlClient = GraphqlClient()
+        fetch_token: Mock = Mock(return_value="new_token")
+        client.token_manager._fetch_token = fetch_token
+
+        async def reject_old_token(document, variable_values) -> Dict[str, Any]:
+            headers = client.session.transport.client.headers
+            if headers["authorization"] == "Bearer test_token":
+                await asyncio.sleep(request_delay)
+                raise TransportServerError("Unauthorized", code=401)
+            return {"isMissionRunning": variable_values["robotID"]}
+
+        responses: List[Dict[str, Any]] = []
+        threads: List[Thread] = [
+            Thread(
+                target=lambda robot_id: responses.append(
+                    client.query(Mock(), {"robotID": robot_id})
+                ),
+                args=[str(i)],
+            )
+            for i in range(5)
+        ]
+        with mock.patch.object(
+            AsyncClientSession, "execute", Mock(side_effect=reject_old_token)
+        ):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(response["isMissionRunning"] for response in responses) == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        fetch_token.assert_called_once()
+
+    def test_query_raises_if_unauthorized_after_reauthentication(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        with mock.patch.object(
+            AsyncClientSession,
+            "execute",
+            AsyncMock(side_effect=TransportServerError("Unauthorized", code=401)),
+        ):
+            with pytest.raises(TransportServerError):
+                client.query(Mock(), {"robotID": "robot"})
+
+    @mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    )
+    def test_identical_queries_from_several_threads_share_one_request(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        document: DocumentNode = operation_registry.get("IsMissionRunning")
+        responses: List[Dict[str, Any]] = []
+        threads: List[Thread] = [
+            Thread(
+                target=lambda: responses.append(
+                    client.query(document, {"robotID": "robot"})
+                )
+            )
+            for _ in range(5)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert AsyncClientSession.execute.call_count == 1
+        assert responses == [{"isMissionRunning": "robot"}] * 5
+
+    def test_operation_fails_fast_once_its_circuit_is_open(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        client: GraphqlClient = GraphqlClient()
+        document: DocumentNode = operation_registry.get("IsMissionRunning")
+        execute: AsyncMock = AsyncMock(side_effect=ConnectError("refused"))
+
+        with mock.patch.object(AsyncClientSession, "execute", execute):
+            for _ in range(settings.ROBOT_API_CIRCUIT_FAILURE_THRESHOLD):
+                with pytest.raises(ConnectError):
+                    client.query(document, {"robotID": "robot"})
+            caplog.clear()
+            with pytest.raises(CircuitOpenException):
+                client.query(document, {"robotID": "robot"})
+
+        # Failing fast is expected while the API is unavailable, not an error
+        assert [record.levelname for record in caplog.records] == ["WARNING"]
+
+        assert execute.call_count == settings.ROBOT_API_CIRCUIT_FAILURE_THRESHOLD
+        assert client.circuit_breakers.get_states() == {
+            "IsMissionRunning": CircuitState.Open
+        }
+
+    @mock.patch.object(
+        AsyncClientSession, "execute", Mock(side_effect=delayed_response)
+    )
+    def test_requests_are_recorded_per_operation(self) -> None:
+        client: GraphqlClient = GraphqlClient()
+        document: DocumentNode = operation_registry.get("IsMissionRunning")
+
+        client.query(document, {"robotID": "robot"})
+        client.query(Mock(), {"robotID": "robot"})
+
+        snapshot: Dict[str, OperationStats] = client.metrics.get_snapshot()
+        assert snapshot["IsMissionRunning"].requests == 1
+        assert snapshot["IsMissionRunning"].latency_sum >= request_delay
+        assert snapshot["IsMissionRunning"].request_bytes > 0
+        assert snapshot["unregistered"].requests == 1
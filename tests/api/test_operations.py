@@ -0,0 +1,67 @@
+from unittest import mock
+from unittest.mock import Mock
+
+import pytest
+from gql.dsl import DSLQuery, DSLSchema, DSLVariableDefinitions
+from graphql import DocumentNode, GraphQLError
+
+from isar_exr.api.async_graphql_session import (
+    TrustedDocumentsClient,
+    TrustedDocumentsTransport,
+)
+from isar_exr.api.operations import OperationRegistry, _operation_builders
+from isar_exr.api.schema_cache import schema_cache
+
+
+def test_documents_are_built_once_and_trusted() -> None:
+    operations: OperationRegistry = OperationRegistry()
+    document: DocumentNode = operations.get("IsMissionRunning")
+
+    assert operations.get("IsMissionRunning") is document
+    assert operations.is_trusted(document)
+    assert operations.get_query_string(document).startswith(
+        "query IsMissionRunning($robotID: String!)"
+    )
+
+
+@pytest.mark.parametrize("name", sorted(_operation_builders))
+def test_every_operation_is_valid_against_the_vendored_schema(name: str) -> None:
+    operations: OperationRegistry = OperationRegistry()
+    # Building validates the document, which fails on fields the API does not have
+    assert operations.is_trusted(operations.get(name))
+
+
+def test_invalid_documents_are_rejected_when_registered() -> None:
+    operations: OperationRegistry = OperationRegistry()
+    schema: DSLSchema = schema_cache.get_dsl_schema()
+    variable_definitions_graphql: DSLVariableDefinitions = DSLVariableDefinitions()
+    query: DSLQuery = DSLQuery(
+        schema.Query.isMissionRunning.args(robotID=variable_definitions_graphql.robotID)
+    )
+    # The variable definitions are missing, so '$robotID' is undefined
+    with pytest.raises(GraphQLError):
+        operations.register("Invalid", query)
+
+
+def test_client_skips_validation_and_printing_of_trusted_documents() -> None:
+    operations: OperationRegistry = OperationRegistry()
+    document: DocumentNode = operations.get("IsMissionRunning")
+    transport: TrustedDocumentsTransport = TrustedDocumentsTransport(
+        operations=operations, url="http://localhost"
+    )
+    client: TrustedDocumentsClient = TrustedDocumentsClient(
+        operations=operations, transport=transport, schema=schema_cache.get_schema()
+    )
+
+    with mock.patch("gql.client.validate", Mock(return_value=[])) as validate:
+        client.validate(document)
+        validate.assert_not_called()
+
+    with mock.patch("gql.transport.httpx.print_ast") as print_ast:
+        post_args = transport._prepare_request(document, {"robotID": "robot"})
+        print_ast.assert_not_called()
+
+    assert post_args["json"] == {
+        "query": operations.get_query_string(document),
+        "variables": {"robotID": "robot"},
+    }
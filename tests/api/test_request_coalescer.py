@@ -0,0 +1,134 @@
+from concurrent.futures import Future
+from typing import Any, Dict, List
+from unittest.mock import Mock
+
+import pytest
+from graphql import DocumentNode
+
+from isar_exr.api.operations import operation_registry
+from isar_exr.api.request_coalescer import RequestCoalescer
+
+is_mission_running: DocumentNode = operation_registry.get("IsMissionRunning")
+
+
+def pending_submit() -> Mock:
+    return Mock(side_effect=lambda document, variables: Future())
+
+
+def resolved_submit(response: Dict[str, Any]) -> Mock:
+    def submit(document, variables) -> Future:
+        future: Future = Future()
+        future.set_result(response)
+        return future
+
+    return Mock(side_effect=submit)
+
+
+class TestRequestCoalescer:
+    def test_identical_queries_in_flight_share_one_request(self) -> None:
+        submit: Mock = pending_submit()
+        coalescer: RequestCoalescer = RequestCoalescer(submit=submit)
+
+        futures: List[Future] = [
+            coalescer.submit(is_mission_running, {"robotID": "robot"}) for _ in range(3)
+        ]
+        futures[0].set_result({"isMissionRunning": True})
+
+        submit.assert_called_once()
+        assert [future.result() for future in futures] == [
+            {"isMissionRunning": True}
+        ] * 3
+
+    def test_queries_with_different_variables_are_sent_separately(self) -> None:
+        submit: Mock = pending_submit()
+        coalescer: RequestCoalescer = RequestCoalescer(submit=submit)
+
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+        coalescer.submit(is_mission_running, {"robotID": "other_robot"})
+
+        assert submit.call_count == 2
+
+    def test_query_is_sent_again_once_completed(self) -> None:
+        submit: Mock = resolved_submit({"isMissionRunning": True})
+        coalescer: RequestCoalescer = RequestCoalescer(submit=submit)
+
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+
+        assert submit.call_count == 2
+
+    def test_failure_is_shared_and_not_cached(self) -> None:
+        submit: Mock = pending_submit()
+        coalescer: RequestCoalescer = RequestCoalescer(
+            submit=submit, cache_ttls={"IsMissionRunning": 60}
+        )
+
+        futures: List[Future] = [
+            coalescer.submit(is_mission_running, {"robotID": "robot"}) for _ in range(2)
+        ]
+        futures[0].set_exception(TimeoutError())
+        for future in futures:
+            with pytest.raises(TimeoutError):
+                future.result()
+
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+        assert submit.call_count == 2
+
+    def test_retry_right_after_a_failure_is_sent_again(self) -> None:
+        futures: List[Future] = []
+        retries: List[Future] = []
+
+        def retry(failed: Future) -> None:
+            if not retries:
+                retries.append(
+                    coalescer.submit(is_mission_running, {"robotID": "robot"})
+                )
+
+        def submit(document, variables) -> Future:
+            future: Future = Future()
+            # Runs before the callback of the coalescer, like a caller woken by the
+            # failure that retries before the callbacks have run
+            future.add_done_callback(retry)
+            futures.append(future)
+            return future
+
+        coalescer: RequestCoalescer = RequestCoalescer(submit=Mock(side_effect=submit))
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+        futures[0].set_exception(TimeoutError())
+
+        assert len(futures) == 2
+        assert retries == [futures[1]]
+        # The completed request does not remove the retry that is in flight
+        assert coalescer.submit(is_mission_running, {"robotID": "robot"}) is futures[1]
+
+    def test_result_is_reused_within_ttl(self) -> None:
+        submit: Mock = resolved_submit({"isMissionRunning": True})
+        coalescer: RequestCoalescer = RequestCoalescer(
+            submit=submit, cache_ttls={"IsMissionRunning": 60}
+        )
+
+        coalescer.submit(is_mission_running, {"robotID": "robot"})
+        future: Future = coalescer.submit(is_mission_running, {"robotID": "robot"})
+
+        submit.assert_called_once()
+        assert future.result() == {"isMissionRunning": True}
+
+    def test_mutations_are_never_coalesced(self) -> None:
+        submit: Mock = pending_submit()
+        coalescer: RequestCoalescer = RequestCoalescer(submit=submit)
+        start_mission: DocumentNode = operation_registry.get("StartMissionExecution")
+
+        coalescer.submit(start_mission, {"robotID": "robot"})
+        coalescer.submit(start_mission, {"robotID": "robot"})
+
+        assert submit.call_count == 2
+
+    def test_untrusted_documents_are_never_coalesced(self) -> None:
+        submit: Mock = pending_submit()
+        coalescer: RequestCoalescer = RequestCoalescer(submit=submit)
+        document: Mock = Mock()
+
+        coalescer.submit(document, {"robotID": "robot"})
+        coalescer.submit(document, {"robotID": "robot"})
+
+        assert submit.call_count == 2
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from graphql import GraphQLSchema
+
+from isar_exr.api.schema_cache import SchemaCache
+from isar_exr.config.settings import settings
+
+
+def test_schema_is_shared_and_cached_on_disk(tmp_path: Path) -> None:
+    cache: SchemaCache = SchemaCache(
+        schema_path=settings.PATH_TO_GRAPHQL_SCHEMA, cache_directory=tmp_path
+    )
+    schema: GraphQLSchema = cache.get_schema()
+
+    assert cache.get_schema() is schema
+    assert cache.get_dsl_schema() is cache.get_dsl_schema()
+    assert len(list(tmp_path.glob("schema-*.json"))) == 1
+
+    reloaded_schema: GraphQLSchema = SchemaCache(
+        schema_path=settings.PATH_TO_GRAPHQL_SCHEMA, cache_directory=tmp_path
+    ).get_schema()
+    assert reloaded_schema.query_type.fields.keys() == schema.query_type.fields.keys()
+    assert "Pose3DStampedInput" in reloaded_schema.type_map
+
+
+def test_artefact_is_rebuilt_when_schema_file_changes(tmp_path: Path) -> None:
+    schema_path: Path = tmp_path.joinpath("schema.graphql")
+    cache_directory: Path = tmp_path.joinpath("cache")
+    schema_path.write_text(
+        "type Query { isMissionRunning(robotID: String!): Boolean! }"
+    )
+    SchemaCache(schema_path=schema_path, cache_directory=cache_directory).get_schema()
+
+    schema_path.write_text("type Query { currentSiteStage(siteId: String!): String }")
+    schema: GraphQLSchema = SchemaCache(
+        schema_path=schema_path, cache_directory=cache_directory
+    ).get_schema()
+
+    assert list(schema.query_type.fields.keys()) == ["currentSiteStage"]
+    assert len(list(cache_directory.glob("schema-*.json"))) == 1
+
+
+def test_writing_an_artefact_removes_stale_artefacts(tmp_path: Path) -> None:
+    stale_artefact: Path = tmp_path.joinpath("schema-0123456789abcdef.json")
+    stale_artefact.write_text("{}")
+    unrelated_file: Path = tmp_path.joinpath("README")
+    unrelated_file.write_text("")
+    cache: SchemaCache = SchemaCache(
+        schema_path=settings.PATH_TO_GRAPHQL_SCHEMA, cache_directory=tmp_path
+    )
+
+    artefact_path: Path = cache.build_artefact()
+
+    assert list(tmp_path.glob("schema-*.json")) == [artefact_path]
+    assert unrelated_file.is_file()
+
+
+def test_corrupt_artefact_falls_back_to_schema_file(tmp_path: Path) -> None:
+    cache: SchemaCache = SchemaCache(
+        schema_path=settings.PATH_TO_GRAPHQL_SCHEMA, cache_directory=tmp_path
+    )
+    artefact_path: Path = cache.build_artefact()
+    artefact_path.write_text("{not json")
+
+    schema: GraphQLSchema = cache.get_schema()
+
+    assert "isMissionRunning" in schema.query_type.fields
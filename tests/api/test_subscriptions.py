@@ -0,0 +1,63 @@
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict, List
+from unittest import mock
+from unittest.mock import AsyncMock, Mock
+
+from gql.transport.exceptions import TransportClosed
+
+from isar_exr.api.async_graphql_session import TrustedDocumentsClient
+from isar_exr.api.graphql_client import GraphqlClient
+from isar_exr.api.subscriptions import SubscriptionManager
+
+
+class FakeConnection:
+    def __init__(self, updates: List[Dict[str, Any]], drop: bool) -> None:
+        self.updates: List[Dict[str, Any]] = updates
+        self.drop: bool = drop
+
+    async def subscribe(self, document, variable_values) -> AsyncGenerator:
+        for update in self.updates:
+            yield update
+        if self.drop:
+            raise TransportClosed("Connection lost")
+        await asyncio.Event().wait()
+
+
+def wait_for(condition, timeout: float = 2) -> None:
+    deadline: float = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+@mock.patch.object(TrustedDocumentsClient, "close_async", AsyncMock())
+def test_subscriptions_are_resubscribed_after_reconnect() -> None:
+    first_update: Dict[str, Any] = {"onRobotStatus": {"isConnected": True}}
+    second_update: Dict[str, Any] = {"onRobotStatus": {"isConnected": False}}
+    connections: List[FakeConnection] = [
+        FakeConnection([first_update], drop=True),
+        FakeConnection([second_update], drop=False),
+    ]
+
+    client: GraphqlClient = GraphqlClient()
+    subscriptions: SubscriptionManager = client.subscriptions
+    subscriptions.reconnect_delay = 0.01
+    received: List[Dict[str, Any]] = []
+    connection_events: List[bool] = []
+    subscriptions.subscribe("OnRobotStatus", {"robotID": "robot"}, received.append)
+    subscriptions.add_connection_listener(connection_events.append)
+
+    with mock.patch.object(
+        TrustedDocumentsClient, "connect_async", AsyncMock(side_effect=connections)
+    ):
+        subscriptions.start()
+        wait_for(lambda: len(received) == 2)
+        subscriptions.stop()
+
+    assert received == [first_update, second_update]
+    assert connection_events[:3] == [True, False, True]
@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Iterator, List
+from unittest import mock
+
+import pytest
+from alitra import Frame, Orientation, Pose, Position
+from robot_interface.models.exceptions.robot_exceptions import (
+    RobotMissionStatusException,
+)
+from robot_interface.models.mission.mission import Mission
+from robot_interface.models.mission.status import MissionStatus, RobotStatus
+from robot_interface.models.mission.step import DriveToPose, TakeImage
+from robot_interface.models.mission.task import Task
+
+from benchmarks.standin_server import StandInServer
+from isar_exr.config.settings import settings
+from isar_exr.robotinterface import Robot
+from isar_exr.state.mission_definition_cache import MissionDefinitionCache
+
+
+def get_mission(tasks_n: int) -> Mission:
+    return Mission(
+        tasks=[
+            Task(
+                tag_id=f"tag_{i}",
+                steps=[
+                    DriveToPose(
+                        pose=Pose(
+                            position=Position(x=i, y=0, z=0, frame=Frame("asset")),
+                            orientation=Orientation(
+                                x=0, y=0, z=0, w=1, frame=Frame("asset")
+                            ),
+                            frame=Frame("asset"),
+                        )
+                    ),
+                    TakeImage(target=Position(x=i, y=1, z=1, frame=Frame("asset"))),
+                ],
+            )
+            for i in range(tasks_n)
+        ]
+    )
+
+
+def serve(server: StandInServer) -> Iterator[StandInServer]:
+    with server, mock.patch.object(
+        settings, "ROBOT_API_URL", server.url
+    ), mock.patch.object(settings, "ROBOT_AUTH_URL", server.auth_url):
+        yield server
+
+
+@pytest.fixture
+def standin() -> Iterator[StandInServer]:
+    yield from serve(StandInServer(pipeline_duration=0.1, task_duration=60))
+
+
+@pytest.fixture
+def failing_standin() -> Iterator[StandInServer]:
+    yield from serve(StandInServer(error_rate=1))
+
+
+@pytest.fixture
+def robot(tmp_path: Path) -> Robot:
+    robot: Robot = Robot()
+    robot.mission_definition_cache = MissionDefinitionCache(
+        tmp_path.joinpath("mission_definitions.json")
+    )
+    return robot
+
+
+def test_mission_is_uploaded_and_started(standin: StandInServer, robot: Robot) -> None:
+
+    robot.initiate_mission(get_mission(tasks_n=3))
+
+    execution = standin.state.mission_executions[settings.ROBOT_EXR_ID]
+    task_ids: List[str] = [
+        task_id for step_ids in robot.mission_task_ids for task_id in step_ids
+    ]
+    assert execution["taskIds"] == task_ids
+    assert len(standin.state.points_of_interest) == 3
+    assert robot.robot_status() == RobotStatus.Busy
+    assert robot.mission_status() == MissionStatus.InProgress
+
+
+def test_repeated_mission_reuses_site_and_mission_definition(
+    standin: StandInServer, robot: Robot
+) -> None:
+    robot.initiate_mission(get_mission(tasks_n=3))
+    standin.request_counts.clear()
+
+    robot.initiate_mission(get_mission(tasks_n=3))
+
+    assert set(standin.request_counts) == {
+        "MissionDefinitionTasks",
+        "StartMissionExecution",
+    }
+    assert len(standin.state.points_of_interest) == 3
+
+
+def test_injected_errors_reach_the_robot(
+    failing_standin: StandInServer, robot: Robot
+) -> None:
+    # An API that cannot answer reports the robot as offline
+    assert robot.robot_status() == RobotStatus.Offline
+    with pytest.raises(RobotMissionStatusException):
+        robot.mission_status()
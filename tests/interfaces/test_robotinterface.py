@@ -1,11 +1,36 @@
+import json
+from typing import Any, Dict, List
 from unittest import mock
 
 import pytest
-from robot_interface.models.exceptions.robot_exceptions import RobotException
+from alitra import Frame, Orientation, Pose, Position
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+from httpx import ConnectError
+from robot_interface.models.exceptions.robot_exceptions import (
+    RobotCommunicationException,
+    RobotException,
+    RobotStepStatusException,
+)
+from robot_interface.models.mission.status import (
+    MissionStatus,
+    RobotStatus,
+    StepStatus,
+)
+from robot_interface.models.mission.step import (
+    DriveToPose,
+    TakeImage,
+    TakeThermalImage,
+)
+from robot_interface.models.mission.task import Task
 from robot_interface.test_robot_interface import interface_test
 
+from isar_exr.api.api_metrics import ApiMetrics
+from isar_exr.api.circuit_breaker import CircuitOpenException, CircuitState
 from isar_exr.api.energy_robotics_api import EnergyRoboticsApi
 from isar_exr.robotinterface import Robot
+from isar_exr.state.mission_definition_cache import MissionDefinitionCache
+from isar_exr.state.robot_state_store import RobotStateKey
+from isar_exr.state.site_index import SiteIndex
 
 
 @mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
@@ -21,3 +46,299 @@ def test_stop_raises_RobotException_if_pause_fails(MockedGraphqlClient):
     robot: Robot = Robot()
     with pytest.raises(expected_exception=RobotException):
         robot.stop()
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_robot_status_is_read_from_pushed_state(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api.get_connection_and_mission_status = mock.Mock()
+    robot.robot_state.update(RobotStateKey.RobotStatus, {"isConnected": True})
+    robot.robot_state.update(RobotStateKey.MissionExecution, {"status": "IN_PROGRESS"})
+
+    assert robot.robot_status() == RobotStatus.Busy
+    assert robot.mission_status() == MissionStatus.InProgress
+    robot.api.get_connection_and_mission_status.assert_not_called()
+
+    robot.robot_state.clear()
+    robot.api.get_connection_and_mission_status.return_value = (False, None)
+    assert robot.robot_status() == RobotStatus.Offline
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_api_metrics_telemetry_has_stats_per_operation(MockedGraphqlClient):
+    robot: Robot = Robot()
+    metrics: ApiMetrics = ApiMetrics()
+    metrics.record_request("RobotStatus", latency=0.1, request_bytes=100)
+    robot.api.client.metrics = metrics
+    robot.api.client.circuit_breakers.get_states.return_value = {
+        "RobotStatus": CircuitState.Closed
+    }
+
+    telemetry: Dict[str, Any] = json.loads(
+        robot._get_api_metrics_telemetry(isar_id="isar", robot_name="exr")
+    )
+
+    assert telemetry["operations"]["RobotStatus"]["requests"] == 1
+    assert telemetry["circuits"] == {"RobotStatus": "closed"}
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_robot_is_offline_while_api_circuit_is_open(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api.get_connection_and_mission_status = mock.Mock(
+        side_effect=CircuitOpenException("Batch_RobotIsConnected", retry_in=10)
+    )
+
+    assert robot.robot_status() == RobotStatus.Offline
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        TimeoutError("Timed out"),
+        TransportServerError("Service unavailable", code=503),
+        ConnectError("Connection refused"),
+    ],
+)
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_robot_is_offline_while_api_cannot_answer(MockedGraphqlClient, error):
+    robot: Robot = Robot()
+    robot.api.get_connection_and_mission_status = mock.Mock(side_effect=error)
+
+    assert robot.robot_status() == RobotStatus.Offline
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_robot_status_raises_when_api_rejects_the_request(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api.get_connection_and_mission_status = mock.Mock(
+        side_effect=TransportQueryError("Invalid query")
+    )
+
+    with pytest.raises(RobotCommunicationException):
+        robot.robot_status()
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_new_points_of_interest_are_uploaded_to_one_stage(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api = mock.Mock()
+    robot.api.get_current_site_stage.return_value = None
+    robot.api.create_stage.return_value = "stage_id"
+    robot.site_index = SiteIndex(api=robot.api, site_id="site_id")
+    robot.api.create_points_of_interest.return_value = ["poi_id_1", "poi_id_3"]
+
+    pose: Pose = Pose(
+        position=Position(x=1, y=1, z=0, frame=Frame("asset")),
+        orientation=Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+        frame=Frame("asset"),
+    )
+    target: Position = Position(x=2, y=2, z=1, frame=Frame("asset"))
+    tasks: List[Task] = [
+        Task(steps=[DriveToPose(pose=pose), TakeImage(target=target)], tag_id=tag)
+        for tag in ["tag_1", "tag_2", "tag_3"]
+    ]
+
+    customer_tag: str = f"tag_2|{pose}|{target}"
+    robot.api.get_points_of_interest_by_site.return_value = [
+        {"id": "existing_poi_id", "customerTag": customer_tag}
+    ]
+
+    poi_ids: List[str] = robot.update_site_with_tasks(tasks)
+
+    assert poi_ids == ["poi_id_1", "existing_poi_id", "poi_id_3"]
+    robot.api.create_stage.assert_called_once()
+    assert len(robot.api.create_points_of_interest.call_args.args[0]) == 2
+    robot.api.add_points_of_interest_to_stage.assert_called_once_with(
+        POI_ids=["poi_id_1", "poi_id_3"], stage_id="stage_id"
+    )
+    robot.api.commit_site_to_snapshot.assert_called_once_with(stage_id="stage_id")
+    robot.api.get_points_of_interest_by_site.assert_called_once()
+    assert robot.site_index.get_point_of_interest_id(f"tag_1|{pose}|{target}") == (
+        "poi_id_1"
+    )
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_steps_with_the_same_customer_tag_share_one_new_point_of_interest(
+    MockedGraphqlClient,
+):
+    robot: Robot = Robot()
+    robot.api = mock.Mock()
+    robot.api.get_current_site_stage.return_value = None
+    robot.api.create_stage.return_value = "stage_id"
+    robot.api.get_points_of_interest_by_site.return_value = []
+    robot.site_index = SiteIndex(api=robot.api, site_id="site_id")
+    robot.api.create_points_of_interest.side_effect = lambda inputs: [
+        f"poi_id_{i}" for i in range(len(inputs))
+    ]
+
+    pose: Pose = Pose(
+        position=Position(x=1, y=1, z=0, frame=Frame("asset")),
+        orientation=Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+        frame=Frame("asset"),
+    )
+    target: Position = Position(x=2, y=2, z=1, frame=Frame("asset"))
+    tasks: List[Task] = [
+        Task(
+            steps=[
+                DriveToPose(pose=pose),
+                TakeImage(target=target),
+                TakeThermalImage(target=target),
+            ],
+            tag_id="tag",
+        )
+    ]
+
+    poi_ids: List[str] = robot.update_site_with_tasks(tasks)
+
+    assert poi_ids == ["poi_id_0", "poi_id_0"]
+    assert len(robot.api.create_points_of_interest.call_args.args[0]) == 1
+    robot.api.add_points_of_interest_to_stage.assert_called_once_with(
+        POI_ids=["poi_id_0"], stage_id="stage_id"
+    )
+    assert robot.site_index.get_point_of_interest_id(f"tag|{pose}|{target}") == (
+        "poi_id_0"
+    )
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_mission_definition_is_reused_for_the_same_mission(
+    MockedGraphqlClient, tmp_path
+):
+    robot: Robot = Robot()
+    robot.api = mock.Mock()
+    robot.mission_definition_cache = MissionDefinitionCache(
+        path=tmp_path.joinpath("mission_definitions.json")
+    )
+    robot.api.create_mission_definition.return_value = "mission_definition_id"
+    robot.api.create_task_definitions.return_value = ["poi_task_id", "dock_task_id"]
+
+    tasks: List[Task] = [
+        Task(steps=[TakeImage(target=Position(x=2, y=2, z=1, frame=Frame("asset")))])
+    ]
+    robot.create_mission_definition("mission_1", tasks, ["poi_id"])
+    robot.mission_task_ids = []
+    robot.api.get_mission_definition_task_ids.return_value = [
+        "start_task_id",
+        "poi_task_id",
+        "dock_task_id",
+    ]
+
+    assert (
+        robot.create_mission_definition("mission_2", tasks, ["poi_id"])
+        == "mission_definition_id"
+    )
+    assert robot.mission_task_ids == [["poi_task_id"], ["dock_task_id"]]
+    robot.api.create_mission_definition.assert_called_once()
+
+    # A definition that was changed on the API is recreated
+    robot.mission_task_ids = []
+    robot.api.get_mission_definition_task_ids.return_value = ["dock_task_id"]
+    robot.create_mission_definition("mission_3", tasks, ["poi_id"])
+    assert robot.api.create_mission_definition.call_count == 2
+    assert robot.mission_task_ids == [["poi_task_id"], ["dock_task_id"]]
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_task_definitions_are_created_at_once_and_added_in_order(
+    MockedGraphqlClient,
+):
+    robot: Robot = Robot()
+    robot.api = mock.Mock()
+    robot.mission_definition_cache = mock.Mock()
+    robot.mission_definition_cache.get.return_value = None
+    robot.api.create_mission_definition.return_value = "mission_definition_id"
+    robot.api.create_task_definitions.return_value = [
+        "waypoint_id",
+        "image_id_1",
+        "image_id_2",
+        "dock_id",
+    ]
+
+    pose: Pose = Pose(
+        position=Position(x=1, y=1, z=0, frame=Frame("asset")),
+        orientation=Orientation(x=0, y=0, z=0, w=1, frame=Frame("asset")),
+        frame=Frame("asset"),
+    )
+    target: Position = Position(x=2, y=2, z=1, frame=Frame("asset"))
+    tasks: List[Task] = [
+        Task(steps=[DriveToPose(pose=pose), TakeImage(target=target)]),
+        Task(steps=[]),
+        Task(steps=[TakeImage(target=target)]),
+    ]
+
+    robot.create_mission_definition("mission", tasks, ["poi_id_1", "poi_id_2"])
+
+    task_definitions = robot.api.create_task_definitions.call_args.args[0]
+    assert [operation_name for operation_name, _ in task_definitions] == [
+        "CreateWaypointTaskDefinition",
+        "CreatePoiInspectionTaskDefinition",
+        "CreatePoiInspectionTaskDefinition",
+        "CreateDockRobotTaskDefinition",
+    ]
+    assert [params.get("poiId") for _, params in task_definitions[1:3]] == [
+        "poi_id_1",
+        "poi_id_2",
+    ]
+    robot.api.add_tasks_to_mission_definition.assert_called_once_with(
+        task_ids=["waypoint_id", "image_id_1", "image_id_2", "dock_id"],
+        mission_definition_id="mission_definition_id",
+    )
+    assert robot.mission_task_ids == [
+        ["waypoint_id", "image_id_1"],
+        [],
+        ["image_id_2"],
+        ["dock_id"],
+    ]
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_step_status_catches_up_on_skipped_tasks_without_requests(
+    MockedGraphqlClient,
+):
+    robot: Robot = Robot()
+    robot.api.get_mission_status_and_current_task = mock.Mock(
+        return_value=("IN_PROGRESS", "task_3")
+    )
+    robot.mission_task_ids = [["task_0", "task_1"], ["task_2"], ["task_3"], ["dock"]]
+    robot._index_mission_task_ids()
+
+    assert robot.step_status() == StepStatus.Successful
+    assert robot.step_status() == StepStatus.Successful
+    assert robot.api.get_mission_status_and_current_task.call_count == 1
+    assert robot.step_status() == StepStatus.InProgress
+    assert robot.api.get_mission_status_and_current_task.call_count == 2
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_step_status_raises_for_unknown_task(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api.get_mission_status_and_current_task = mock.Mock(
+        return_value=("IN_PROGRESS", "unknown_task")
+    )
+    robot.mission_task_ids = [["task_0"], ["dock"]]
+    robot._index_mission_task_ids()
+
+    with pytest.raises(expected_exception=RobotStepStatusException):
+        robot.step_status()
+
+
+@mock.patch("isar_exr.api.energy_robotics_api.GraphqlClient")
+def test_step_status_is_read_from_robot_state(MockedGraphqlClient):
+    robot: Robot = Robot()
+    robot.api.get_mission_status_and_current_task = mock.Mock()
+    robot.mission_task_ids = [["task_0"], ["task_1"], ["dock"]]
+    robot._index_mission_task_ids()
+
+    robot.robot_state.update(
+        RobotStateKey.MissionExecution,
+        {"status": "IN_PROGRESS", "currentExecutedTaskId": "task_1"},
+        max_age=5,
+    )
+    assert robot.step_status() == StepStatus.Successful
+    assert robot.step_status() == StepStatus.InProgress
+
+    robot.robot_state.update(RobotStateKey.MissionExecution, None, max_age=5)
+    assert robot.step_status() == StepStatus.Successful
+    robot.api.get_mission_status_and_current_task.assert_not_called()
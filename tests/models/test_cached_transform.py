@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from alitra import (
+    Frame,
+    MapAlignment,
+    Orientation,
+    Pose,
+    Position,
+    Transform,
+    align_maps,
+)
+
+from isar_exr.models.cached_transform import CachedTransform
+
+
+@pytest.mark.parametrize("from_, to_", [("asset", "robot"), ("robot", "asset")])
+def test_poses_are_transformed_as_by_the_alignment(from_: str, to_: str):
+    map_alignment: MapAlignment = MapAlignment.from_config(
+        Path(
+            os.path.dirname(os.path.realpath(__file__)),
+            "../../src/isar_exr/config/maps/exr_jca_ap.json",
+        )
+    )
+    transform: Transform = align_maps(
+        map_alignment.map_from, map_alignment.map_to, rot_axes="xyz"
+    )
+    pose: Pose = Pose(
+        position=Position(x=1.5, y=-2, z=0.3, frame=Frame(from_)),
+        orientation=Orientation(x=0, y=0, z=0.38268, w=0.92388, frame=Frame(from_)),
+        frame=Frame(from_),
+    )
+
+    expected: Pose = transform.transform_pose(
+        pose=pose, from_=Frame(from_), to_=Frame(to_)
+    )
+    transformed: Pose = CachedTransform(
+        transform, from_=Frame(from_), to_=Frame(to_)
+    ).transform_pose(pose)
+
+    assert transformed.frame == Frame(to_)
+    assert np.allclose(transformed.position.to_array(), expected.position.to_array())
+    assert np.allclose(
+        transformed.orientation.to_quat_array(), expected.orientation.to_quat_array()
+    )
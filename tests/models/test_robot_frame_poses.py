@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from alitra import (
+    Frame,
+    MapAlignment,
+    Orientation,
+    Pose,
+    Position,
+    Transform,
+    align_maps,
+)
+from robot_interface.models.mission.step import DriveToPose, TakeImage
+from robot_interface.models.mission.task import Task
+
+from isar_exr.models.cached_transform import CachedTransform
+from isar_exr.models.robot_frame_poses import RobotFramePoses
+
+
+def test_steps_are_transformed_as_one_by_one():
+    map_alignment: MapAlignment = MapAlignment.from_config(
+        Path(
+            os.path.dirname(os.path.realpath(__file__)),
+            "../../src/isar_exr/config/maps/exr_jca_ap.json",
+        )
+    )
+    transform: Transform = align_maps(
+        map_alignment.map_from, map_alignment.map_to, rot_axes="xyz"
+    )
+    drive_steps: List[DriveToPose] = [
+        DriveToPose(
+            pose=Pose(
+                position=Position(x=x, y=2 * x, z=0, frame=Frame(frame)),
+                orientation=Orientation(
+                    x=0, y=0, z=0.38268, w=0.92388, frame=Frame(frame)
+                ),
+                frame=Frame(frame),
+            )
+        )
+        for x, frame in [(1, "asset"), (2, "robot"), (3, "asset")]
+    ]
+    take_image: TakeImage = TakeImage(
+        target=Position(x=4, y=5, z=1, frame=Frame("asset"))
+    )
+    tasks: List[Task] = [
+        Task(steps=[drive_steps[0], take_image]),
+        Task(steps=drive_steps[1:]),
+    ]
+
+    robot_frame_poses: RobotFramePoses = RobotFramePoses(
+        tasks, CachedTransform(transform, from_=Frame("asset"), to_=Frame("robot"))
+    )
+
+    for step in drive_steps:
+        expected: Pose = transform.transform_pose(
+            pose=step.pose, from_=step.pose.frame, to_=Frame("robot")
+        )
+        position, orientation = robot_frame_poses.get_pose(step)
+        assert np.allclose(position, expected.position.to_array())
+        assert np.allclose(orientation, expected.orientation.to_quat_array())
+
+    expected_target: Position = transform.transform_position(
+        positions=take_image.target, from_=Frame("asset"), to_=Frame("robot")
+    )
+    assert np.allclose(
+        robot_frame_poses.get_target(take_image), expected_target.to_array()
+    )
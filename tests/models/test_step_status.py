@@ -18,13 +18,15 @@ def test_to_step_status():
     assert expected_status == status
 
 
-@mock.patch.object(
-    EnergyRoboticsApi, "is_mission_running", mock.Mock(return_value=True)
-)
 @mock.patch.object(
     GraphqlClient,
     "query",
-    mock.Mock(return_value={"currentMissionExecution": {"status": "PAUSE_REQUESTED"}}),
+    mock.Mock(
+        return_value={
+            "IsMissionRunning": True,
+            "CurrentMissionExecutionStatus": {"status": "PAUSE_REQUESTED"},
+        }
+    ),
 )
 @mock.patch(
     "isar_exr.api.graphql_client.get_access_token",
@@ -36,10 +38,18 @@ def test_get_step_status_success():
     status = api.get_mission_status(settings.ROBOT_EXR_ID)
 
     assert expected_status == status
+    GraphqlClient.query.assert_called_once()
 
 
 @mock.patch.object(
-    EnergyRoboticsApi, "is_mission_running", mock.Mock(return_value=False)
+    GraphqlClient,
+    "query",
+    mock.Mock(
+        return_value={
+            "IsMissionRunning": False,
+            "CurrentMissionExecutionStatus": None,
+        }
+    ),
 )
 @mock.patch(
     "isar_exr.api.graphql_client.get_access_token",
@@ -50,4 +60,4 @@ def test_get_step_status_error_mission_is_not_running():
     with pytest.raises(NoMissionRunningException):
         api.get_mission_status(settings.ROBOT_EXR_ID)
 
-    api.is_mission_running.assert_called_once()
+    GraphqlClient.query.assert_called_once()
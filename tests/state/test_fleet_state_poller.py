@@ -0,0 +1,34 @@
+from typing import Dict
+from unittest import mock
+
+from isar_exr.state.fleet_state_poller import FleetStatePoller
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+def test_polled_state_is_stored_per_robot() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_fleet_state.return_value = {
+        "robot_1": ({"isConnected": True}, None),
+        "robot_2": (
+            {"isConnected": False},
+            {"status": "IN_PROGRESS", "currentExecutedTaskId": "task_id"},
+        ),
+    }
+    robot_states: Dict[str, RobotStateStore] = {
+        robot_id: RobotStateStore() for robot_id in ["robot_1", "robot_2", "robot_3"]
+    }
+    poller: FleetStatePoller = FleetStatePoller(api=api, robot_states=robot_states)
+
+    poller.poll()
+
+    api.get_fleet_state.assert_called_once_with(["robot_1", "robot_2", "robot_3"])
+    assert robot_states["robot_1"].get(RobotStateKey.RobotStatus).value == {
+        "isConnected": True
+    }
+    assert robot_states["robot_1"].get(RobotStateKey.MissionExecution).value is None
+    assert robot_states["robot_2"].get(RobotStateKey.MissionExecution).value == {
+        "status": "IN_PROGRESS",
+        "currentExecutedTaskId": "task_id",
+    }
+    # The API returned no status for the robot, so readers query it themselves
+    assert robot_states["robot_3"].get(RobotStateKey.RobotStatus) is None
@@ -0,0 +1,50 @@
+from typing import Dict
+from unittest import mock
+
+from isar_exr.state.fleet_status_aggregator import FleetStatusAggregator
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+def get_robot_states() -> Dict[str, RobotStateStore]:
+    return {robot_id: RobotStateStore() for robot_id in ["robot_1", "robot_2"]}
+
+
+def test_statuses_of_a_single_site_are_fetched_per_site() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_robot_statuses_per_site.return_value = {
+        "robot_1": {"isConnected": True},
+        "robot_2": {"isConnected": False},
+        "other_robot": {"isConnected": True},
+    }
+    robot_states: Dict[str, RobotStateStore] = get_robot_states()
+    aggregator: FleetStatusAggregator = FleetStatusAggregator(
+        api=api, robot_states=robot_states, site_ids=["site_id"]
+    )
+
+    aggregator.poll()
+
+    api.get_robot_statuses_per_site.assert_called_once_with("site_id")
+    api.get_robot_statuses.assert_not_called()
+    assert robot_states["robot_1"].get(RobotStateKey.RobotStatus).value == {
+        "isConnected": True
+    }
+    assert robot_states["robot_2"].get(RobotStateKey.RobotStatus).value == {
+        "isConnected": False
+    }
+    # Mission executions are not polled, so readers keep querying them
+    assert robot_states["robot_1"].get(RobotStateKey.MissionExecution) is None
+
+
+def test_statuses_of_several_sites_are_fetched_by_robot_id() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_robot_statuses.return_value = {"robot_1": {"isConnected": True}}
+    robot_states: Dict[str, RobotStateStore] = get_robot_states()
+    aggregator: FleetStatusAggregator = FleetStatusAggregator(
+        api=api, robot_states=robot_states, site_ids=["site_1", "site_2"]
+    )
+
+    aggregator.poll()
+
+    api.get_robot_statuses.assert_called_once_with(["robot_1", "robot_2"])
+    assert robot_states["robot_1"].get(RobotStateKey.RobotStatus) is not None
+    assert robot_states["robot_2"].get(RobotStateKey.RobotStatus) is None
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from isar_exr.state.mission_definition_cache import (
+    CachedMissionDefinition,
+    MissionDefinitionCache,
+    get_mission_fingerprint,
+)
+
+
+def test_fingerprint_does_not_depend_on_key_order() -> None:
+    assert get_mission_fingerprint(
+        {"site_id": "site", "tasks": [[{"point_of_interest": "poi"}]]}
+    ) == get_mission_fingerprint(
+        {"tasks": [[{"point_of_interest": "poi"}]], "site_id": "site"}
+    )
+    assert get_mission_fingerprint({"tasks": [[], []]}) != get_mission_fingerprint(
+        {"tasks": [[]]}
+    )
+
+
+def test_entries_are_persisted(tmp_path: Path) -> None:
+    path: Path = tmp_path.joinpath("cache/mission_definitions.json")
+    entry: CachedMissionDefinition = CachedMissionDefinition(
+        mission_definition_id="mission_definition_id",
+        mission_task_ids=[["task_1", "task_2"], [], ["dock"]],
+    )
+    MissionDefinitionCache(path=path).put("fingerprint", entry)
+
+    cache: MissionDefinitionCache = MissionDefinitionCache(path=path)
+    assert cache.get("fingerprint") == entry
+    cache.remove("fingerprint")
+    assert MissionDefinitionCache(path=path).get("fingerprint") is None
+
+
+def test_unreadable_cache_starts_empty(tmp_path: Path) -> None:
+    path: Path = tmp_path.joinpath("mission_definitions.json")
+    path.write_text("{not json")
+
+    assert MissionDefinitionCache(path=path).get("fingerprint") is None
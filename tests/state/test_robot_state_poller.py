@@ -0,0 +1,49 @@
+import time
+from unittest import mock
+
+from isar_exr.state.robot_state_poller import RobotStatePoller
+from isar_exr.state.robot_state_store import RobotStateKey, RobotStateStore
+
+
+def test_polled_state_is_stored_until_it_is_too_old() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_robot_state.return_value = (
+        {"isConnected": True},
+        {"status": "IN_PROGRESS", "currentExecutedTaskId": "task_id"},
+    )
+    robot_state: RobotStateStore = RobotStateStore()
+    poller: RobotStatePoller = RobotStatePoller(
+        api=api, exr_robot_id="robot_id", robot_state=robot_state, max_age=0.05
+    )
+
+    poller.poll()
+
+    assert robot_state.get(RobotStateKey.RobotStatus).value == {"isConnected": True}
+    assert robot_state.get(RobotStateKey.MissionExecution).value == {
+        "status": "IN_PROGRESS",
+        "currentExecutedTaskId": "task_id",
+    }
+    api.get_robot_state.assert_called_once_with("robot_id")
+
+    time.sleep(0.1)
+    assert robot_state.get(RobotStateKey.RobotStatus) is None
+
+
+def test_polls_in_flight_do_not_restore_invalidated_state() -> None:
+    robot_state: RobotStateStore = RobotStateStore()
+    api: mock.Mock = mock.Mock()
+
+    def get_robot_state(exr_robot_id: str):
+        # The mission is started while the poll is in flight
+        robot_state.invalidate(RobotStateKey.MissionExecution)
+        return {"isConnected": True}, None
+
+    api.get_robot_state.side_effect = get_robot_state
+    poller: RobotStatePoller = RobotStatePoller(
+        api=api, exr_robot_id="robot_id", robot_state=robot_state
+    )
+
+    poller.poll()
+
+    assert robot_state.get(RobotStateKey.MissionExecution) is None
+    assert robot_state.get(RobotStateKey.RobotStatus) is not None
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from isar_exr.state.site_index import SiteIndex
+
+
+def test_points_of_interest_are_loaded_once_and_looked_up_in_memory() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_points_of_interest_by_site.return_value = [
+        {"id": "poi_1", "customerTag": "tag_1"},
+        {"id": "poi_2", "customerTag": None},
+    ]
+    site_index: SiteIndex = SiteIndex(api=api, site_id="site_id")
+
+    assert site_index.get_point_of_interest_id("tag_1") == "poi_1"
+    assert site_index.get_point_of_interest_id("tag_2") is None
+    api.get_points_of_interest_by_site.assert_called_once_with(site_id="site_id")
+
+
+def test_pushed_changes_keep_index_current() -> None:
+    api: mock.Mock = mock.Mock()
+    api.get_points_of_interest_by_site.return_value = [
+        {"id": "poi_1", "customerTag": "tag_1"}
+    ]
+    site_index: SiteIndex = SiteIndex(api=api, site_id="site_id")
+    site_index.subscribe()
+    connection_listener = api.subscribe_to_points_of_interest.call_args.kwargs[
+        "connection_listener"
+    ]
+    connection_listener(True)
+    site_index.get_point_of_interest_id("tag_1")
+
+    site_index.apply_update(
+        {"operation": "CREATE", "pointOfInterest": {"id": "poi_2", "customerTag": "a"}}
+    )
+    site_index.apply_update(
+        {"operation": "DELETE", "pointOfInterest": {"id": "poi_1", "customerTag": None}}
+    )
+
+    assert site_index.get_point_of_interest_id("a") == "poi_2"
+    assert site_index.get_point_of_interest_id("tag_1") is None
+    api.get_points_of_interest_by_site.assert_called_once()
+
+    # Changes might have been missed while the connection was down
+    connection_listener(False)
+    assert site_index.get_point_of_interest_id("tag_1") == "poi_1"
+    assert api.get_points_of_interest_by_site.call_count == 2
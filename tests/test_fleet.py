@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+from threading import Thread
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+
+import pytest
+from robot_interface.models.mission.status import RobotStatus
+
+from benchmarks.standin_server import StandInServer
+from isar_exr.config.robot_config import RobotConfig
+from isar_exr.config.settings import settings
+from isar_exr.fleet import Fleet
+from isar_exr.state.mission_definition_cache import MissionDefinitionCache
+from isar_exr.state.robot_state_store import RobotStateKey
+from tests.interfaces.test_robot_end_to_end import get_mission
+
+robot_ids: List[str] = ["robot_1", "robot_2", "robot_3"]
+
+
+@pytest.fixture
+def standin(tmp_path: Path) -> Iterator[StandInServer]:
+    with StandInServer(
+        pipeline_duration=0.1, task_duration=60
+    ) as server, mock.patch.object(
+        settings, "ROBOT_API_URL", server.url
+    ), mock.patch.object(
+        settings, "ROBOT_AUTH_URL", server.auth_url
+    ), mock.patch(
+        "isar_exr.fleet.MissionDefinitionCache",
+        lambda: MissionDefinitionCache(tmp_path.joinpath("mission_definitions.json")),
+    ), mock.patch.object(
+        settings, "FLEET_ROBOTS", [{"robot_id": robot_id} for robot_id in robot_ids]
+    ), mock.patch.object(
+        settings, "FLEET_STATUS_AGGREGATION_ENABLED", False
+    ):
+        yield server
+
+
+def test_robots_share_client_and_site_index(standin: StandInServer) -> None:
+    fleet: Fleet = Fleet.from_settings()
+
+    robot_1, robot_2, robot_3 = [fleet.get_robot(robot_id) for robot_id in robot_ids]
+    assert robot_1.config == RobotConfig(robot_id="robot_1")
+    assert robot_1.api.client is robot_2.api.client is robot_3.api.client
+    assert robot_1.site_index is robot_2.site_index
+    assert robot_1.mission_definition_cache is robot_2.mission_definition_cache
+
+
+def test_fleet_state_is_polled_in_one_request_per_operation(
+    standin: StandInServer,
+) -> None:
+    fleet: Fleet = Fleet.from_settings()
+
+    fleet.state_poller.poll()
+
+    # The statuses of all robots, and whether and which mission each one is running
+    assert standin.request_counts == {
+        "Batch_RobotStatuses_x1": 1,
+        "Batch_IsMissionRunning_x3": 1,
+        "Batch_CurrentMissionExecutionStatusAndTask_x3": 1,
+    }
+    for robot in fleet.robots.values():
+        assert robot.robot_state.get(RobotStateKey.RobotStatus) is not None
+        assert robot.robot_status() == RobotStatus.Available
+
+
+def test_robots_on_one_site_upload_missions_at_the_same_time(
+    standin: StandInServer,
+) -> None:
+    fleet: Fleet = Fleet.from_settings()
+    threads: List[Thread] = [
+        Thread(target=robot.initiate_mission, args=[get_mission(tasks_n=2)])
+        for robot in fleet.robots.values()
+    ]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(standin.state.mission_executions) == set(robot_ids)
+
+
+def test_telemetry_of_all_robots_is_published_from_one_request(
+    standin: StandInServer,
+) -> None:
+    for robot_id in robot_ids:
+        # The robots of the site, which the stand-in only knows once asked about
+        standin.state.get_robot(robot_id)
+    fleet: Fleet = Fleet.from_settings()
+
+    fleet.status_aggregator.poll()
+    for robot in fleet.robots.values():
+        battery: Dict[str, Any] = json.loads(
+            robot._get_battery_telemetry("isar_id", "robot_name")
+        )
+        assert battery["battery_level"] == 80.0
+
+    assert standin.request_counts == {"RobotStatusesPerSite": 1}
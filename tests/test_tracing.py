@@ -0,0 +1,79 @@
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+from unittest.mock import Mock
+
+import pytest
+from gql.client import AsyncClientSession
+
+from isar_exr.api.graphql_client import GraphqlClient
+from isar_exr.api.operations import operation_registry
+from isar_exr.tracing import NoOpSpan, Tracer, tracer
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+sdk_export = pytest.importorskip("opentelemetry.sdk.trace.export")
+in_memory_export = pytest.importorskip(
+    "opentelemetry.sdk.trace.export.in_memory_span_exporter"
+)
+
+
+@pytest.fixture
+def exporter() -> Iterator[Any]:
+    exporter = in_memory_export.InMemorySpanExporter()
+    tracer_provider = sdk_trace.TracerProvider()
+    tracer_provider.add_span_processor(sdk_export.SimpleSpanProcessor(exporter))
+    tracer.configure(enabled=True, tracer_provider=tracer_provider)
+    yield exporter
+    tracer.configure(enabled=False)
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    disabled_tracer: Tracer = Tracer(enabled=False)
+
+    @disabled_tracer.traced()
+    def upload() -> str:
+        disabled_tracer.set_attributes(step_count=3)
+        return "uploaded"
+
+    with disabled_tracer.span("mission") as span:
+        assert isinstance(span, NoOpSpan)
+        assert upload() == "uploaded"
+    assert disabled_tracer.get_context() is None
+
+
+def test_traced_functions_are_nested_with_attributes(exporter) -> None:
+    @tracer.traced()
+    def upload() -> None:
+        tracer.set_attributes(step_count=3)
+
+    with tracer.span("mission", attributes={"task_count": 1}):
+        upload()
+
+    spans: Dict[str, Any] = {span.name: span for span in exporter.get_finished_spans()}
+    upload_span = spans[
+        "test_traced_functions_are_nested_with_attributes.<locals>.upload"
+    ]
+    assert upload_span.parent.span_id == spans["mission"].context.span_id
+    assert upload_span.attributes["step_count"] == 3
+    assert spans["mission"].attributes["task_count"] == 1
+
+
+@mock.patch(
+    "isar_exr.api.graphql_client.get_access_token",
+    Mock(return_value="test_token"),
+)
+@mock.patch.object(
+    AsyncClientSession,
+    "execute",
+    mock.AsyncMock(return_value={"isMissionRunning": True}),
+)
+def test_api_requests_are_traced_in_the_calling_span(exporter) -> None:
+    client: GraphqlClient = GraphqlClient()
+
+    with tracer.span("mission"):
+        client.query(operation_registry.get("IsMissionRunning"), {"robotID": "robot"})
+
+    spans: List[Any] = exporter.get_finished_spans()
+    request_span, mission_span = spans
+    assert request_span.name == "IsMissionRunning"
+    assert request_span.parent.span_id == mission_span.context.span_id
+    assert request_span.attributes["graphql.operation.name"] == "IsMissionRunning"